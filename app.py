@@ -7,21 +7,39 @@ MarkItDown 后端服务
 import os
 import io
 import uuid
+import json
 import time
+import hmac
+import hashlib
+import math
+import random
+import sys
+import cProfile
+import pstats
 import threading
+import ipaddress
+import socket
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
 import requests
 from urllib.parse import urlparse
 import mimetypes
 
-from flask import Flask, request, jsonify, send_file, abort, send_from_directory
+from flask import Flask, Request, Response, request, jsonify, send_file, abort, send_from_directory
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 from apscheduler.schedulers.background import BackgroundScheduler
 from flasgger import Swagger, swag_from
 
-from markitdown import MarkItDown
+from markitdown import (ConversionTimeoutException, DiskCache, LazyConverter, MarkItDown, MemoryCache, SQLiteCache,
+                        StreamInfo, normalize_markdown)
+from storage import create_storage, markdown_filename
+from chunking import chunk_markdown
+from tenancy import FairShareScheduler, FairTaskQueue, TenantRegistry, tenant_id_for_api_key
+from worker_pools import FormatWorkerPools, parse_pool_sizes
 from flask import after_this_request
 
 # 创建Flask应用
@@ -31,7 +49,7 @@ app = Flask(__name__)
 CORS(app, 
      origins=["*"],  # 允许所有域名
      methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-     allow_headers=["Content-Type", "Authorization", "Accept", "Accept-Encoding", "Accept-Language", "Cache-Control", "Connection", "Host", "Origin", "Referer", "User-Agent", "X-Requested-With"],
+     allow_headers=["Content-Type", "Authorization", "Accept", "Accept-Encoding", "Accept-Language", "Cache-Control", "Connection", "Host", "Origin", "Referer", "User-Agent", "X-Requested-With", "X-API-Key"],
      supports_credentials=True,
      max_age=86400  # 预检请求缓存时间
 )
@@ -79,20 +97,327 @@ swagger = Swagger(app, config=swagger_config, template=swagger_template)
 # 使用绝对路径以确保在Docker容器中正确访问
 UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
 DOWNLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'public')
+PROFILE_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles')
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
+UPLOAD_SNIFF_BYTES = 64 * 1024  # 收到文件开头的这些字节后即检测文件类型
+MAX_CHUNK_TOKENS = 32768  # chunk_tokens 参数的上限
 CLEANUP_INTERVAL_MINUTES = 5  # 每5分钟检查一次过期文件
 FILE_EXPIRY_MINUTES = 30  # 文件30分钟后过期
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')  # 管理员令牌，未设置时禁用所有管理员功能
+
+def _env_flag(name, default='false'):
+    """读取布尔型环境变量"""
+    return os.environ.get(name, default).strip().lower() in ('true', '1', 'yes')
+
+SAMPLING_PROFILER_ENABLED = _env_flag('SAMPLING_PROFILER_ENABLED')  # 是否启用后台采样分析器
+SAMPLING_PROFILER_INTERVAL = float(os.environ.get('SAMPLING_PROFILER_INTERVAL', '0.02'))  # 采样间隔（秒）
+SAMPLING_PROFILER_RETENTION_MINUTES = int(os.environ.get('SAMPLING_PROFILER_RETENTION_MINUTES', '360'))  # 采样数据保留时长
+ASYNC_CONVERSION_WORKERS = int(os.environ.get('ASYNC_CONVERSION_WORKERS', '4'))  # 异步转换（带回调）的工作线程数
+CALLBACK_WORKERS = int(os.environ.get('CALLBACK_WORKERS', '4'))  # 回调投递的工作线程数
+CALLBACK_MAX_ATTEMPTS = int(os.environ.get('CALLBACK_MAX_ATTEMPTS', '5'))  # 回调最多尝试次数
+CALLBACK_TIMEOUT = 10  # 单次回调请求超时（秒）
+CALLBACK_BACKOFF_SECONDS = 1.0  # 首次重试前的等待时间，之后每次翻倍
+CALLBACK_BACKOFF_MAX_SECONDS = 60.0  # 重试等待时间上限
+CALLBACK_SECRET = os.environ.get('CALLBACK_SECRET')  # 设置后对回调请求体进行 HMAC-SHA256 签名
+CALLBACK_ALLOWED_HOSTS = [  # 允许的回调主机，逗号分隔，以 . 开头时匹配其所有子域名；为空时允许除内网、回环等地址以外的任何主机
+    host.strip().lower() for host in os.environ.get('CALLBACK_ALLOWED_HOSTS', '').split(',') if host.strip()
+]
+TENANT_API_KEY_HEADER = 'X-API-Key'  # 用于区分租户的请求头，未提供时按客户端地址区分
+CONVERSION_CONCURRENCY = int(os.environ.get('CONVERSION_CONCURRENCY', str(os.cpu_count() or 4)))  # 同时执行的转换数
+TENANT_BYTES_PER_MINUTE = int(os.environ.get('TENANT_BYTES_PER_MINUTE_MB', '0')) * 1024 * 1024  # 每个租户每分钟可转换的字节数，0 表示不限制
+TENANT_WEIGHTS = json.loads(os.environ.get('TENANT_WEIGHTS', '{}'))  # 租户权重，例如 {"<API Key>": 2}，默认权重为 1
+TENANT_IDLE_MINUTES = int(os.environ.get('TENANT_IDLE_MINUTES', '60'))  # 租户空闲多久后清除其限流状态和用量统计
+MIN_SCHEDULING_COST = 64 * 1024  # 调度时每个转换至少按该字节数计费，避免小文件不占份额
+DETECTION_POLICY = os.environ.get('DETECTION_POLICY', 'when_ambiguous').strip().lower()  # 文件类型检测策略：always（总是运行 Magika）、when_ambiguous（文件头魔数与扩展名一致时跳过 Magika）、never
+WORKER_POOLS = os.environ.get('WORKER_POOLS', '').strip()  # 按格式族划分的工作进程池，例如 "text:4,pdf:2,office:2,media:1"，为空时在本进程内转换
+RESULT_CACHE = os.environ.get('RESULT_CACHE', '').strip().lower()  # 转换结果缓存：memory（进程内 LRU）、disk（目录）、sqlite（数据库文件），为空时不缓存
+RESULT_CACHE_PATH = os.environ.get('RESULT_CACHE_PATH', '').strip()  # disk 缓存的目录或 sqlite 缓存的数据库文件，默认位于 cache 目录下
+RESULT_CACHE_MAX_MB = int(os.environ.get('RESULT_CACHE_MAX_MB', '512'))  # 缓存结果的总大小上限，超出后淘汰最久未使用的结果
+CONVERSION_TIMEOUT = float(os.environ.get('CONVERSION_TIMEOUT', '0'))  # 单次转换的时限（秒），超时后转换器在下一页、幻灯片、工作表或压缩包成员处停止，0 表示不限制
+CACHE_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
 
 # 确保目录存在
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(DOWNLOAD_FOLDER, exist_ok=True)
+os.makedirs(PROFILE_FOLDER, exist_ok=True)
+
+def create_result_cache():
+    """根据 RESULT_CACHE 环境变量创建转换结果缓存，未启用时返回 None"""
+    max_size = RESULT_CACHE_MAX_MB * 1024 * 1024
+    if not RESULT_CACHE:
+        return None
+    if RESULT_CACHE == 'memory':
+        return MemoryCache(max_size)
+    if RESULT_CACHE == 'disk':
+        return DiskCache(RESULT_CACHE_PATH or os.path.join(CACHE_FOLDER, 'results'), max_size)
+    if RESULT_CACHE == 'sqlite':
+        return SQLiteCache(RESULT_CACHE_PATH or os.path.join(CACHE_FOLDER, 'results.sqlite3'), max_size)
+    raise ValueError(f"未知的 RESULT_CACHE: {RESULT_CACHE}（可选: memory、disk、sqlite）")
+
+# 转换结果缓存：相同内容和转换选项的文件直接返回缓存的结果
+result_cache = create_result_cache()
 
 # 初始化MarkItDown
-md_converter = MarkItDown()
+md_converter = MarkItDown(detection_policy=DETECTION_POLICY, cache=result_cache)
+
+# 按格式族划分的工作进程池：每个进程只导入本格式族转换器的依赖，未配置的格式族仍在本进程内转换
+worker_pools = FormatWorkerPools(parse_pool_sizes(WORKER_POOLS), cache=result_cache) if WORKER_POOLS else None
+
+# 转换结果存储：本地文件系统或 S3 兼容对象存储（由 STORAGE_BACKEND 环境变量决定）
+artifact_storage = create_storage(DOWNLOAD_FOLDER)
+
+# 按租户加权公平分配转换槽位，并按租户限制每分钟转换的字节数
+conversion_scheduler = FairShareScheduler(CONVERSION_CONCURRENCY)
+tenant_registry = TenantRegistry(
+    weights={
+        key if key.startswith('ip:') else tenant_id_for_api_key(key): float(weight)
+        for key, weight in TENANT_WEIGHTS.items()
+    },
+    bytes_per_minute=TENANT_BYTES_PER_MINUTE,
+    idle_seconds=TENANT_IDLE_MINUTES * 60,
+)
+
+# 带回调的异步转换任务与回调投递使用独立的线程，避免回调重试占用转换线程；
+# 异步转换按租户轮转执行，避免一个租户的大量任务阻塞其他租户
+conversion_executor = FairTaskQueue(ASYNC_CONVERSION_WORKERS, thread_name_prefix='conversion')
+callback_executor = ThreadPoolExecutor(max_workers=CALLBACK_WORKERS, thread_name_prefix='callback')
+
+def is_admin_token(token):
+    """检查令牌是否为有效的管理员令牌，未设置 ADMIN_TOKEN 时总是无效"""
+    if not ADMIN_TOKEN:
+        return False
+    return hmac.compare_digest((token or '').encode('utf-8'), ADMIN_TOKEN.encode('utf-8'))
+
+def is_admin_request():
+    """检查请求是否携带有效的管理员令牌（X-Admin-Token 请求头）"""
+    return is_admin_token(request.headers.get('X-Admin-Token', ''))
+
+def _code_key(func):
+    """返回函数在 pstats 统计中的键 (文件名, 行号, 函数名)"""
+    code = func.__code__
+    return (code.co_filename, code.co_firstlineno, code.co_name)
+
+# cProfile 在 Python 3.12+ 中基于 sys.monitoring 实现，同一时间只能有一个分析器处于活动状态
+profile_lock = threading.Lock()
+
+class ProfilerBusyError(Exception):
+    """已有其他请求正在进行性能分析"""
+    pass
+
+class ConversionProfiler:
+    """单次转换请求的性能分析器
+
+    启用时在 cProfile 下运行整个请求，并记录各阶段耗时；未启用时 stage() 仅为空操作。
+    转换器内部的阶段（类型检测、各转换器的 accepts/convert、规范化）从 cProfile 统计中提取。
+    cProfile 只能分析本进程，转换在工作进程池中执行时，报告中的 worker_pool 为格式族名称，
+    此时 conversion 阶段为等待工作进程的时间，统计中不包含工作进程内的调用。
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.stages = {}
+        self.worker_pool = None  # 转换在工作进程池中执行时为格式族名称
+        self._profile = cProfile.Profile() if enabled else None
+        self._started_at = None
+        self._total = None
+
+    def __enter__(self):
+        if self.enabled:
+            if not profile_lock.acquire(blocking=False):
+                raise ProfilerBusyError("已有其他性能分析正在进行，请稍后重试")
+            self._started_at = time.perf_counter()
+            self._profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.enabled:
+            self._profile.disable()
+            self._total = time.perf_counter() - self._started_at
+            profile_lock.release()
+        return False
+
+    @contextmanager
+    def stage(self, name):
+        """记录一个阶段的耗时（秒）"""
+        if not self.enabled:
+            yield
+            return
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - started_at
+
+    def report(self):
+        """保存 pstats 文件，并返回各阶段耗时明细"""
+        profile_id = str(uuid.uuid4())
+        pstats_path = os.path.join(PROFILE_FOLDER, f"{profile_id}.pstats")
+        self._profile.dump_stats(pstats_path)
+        stats = pstats.Stats(self._profile).stats
+
+        def cumulative(func):
+            # stats 的值为 (原始调用次数, 调用次数, 自身耗时, 累计耗时, 调用者)
+            entry = stats.get(_code_key(func))
+            if entry is None:
+                return 0, 0.0
+            return entry[1], entry[3]
+
+        stages = {name: round(seconds, 6) for name, seconds in self.stages.items()}
+        stages['type_detection'] = round(cumulative(MarkItDown._get_stream_info_guesses)[1], 6)
+        stages['normalization'] = round(cumulative(normalize_markdown)[1], 6)
+        stages['total'] = round(self._total, 6)
+
+        # 同一类型的转换器可能被注册多次，只统计一次
+        converters = []
+        seen = set()
+        for registration in md_converter._converters:
+            # 内置转换器按需加载，尚未加载的转换器没有调用记录
+            converter = registration.converter
+            if isinstance(converter, LazyConverter):
+                converter = converter.loaded_converter
+                if converter is None:
+                    continue
+            converter_type = type(converter)
+            if converter_type in seen:
+                continue
+            seen.add(converter_type)
+
+            entry = {'converter': converter_type.__name__}
+            for method in ('accepts', 'convert'):
+                calls, seconds = cumulative(getattr(converter_type, method))
+                entry[method] = {'calls': calls, 'seconds': round(seconds, 6)}
+            if entry['accepts']['calls'] or entry['convert']['calls']:
+                converters.append(entry)
+
+        report = {
+            'profile_id': profile_id,
+            'download_url': f'/api/debug/profiles/{profile_id}',
+            'stages': stages,
+            'converters': converters,
+            'worker_pool': self.worker_pool,
+        }
+        if self.worker_pool:
+            report['note'] = (f'转换在 {self.worker_pool} 工作进程池中执行，conversion 阶段为等待工作进程的时间（含进程间传输），'
+                              f'cProfile 统计和 converters 明细不包含工作进程内的调用')
+        return report
+
+# 处于等待状态的栈顶函数，不计入 CPU 采样
+IDLE_FRAMES = {
+    ('threading.py', 'wait'),
+    ('threading.py', '_wait_for_tstate_lock'),
+    ('selectors.py', 'select'),
+    ('socket.py', 'accept'),
+    ('socket.py', 'readinto'),
+}
+
+class SamplingProfiler:
+    """低开销的后台采样分析器
+
+    后台线程按固定间隔通过 sys._current_frames() 抓取所有线程的调用栈，
+    聚合为 collapsed-stack 格式（可直接交给 flamegraph.pl / speedscope），并按分钟分桶保存，
+    以便查询最近任意时间窗口内的数据。处于等待状态的线程不计入采样。
+    """
+
+    BUCKET_SECONDS = 60
+
+    def __init__(self, interval=SAMPLING_PROFILER_INTERVAL, retention_minutes=SAMPLING_PROFILER_RETENTION_MINUTES):
+        self.interval = interval
+        self._buckets = deque(maxlen=max(1, retention_minutes * 60 // self.BUCKET_SECONDS))
+        self._lock = threading.Lock()
+        self._frame_names = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _frame_name(self, code):
+        # 缓存每个代码对象的显示名称，避免每次采样重复格式化
+        name = self._frame_names.get(code)
+        if name is None:
+            name = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            self._frame_names[code] = name
+        return name
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            thread_names = {t.ident: t.name for t in threading.enumerate()}
+            stacks = []
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                code = frame.f_code
+                if (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+                    continue
+                names = []
+                while frame is not None:
+                    names.append(self._frame_name(frame.f_code))
+                    frame = frame.f_back
+                names.append(thread_names.get(ident, f'thread-{ident}'))
+                stacks.append(';'.join(reversed(names)))
+            self._record(stacks)
 
-# 文件记录：存储文件信息和创建时间
-file_records = {}
-file_lock = threading.Lock()
+    def _record(self, stacks):
+        bucket_start = int(time.time()) // self.BUCKET_SECONDS * self.BUCKET_SECONDS
+        with self._lock:
+            if not self._buckets or self._buckets[-1][0] != bucket_start:
+                self._buckets.append((bucket_start, Counter()))
+            self._buckets[-1][1].update(stacks)
+
+    def collapsed(self, seconds=None):
+        """返回最近 seconds 秒内（默认全部保留数据）的 collapsed-stack 文本"""
+        since = time.time() - seconds if seconds is not None else 0
+        total = Counter()
+        with self._lock:
+            for bucket_start, counts in self._buckets:
+                if bucket_start + self.BUCKET_SECONDS > since:
+                    total.update(counts)
+        return ''.join(f"{stack} {count}\n" for stack, count in total.most_common())
+
+sampling_profiler = SamplingProfiler()
+
+class RateLimitedError(Exception):
+    """租户超出每分钟转换字节数限制"""
+
+    def __init__(self, retry_after):
+        self.retry_after = max(1, math.ceil(retry_after))
+        super().__init__(f"已超出每分钟转换字节数限制，请在 {self.retry_after} 秒后重试")
+
+def identify_tenant(headers, remote_addr):
+    """返回请求所属的租户ID：优先使用 API Key，否则使用客户端地址"""
+    api_key = headers.get(TENANT_API_KEY_HEADER)
+    if api_key:
+        return tenant_id_for_api_key(api_key)
+    return f"ip:{remote_addr}"
+
+def rate_limited_response(error):
+    """构造 429 响应"""
+    response = jsonify({'error': str(error)})
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response, 429
+
+def charge_tenant(tenant_id, file_stream):
+    """按文件大小扣减租户的字节配额，超出限制时抛出 RateLimitedError，返回文件大小"""
+    file_stream.seek(0, 2)
+    size = file_stream.tell()
+    file_stream.seek(0)
+    retry_after = tenant_registry.consume(tenant_id, size)
+    if retry_after:
+        raise RateLimitedError(retry_after)
+    return size
 
 def is_allowed_file(filename):
     """检查文件类型是否被支持"""
@@ -105,8 +430,94 @@ def is_allowed_file(filename):
     }
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in allowed_extensions
 
+class UploadRejectedError(Exception):
+    """上传或下载的内容不受支持，在读取完整内容之前即被拒绝
+
+    注意：不能继承 ValueError，否则 werkzeug 解析表单时会静默吞掉该异常。
+    """
+    pass
+
+def sniff_content(head, filename):
+    """根据文件开头的字节检测文件类型，返回检测到的类型（StreamInfo），内容不受支持时抛出 UploadRejectedError
+
+    通过 MarkItDown 的 _get_stream_info_guesses（Magika）识别内容类型，只要有已注册的转换器接受该类型即视为支持。
+    Magika 的识别结果与扩展名不符时（此时会返回两个候选类型），只以 Magika 的识别结果为准，
+    因此扩展名错误但内容本身可以转换的文件（例如扩展名为 .docx 的 PDF）仍然放行；
+    Magika 无法识别内容时，则以扩展名为准。
+    只询问按扩展名、MIME 类型和文件头签名索引到的候选转换器，不会加载其他格式的转换器。
+    """
+    extension = os.path.splitext(filename)[1] or None
+    # 上传时的检测不计入 detection_counts，转换时会再次检测并计数
+    guesses = md_converter._get_stream_info_guesses(
+        io.BytesIO(head), StreamInfo(extension=extension, filename=filename), count=False
+    )
+    guess = guesses[-1]
+    dispatch_index = md_converter._get_dispatch_index()
+    for registration in dispatch_index.candidates(guess, dispatch_index.signature_ranks(head)):
+        try:
+            if registration.converter.accepts(io.BytesIO(head), guess):
+                return guess
+        except Exception:
+            continue
+    
+    detected = guess.mimetype or '未知类型'
+    if len(guesses) > 1:
+        raise UploadRejectedError(f'文件内容与扩展名不符: {filename} 的实际内容为 {detected}，该类型不受支持')
+    raise UploadRejectedError(f'不支持的文件内容: {filename}（{detected}）')
+
+class SniffingStream:
+    """包装上传文件的临时存储，收到开头的 UPLOAD_SNIFF_BYTES 字节后立即检测文件类型
+
+    检测失败时从 write() 中抛出 UploadRejectedError，中止请求体的解析，剩余内容不再读取。
+    小于 UPLOAD_SNIFF_BYTES 的文件在上传完成后由 check() 检测。
+    检测到的类型保存在 detected 中（见 sniff_content）。
+    """
+
+    def __init__(self, stream, filename):
+        self._stream = stream
+        self._filename = filename
+        self._head = bytearray()
+        self.checked = False
+        self.detected = None
+
+    def write(self, data):
+        if not self.checked:
+            self._head += data[:UPLOAD_SNIFF_BYTES - len(self._head)]
+            if len(self._head) >= UPLOAD_SNIFF_BYTES:
+                self.check()
+        return self._stream.write(data)
+
+    def check(self):
+        """检测文件类型（只检测一次），返回检测到的类型"""
+        if not self.checked:
+            self.checked = True
+            self.detected = sniff_content(bytes(self._head), self._filename)
+        return self.detected
+
+    def __iter__(self):
+        return iter(self._stream)
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+class SniffingRequest(Request):
+    """在上传过程中检测文件类型的请求类，尽早拒绝不支持的文件"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        stream = super()._get_file_stream(total_content_length, content_type, filename, content_length)
+        if filename:
+            if not is_allowed_file(filename):
+                raise UploadRejectedError('不支持的文件类型')
+            return SniffingStream(stream, filename)
+        return stream
+
+app.request_class = SniffingRequest
+
 def download_file_from_url(url, max_size=MAX_FILE_SIZE):
-    """从URL下载文件"""
+    """从URL下载文件，收到开头的 UPLOAD_SNIFF_BYTES 字节后即检测文件类型，不支持时中止下载
+
+    返回 (文件内容, 文件名, 检测到的类型)
+    """
     try:
         # 发送HEAD请求检查文件大小
         head_response = requests.head(url, timeout=10)
@@ -119,19 +530,6 @@ def download_file_from_url(url, max_size=MAX_FILE_SIZE):
         response = requests.get(url, timeout=30, stream=True)
         response.raise_for_status()
         
-        # 检查实际下载大小
-        content = io.BytesIO()
-        downloaded_size = 0
-        
-        for chunk in response.iter_content(chunk_size=8192):
-            if chunk:
-                downloaded_size += len(chunk)
-                if downloaded_size > max_size:
-                    raise ValueError(f"文件下载过程中超出大小限制")
-                content.write(chunk)
-        
-        content.seek(0)
-        
         # 尝试从响应头获取文件名
         filename = None
         if 'content-disposition' in response.headers:
@@ -151,13 +549,47 @@ def download_file_from_url(url, max_size=MAX_FILE_SIZE):
                 if ext:
                     filename += ext
         
-        return content, filename
+        # 检查文件类型
+        if not is_allowed_file(filename):
+            response.close()
+            raise UploadRejectedError(f'不支持的文件类型: {filename}')
+        
+        # 检查实际下载大小
+        content = io.BytesIO()
+        sniffer = SniffingStream(content, filename)
+        downloaded_size = 0
+        
+        try:
+            for chunk in response.iter_content(chunk_size=8192):
+                if chunk:
+                    downloaded_size += len(chunk)
+                    if downloaded_size > max_size:
+                        raise ValueError(f"文件下载过程中超出大小限制")
+                    sniffer.write(chunk)
+            detected = sniffer.check()
+        finally:
+            response.close()
         
+        content.seek(0)
+        return content, filename, detected
+        
+    except UploadRejectedError:
+        raise
     except Exception as e:
         raise Exception(f"下载文件失败: {str(e)}")
 
-def convert_to_markdown(file_stream, filename):
-    """将文件转换为Markdown"""
+def worker_pool_for(filename, detected):
+    """返回转换该文件的工作进程池（格式族），在本进程内转换时返回 None
+
+    按 sniff_content 检测到的类型选择格式族；检测到的类型与扩展名不属于同一格式族时（例如扩展名为 .docx 的 PDF），
+    在本进程内转换，因为工作进程只注册了一个格式族的转换器，且不运行 Magika。
+    """
+    if not worker_pools or detected is None:
+        return None
+    return worker_pools.family_for(filename, detected.extension)
+
+def convert_to_markdown(file_stream, filename, detected=None):
+    """将文件转换为Markdown，detected 为上传或下载时检测到的文件类型（见 sniff_content）"""
     try:
         # 确保文件流是二进制模式
         if hasattr(file_stream, 'mode') and 'b' not in file_stream.mode:
@@ -173,10 +605,22 @@ def convert_to_markdown(file_stream, filename):
             elif isinstance(file_stream, bytes):
                 file_stream = io.BytesIO(file_stream)
         
+        # 转换时限，超时抛出 ConversionTimeoutException
+        deadline = CONVERSION_TIMEOUT or None
+        
+        # 配置了对应格式族的工作进程池时在池中转换
+        family = worker_pool_for(filename, detected)
+        if family:
+            return worker_pools.convert(family, file_stream.read(), Path(filename).suffix, deadline)
+        
         # 使用MarkItDown进行转换
-        result = md_converter.convert_stream(file_stream, file_extension=Path(filename).suffix)
+        result = md_converter.convert_stream(file_stream, file_extension=Path(filename).suffix, deadline=deadline)
         return result.text_content
         
+    except ConversionTimeoutException:
+        # 由接口返回 504，不作为转换错误处理
+        raise
+        
     except KeyError as e:
         if 'w:ilvl' in str(e):
             # 特殊处理docx文件的w:ilvl错误（列表缩进级别问题）
@@ -209,50 +653,248 @@ def convert_to_markdown(file_stream, filename):
         
         raise Exception(error_msg)
 
+def convert_for_tenant(tenant_id, file_stream, filename, size, profiler=None, detected=None):
+    """等待租户的公平份额转换槽位，然后将文件转换为Markdown"""
+    profiler = profiler or ConversionProfiler()
+    with profiler.stage('queue_wait'):
+        queue_wait = conversion_scheduler.acquire(
+            tenant_id, tenant_registry.weight(tenant_id), max(size, MIN_SCHEDULING_COST)
+        )
+    started_at = time.perf_counter()
+    profiler.worker_pool = worker_pool_for(filename, detected)
+    try:
+        with profiler.stage('conversion'):
+            return convert_to_markdown(file_stream, filename, detected)
+    finally:
+        conversion_scheduler.release()
+        tenant_registry.record(tenant_id, time.perf_counter() - started_at, queue_wait)
+
+def download_for_tenant(tenant_id, url):
+    """下载文件并扣减租户的字节配额，返回 (文件流, 文件名, 文件大小, 检测到的类型)"""
+    file_stream, filename, detected = download_file_from_url(url)
+    size = charge_tenant(tenant_id, file_stream)
+    return file_stream, filename, size, detected
+
 def save_markdown_file(content, original_filename):
     """保存Markdown文件并返回下载URL"""
     # 生成唯一的文件ID
     file_id = str(uuid.uuid4())
     
-    # 创建Markdown文件名
-    base_name = Path(original_filename).stem
-    md_filename = f"{base_name}_{file_id}.md"
-    md_filepath = os.path.join(DOWNLOAD_FOLDER, md_filename)
+    # 创建Markdown文件名并保存到存储后端
+    md_filename = markdown_filename(original_filename, file_id)
+    artifact_storage.save(file_id, md_filename, content, original_filename)
     
-    # 保存文件
-    with open(md_filepath, 'w', encoding='utf-8') as f:
-        f.write(content)
+    return file_id, md_filename
+
+def open_artifact(file_id):
+    """返回 (文件记录, 文件内容)，文件内容为 storage.open() 的返回值；文件不存在或已过期时抛出 FileNotFoundError"""
+    record = artifact_storage.get(file_id)
+    if record is None:
+        raise FileNotFoundError("文件不存在或已过期")
     
-    # 记录文件信息
-    with file_lock:
-        file_records[file_id] = {
-            'filename': md_filename,
-            'filepath': md_filepath,
-            'created_at': datetime.now(),
-            'original_filename': original_filename
-        }
+    # 检查文件是否过期
+    if datetime.now() - record['created_at'] > timedelta(minutes=FILE_EXPIRY_MINUTES):
+        # 清理过期文件
+        try:
+            artifact_storage.delete(file_id)
+        except:
+            pass
+        raise FileNotFoundError("文件已过期")
     
-    return file_id, md_filename
+    # 检查文件是否存在
+    content = artifact_storage.open(record)
+    if content is None:
+        raise FileNotFoundError("文件不存在")
+    return record, content
+
+def list_available_files():
+    """返回所有未过期文件的信息"""
+    files = []
+    current_time = datetime.now()
+    
+    for record in artifact_storage.list():
+        remaining_time = FILE_EXPIRY_MINUTES * 60 - (current_time - record['created_at']).total_seconds()
+        if remaining_time > 0:
+            files.append({
+                'file_id': record['file_id'],
+                'filename': record['filename'],
+                'original_filename': record['original_filename'],
+                'created_at': record['created_at'].isoformat(),
+                'remaining_seconds': int(remaining_time),
+                'download_url': f'/api/download/{record["file_id"]}'
+            })
+    return files
+
+def build_conversion_result(file_id, md_filename, original_filename, source_url=None):
+    """构造转换成功的结果信息"""
+    result = {
+        'success': True,
+        'file_id': file_id,
+        'download_url': f'/api/download/{file_id}',
+        'filename': md_filename,
+        'original_filename': original_filename,
+    }
+    if source_url is not None:
+        result['source_url'] = source_url
+    result['expires_at'] = (datetime.now() + timedelta(minutes=FILE_EXPIRY_MINUTES)).isoformat()
+    return result
+
+def parse_chunk_tokens(value):
+    """解析 chunk_tokens 查询参数，未提供时返回 None"""
+    if value is None or value == '':
+        return None
+    try:
+        chunk_tokens = int(value)
+    except ValueError:
+        raise ValueError('chunk_tokens 必须为正整数')
+    if chunk_tokens <= 0 or chunk_tokens > MAX_CHUNK_TOKENS:
+        raise ValueError(f'chunk_tokens 必须在 1 到 {MAX_CHUNK_TOKENS} 之间')
+    return chunk_tokens
+
+def check_callback_url(callback_url):
+    """检查回调URL，不允许的地址抛出 ValueError，防止通过回调访问服务器所在内网（SSRF）
+
+    配置了 CALLBACK_ALLOWED_HOSTS 时只允许其中的主机；否则解析主机名，
+    任一地址为内网、回环、链路本地、组播或保留地址时拒绝。
+    """
+    parsed_url = urlparse(callback_url)
+    if parsed_url.scheme not in ('http', 'https') or not parsed_url.hostname:
+        raise ValueError('回调URL必须是有效的 http 或 https 地址')
+    host = parsed_url.hostname.lower()
+    
+    if CALLBACK_ALLOWED_HOSTS:
+        if not any(host == allowed or (allowed.startswith('.') and host.endswith(allowed))
+                   for allowed in CALLBACK_ALLOWED_HOSTS):
+            raise ValueError(f'回调主机不在允许列表中: {host}')
+        return
+    
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, parsed_url.port or 80, proto=socket.IPPROTO_TCP)}
+    except (socket.gaierror, UnicodeError):
+        raise ValueError(f'无法解析回调主机: {host}')
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split('%', 1)[0])
+        if not ip.is_global or ip.is_multicast:
+            raise ValueError(f'回调URL不能指向内网或本机地址: {host}')
+
+def parse_callback_options(options):
+    """从表单或 JSON 参数中解析回调设置，未提供回调URL时返回 None"""
+    callback_url = (options.get('callback_url') or '').strip()
+    if not callback_url:
+        return None
+    
+    check_callback_url(callback_url)
+    
+    include_markdown = options.get('callback_include_markdown', False)
+    if isinstance(include_markdown, str):
+        include_markdown = include_markdown.strip().lower() in ('true', '1', 'yes')
+    
+    return {'url': callback_url, 'include_markdown': bool(include_markdown)}
+
+def deliver_callback(callback_url, payload):
+    """POST 回调结果，遇到网络错误、5xx、408 或 429 时按指数退避重试"""
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    headers = {
+        'Content-Type': 'application/json; charset=utf-8',
+        'X-MarkItDown-Event': payload['event'],
+    }
+    if CALLBACK_SECRET:
+        signature = hmac.new(CALLBACK_SECRET.encode('utf-8'), body, hashlib.sha256).hexdigest()
+        headers['X-MarkItDown-Signature'] = f'sha256={signature}'
+    
+    for attempt in range(1, CALLBACK_MAX_ATTEMPTS + 1):
+        try:
+            # 每次投递前重新检查：主机名在提交任务后可能被解析到其他地址。不跟随重定向，重定向目标未经检查
+            check_callback_url(callback_url)
+        except ValueError as e:
+            print(f"回调被拒绝 {callback_url}: {e}")
+            return False
+        try:
+            response = requests.post(callback_url, data=body, headers=headers, timeout=CALLBACK_TIMEOUT,
+                                     allow_redirects=False)
+            if response.status_code < 300:
+                return True
+            if response.status_code < 500 and response.status_code not in (408, 429):
+                # 其他客户端错误重试也不会成功
+                print(f"回调被拒绝 {callback_url}: HTTP {response.status_code}")
+                return False
+            reason = f'HTTP {response.status_code}'
+        except requests.RequestException as e:
+            reason = str(e)
+        
+        if attempt < CALLBACK_MAX_ATTEMPTS:
+            delay = min(CALLBACK_BACKOFF_SECONDS * 2 ** (attempt - 1), CALLBACK_BACKOFF_MAX_SECONDS)
+            print(f"回调失败 {callback_url}（第 {attempt} 次）: {reason}，{delay:.1f} 秒后重试")
+            time.sleep(delay * random.uniform(1.0, 1.5))
+        else:
+            print(f"回调失败 {callback_url}，已放弃（共 {attempt} 次）: {reason}")
+    return False
+
+def run_conversion_task(task_id, tenant_id, load_source, callback, source_url=None, chunk_tokens=None):
+    """在后台执行转换，完成后通过回调通知结果
+
+    load_source 返回 (file_stream, filename, size, detected)，对于 URL 转换，下载也在后台进行。
+    指定 chunk_tokens 时回调中同时包含切分后的文本块。
+    """
+    payload = {'task_id': task_id}
+    if source_url is not None:
+        payload['source_url'] = source_url
+    
+    try:
+        file_stream, filename, size, detected = load_source()
+        payload['original_filename'] = filename
+        markdown_content = convert_for_tenant(tenant_id, file_stream, filename, size, detected=detected)
+        file_id, md_filename = save_markdown_file(markdown_content, filename)
+        
+        payload['event'] = 'conversion.completed'
+        payload.update(build_conversion_result(file_id, md_filename, filename, source_url))
+        if callback['include_markdown']:
+            payload['markdown'] = markdown_content
+        if chunk_tokens is not None:
+            payload['chunks'] = chunk_markdown(markdown_content, chunk_tokens)
+    except Exception as e:
+        payload['event'] = 'conversion.failed'
+        payload['success'] = False
+        payload['error'] = str(e)
+    
+    callback_executor.submit(deliver_callback, callback['url'], payload)
+
+def submit_conversion_task(tenant_id, load_source, callback, source_url=None, chunk_tokens=None):
+    """提交一个带回调的异步转换任务，并返回 202 响应的内容"""
+    task_id = str(uuid.uuid4())
+    conversion_executor.submit(tenant_id, run_conversion_task, task_id, tenant_id, load_source, callback,
+                               source_url, chunk_tokens)
+    response = {
+        'success': True,
+        'status': 'accepted',
+        'task_id': task_id,
+        'callback_url': callback['url'],
+    }
+    if source_url is not None:
+        response['source_url'] = source_url
+    return response
 
 def cleanup_expired_files():
     """清理过期文件"""
     current_time = datetime.now()
-    expired_files = []
     
-    with file_lock:
-        for file_id, record in list(file_records.items()):
-            if current_time - record['created_at'] > timedelta(minutes=FILE_EXPIRY_MINUTES):
-                expired_files.append((file_id, record))
-        
-        # 删除过期文件记录和实际文件
-        for file_id, record in expired_files:
-            try:
-                if os.path.exists(record['filepath']):
-                    os.remove(record['filepath'])
-                del file_records[file_id]
-                print(f"已删除过期文件: {record['filename']}")
-            except Exception as e:
-                print(f"删除文件失败 {record['filename']}: {e}")
+    # 删除过期文件记录和实际文件
+    try:
+        expired_files = artifact_storage.cleanup_expired(current_time - timedelta(minutes=FILE_EXPIRY_MINUTES))
+        for record in expired_files:
+            print(f"已删除过期文件: {record['filename']}")
+    except Exception as e:
+        print(f"清理过期文件失败: {e}")
+
+    # 清理过期的性能分析文件
+    for name in os.listdir(PROFILE_FOLDER):
+        filepath = os.path.join(PROFILE_FOLDER, name)
+        try:
+            modified_at = datetime.fromtimestamp(os.path.getmtime(filepath))
+            if current_time - modified_at > timedelta(minutes=FILE_EXPIRY_MINUTES):
+                os.remove(filepath)
+        except OSError as e:
+            print(f"删除性能分析文件失败 {name}: {e}")
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -299,6 +941,8 @@ def convert_file():
     description: |
       上传各种格式的文件（PDF, DOCX, PPTX, XLSX, 图片, 音频等）并转换为 Markdown 格式。
       转换后的文件会在30分钟后自动删除。
+      提供 callback_url 时转换在后台进行，接口立即返回 202，转换完成或失败后服务器将结果 POST 到回调地址。
+      回调地址必须在 CALLBACK_ALLOWED_HOSTS 中；未配置该项时不能指向内网、回环或链路本地地址。
       
       支持的文件格式：
       - 文档：PDF, Word(DOCX/DOC), PowerPoint(PPTX/PPT), Excel(XLSX/XLS)
@@ -315,6 +959,31 @@ def convert_file():
         type: file
         required: true
         description: 要转换的文件（最大50MB）
+      - name: callback_url
+        in: formData
+        type: string
+        required: false
+        description: 回调URL。提供时接口立即返回 202，转换完成后服务器将结果 POST 到该地址（失败时按指数退避重试）
+      - name: callback_include_markdown
+        in: formData
+        type: boolean
+        required: false
+        description: 回调请求中是否包含 Markdown 内容（默认 false）
+      - name: profile
+        in: query
+        type: string
+        required: false
+        description: 设置为 1 时在 cProfile 下运行转换并返回分阶段耗时（仅限管理员，需 X-Admin-Token 请求头）；转换在工作进程池中执行时，结果中的 profile.worker_pool 为格式族名称，统计不包含工作进程内的调用
+      - name: chunk_tokens
+        in: query
+        type: integer
+        required: false
+        description: 指定时将结果按该 token 上限切分为文本块（chunks）一并返回，每个块包含标题路径、在 Markdown 中的字符偏移和 token 数
+      - name: X-API-Key
+        in: header
+        type: string
+        required: false
+        description: 租户 API Key，用于公平调度和按租户限流；未提供时按客户端地址区分租户
     responses:
       200:
         description: 转换成功
@@ -340,14 +1009,75 @@ def convert_file():
               type: string
               format: date-time
               example: "2025-09-21T10:30:00.123456"
+            chunks:
+              type: array
+              description: 切分后的文本块（仅在指定 chunk_tokens 时返回）
+              items:
+                type: object
+                properties:
+                  index:
+                    type: integer
+                    example: 0
+                  heading_path:
+                    type: array
+                    items:
+                      type: string
+                    example: ["Introduction", "Background"]
+                  start:
+                    type: integer
+                    description: 块在 Markdown 文件中的起始字符偏移
+                    example: 0
+                  end:
+                    type: integer
+                    description: 块在 Markdown 文件中的结束字符偏移（不含）
+                    example: 1834
+                  token_count:
+                    type: integer
+                    example: 498
+                  text:
+                    type: string
+      202:
+        description: 已接受异步转换任务（提供了 callback_url）
+        schema:
+          type: object
+          properties:
+            success:
+              type: boolean
+              example: true
+            status:
+              type: string
+              example: "accepted"
+            task_id:
+              type: string
+              description: 任务ID，回调请求中会携带相同的 task_id
+              example: "5f0e4a8c-3d61-4f3b-9c61-0c7f4d1f2a9e"
+            callback_url:
+              type: string
+              example: "https://example.com/hooks/markitdown"
       400:
-        description: 请求错误（文件格式不支持、文件过大等）
+        description: 请求错误（文件格式不支持、文件内容与扩展名不符、文件过大等）
         schema:
           type: object
           properties:
             error:
               type: string
               example: "不支持的文件类型"
+      403:
+        description: 非管理员请求性能分析
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "性能分析仅限管理员使用"
+      429:
+        description: 租户超出每分钟转换字节数限制，Retry-After 响应头给出建议的重试等待秒数
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "已超出每分钟转换字节数限制，请在 12 秒后重试"
       500:
         description: 服务器错误（转换失败等）
         schema:
@@ -356,53 +1086,104 @@ def convert_file():
             error:
               type: string
               example: "转换失败: 具体错误信息"
+      504:
+        description: 转换超过 CONVERSION_TIMEOUT 秒的时限
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "转换超时（超过 60 秒）"
     """
     # 处理 OPTIONS 预检请求
     if request.method == 'OPTIONS':
         response = jsonify()
         response.headers.add('Access-Control-Allow-Origin', '*')
-        response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
+        response.headers.add('Access-Control-Allow-Headers', f'Content-Type,Authorization,{TENANT_API_KEY_HEADER}')
         response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
         return response
         
+    # 检查性能分析权限
+    profile_requested = request.args.get('profile') == '1'
+    if profile_requested and not is_admin_request():
+        return jsonify({'error': '性能分析仅限管理员使用'}), 403
+
     try:
-        # 检查是否有文件
-        if 'file' not in request.files:
-            return jsonify({'error': '没有文件上传'}), 400
-        
-        file = request.files['file']
-        if file.filename == '':
-            return jsonify({'error': '没有选择文件'}), 400
-        
-        # 检查文件类型
-        if not is_allowed_file(file.filename):
-            return jsonify({'error': '不支持的文件类型'}), 400
-        
-        # 检查文件大小
-        file.seek(0, 2)  # 移动到文件末尾
-        file_size = file.tell()
-        file.seek(0)  # 回到文件开头
-        
-        if file_size > MAX_FILE_SIZE:
-            return jsonify({'error': f'文件太大，最大支持 {MAX_FILE_SIZE//1024//1024}MB'}), 400
-        
-        # 读取文件内容并转换
-        file_content = file.read()
-        file_stream = io.BytesIO(file_content)
-        markdown_content = convert_to_markdown(file_stream, file.filename)
-        
-        # 保存Markdown文件
-        file_id, md_filename = save_markdown_file(markdown_content, file.filename)
+        tenant_id = identify_tenant(request.headers, request.remote_addr)
+        profiler = ConversionProfiler(enabled=profile_requested)
+        with profiler:
+            with profiler.stage('upload_parsing'):
+                # 解析回调和切分设置（首次访问 request.form 时解析整个请求体，同时检测文件类型）
+                try:
+                    callback = parse_callback_options(request.form)
+                    chunk_tokens = parse_chunk_tokens(request.args.get('chunk_tokens'))
+                except ValueError as e:
+                    return jsonify({'error': str(e)}), 400
+                if callback and profile_requested:
+                    return jsonify({'error': '异步回调转换不支持性能分析'}), 400
+                
+                # 检查是否有文件
+                if 'file' not in request.files:
+                    return jsonify({'error': '没有文件上传'}), 400
+                
+                file = request.files['file']
+                if file.filename == '':
+                    return jsonify({'error': '没有选择文件'}), 400
+                
+                # 检查文件类型（大文件在上传过程中已检测过文件头）
+                if not is_allowed_file(file.filename):
+                    return jsonify({'error': '不支持的文件类型'}), 400
+                detected = file.stream.check() if isinstance(file.stream, SniffingStream) else None
+                
+                # 检查文件大小
+                file.seek(0, 2)  # 移动到文件末尾
+                file_size = file.tell()
+                file.seek(0)  # 回到文件开头
+                
+                if file_size > MAX_FILE_SIZE:
+                    return jsonify({'error': f'文件太大，最大支持 {MAX_FILE_SIZE//1024//1024}MB'}), 400
+                
+                # 读取文件内容
+                file_content = file.read()
+                file_stream = io.BytesIO(file_content)
+                
+                # 扣减租户的字节配额
+                charge_tenant(tenant_id, file_stream)
+            
+            # 指定了回调URL时在后台转换，完成后通知
+            if callback:
+                filename = file.filename
+                return jsonify(submit_conversion_task(tenant_id, lambda: (file_stream, filename, file_size, detected),
+                                                      callback, chunk_tokens=chunk_tokens)), 202
+            
+            # 等待公平份额转换槽位并转换文件
+            markdown_content = convert_for_tenant(tenant_id, file_stream, file.filename, file_size, profiler,
+                                                  detected=detected)
+            
+            # 按 token 上限切分
+            if chunk_tokens is not None:
+                with profiler.stage('chunking'):
+                    chunks = chunk_markdown(markdown_content, chunk_tokens)
+            
+            # 保存Markdown文件
+            with profiler.stage('disk_write'):
+                file_id, md_filename = save_markdown_file(markdown_content, file.filename)
         
-        return jsonify({
-            'success': True,
-            'file_id': file_id,
-            'download_url': f'/api/download/{file_id}',
-            'filename': md_filename,
-            'original_filename': file.filename,
-            'expires_at': (datetime.now() + timedelta(minutes=FILE_EXPIRY_MINUTES)).isoformat()
-        })
+        response = build_conversion_result(file_id, md_filename, file.filename)
+        if chunk_tokens is not None:
+            response['chunks'] = chunks
+        if profiler.enabled:
+            response['profile'] = profiler.report()
+        return jsonify(response)
         
+    except UploadRejectedError as e:
+        return jsonify({'error': str(e)}), 400
+    except RateLimitedError as e:
+        return rate_limited_response(e)
+    except ProfilerBusyError as e:
+        return jsonify({'error': str(e)}), 409
+    except ConversionTimeoutException:
+        return jsonify({'error': f"转换超时（超过 {CONVERSION_TIMEOUT:g} 秒）"}), 504
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -417,6 +1198,8 @@ def convert_url():
       从指定 URL 下载文件并转换为 Markdown 格式。
       支持的文件类型与文件上传接口相同。
       转换后的文件会在30分钟后自动删除。
+      提供 callback_url 时下载和转换在后台进行，接口立即返回 202，完成或失败后服务器将结果 POST 到回调地址。
+      回调地址必须在 CALLBACK_ALLOWED_HOSTS 中；未配置该项时不能指向内网、回环或链路本地地址。
     consumes:
       - application/json
     parameters:
@@ -433,6 +1216,30 @@ def convert_url():
               format: uri
               description: 要下载和转换的文件URL
               example: "https://example.com/document.pdf"
+            callback_url:
+              type: string
+              format: uri
+              description: 回调URL。提供时接口立即返回 202，下载和转换在后台进行，完成后服务器将结果 POST 到该地址（失败时按指数退避重试）
+              example: "https://example.com/hooks/markitdown"
+            callback_include_markdown:
+              type: boolean
+              description: 回调请求中是否包含 Markdown 内容（默认 false）
+              example: false
+      - name: profile
+        in: query
+        type: string
+        required: false
+        description: 设置为 1 时在 cProfile 下运行转换并返回分阶段耗时（仅限管理员，需 X-Admin-Token 请求头）；转换在工作进程池中执行时，结果中的 profile.worker_pool 为格式族名称，统计不包含工作进程内的调用
+      - name: chunk_tokens
+        in: query
+        type: integer
+        required: false
+        description: 指定时将结果按该 token 上限切分为文本块（chunks）一并返回，每个块包含标题路径、在 Markdown 中的字符偏移和 token 数
+      - name: X-API-Key
+        in: header
+        type: string
+        required: false
+        description: 租户 API Key，用于公平调度和按租户限流；未提供时按客户端地址区分租户
     responses:
       200:
         description: 转换成功
@@ -461,14 +1268,75 @@ def convert_url():
               type: string
               format: date-time
               example: "2025-09-21T10:30:00.123456"
+            chunks:
+              type: array
+              description: 切分后的文本块（仅在指定 chunk_tokens 时返回）
+              items:
+                type: object
+                properties:
+                  index:
+                    type: integer
+                    example: 0
+                  heading_path:
+                    type: array
+                    items:
+                      type: string
+                    example: ["Introduction", "Background"]
+                  start:
+                    type: integer
+                    description: 块在 Markdown 文件中的起始字符偏移
+                    example: 0
+                  end:
+                    type: integer
+                    description: 块在 Markdown 文件中的结束字符偏移（不含）
+                    example: 1834
+                  token_count:
+                    type: integer
+                    example: 498
+                  text:
+                    type: string
+      202:
+        description: 已接受异步转换任务（提供了 callback_url）
+        schema:
+          type: object
+          properties:
+            success:
+              type: boolean
+              example: true
+            status:
+              type: string
+              example: "accepted"
+            task_id:
+              type: string
+              description: 任务ID，回调请求中会携带相同的 task_id
+              example: "5f0e4a8c-3d61-4f3b-9c61-0c7f4d1f2a9e"
+            callback_url:
+              type: string
+              example: "https://example.com/hooks/markitdown"
       400:
-        description: 请求错误（URL无效、文件格式不支持等）
+        description: 请求错误（URL无效、文件格式不支持、文件内容与扩展名不符等）
         schema:
           type: object
           properties:
             error:
               type: string
               example: "需要提供URL"
+      403:
+        description: 非管理员请求性能分析
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "性能分析仅限管理员使用"
+      429:
+        description: 租户超出每分钟转换字节数限制，Retry-After 响应头给出建议的重试等待秒数
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "已超出每分钟转换字节数限制，请在 12 秒后重试"
       500:
         description: 服务器错误（下载失败、转换失败等）
         schema:
@@ -477,47 +1345,86 @@ def convert_url():
             error:
               type: string
               example: "下载文件失败: 具体错误信息"
+      504:
+        description: 转换超过 CONVERSION_TIMEOUT 秒的时限
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "转换超时（超过 60 秒）"
     """
     # 处理 OPTIONS 预检请求
     if request.method == 'OPTIONS':
         response = jsonify()
         response.headers.add('Access-Control-Allow-Origin', '*')
-        response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
+        response.headers.add('Access-Control-Allow-Headers', f'Content-Type,Authorization,{TENANT_API_KEY_HEADER}')
         response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
         return response
         
+    # 检查性能分析权限
+    profile_requested = request.args.get('profile') == '1'
+    if profile_requested and not is_admin_request():
+        return jsonify({'error': '性能分析仅限管理员使用'}), 403
+
     try:
-        data = request.get_json()
-        if not data or 'url' not in data:
-            return jsonify({'error': '需要提供URL'}), 400
-        
-        url = data['url'].strip()
-        if not url:
-            return jsonify({'error': 'URL不能为空'}), 400
-        
-        # 下载文件
-        file_stream, filename = download_file_from_url(url)
-        
-        # 检查文件类型
-        if not is_allowed_file(filename):
-            return jsonify({'error': f'不支持的文件类型: {filename}'}), 400
-        
-        # 转换文件
-        markdown_content = convert_to_markdown(file_stream, filename)
-        
-        # 保存Markdown文件
-        file_id, md_filename = save_markdown_file(markdown_content, filename)
+        tenant_id = identify_tenant(request.headers, request.remote_addr)
+        profiler = ConversionProfiler(enabled=profile_requested)
+        with profiler:
+            with profiler.stage('upload_parsing'):
+                data = request.get_json()
+                if not data or 'url' not in data:
+                    return jsonify({'error': '需要提供URL'}), 400
+                
+                url = data['url'].strip()
+                if not url:
+                    return jsonify({'error': 'URL不能为空'}), 400
+                
+                # 解析回调和切分设置
+                try:
+                    callback = parse_callback_options(data)
+                    chunk_tokens = parse_chunk_tokens(request.args.get('chunk_tokens'))
+                except ValueError as e:
+                    return jsonify({'error': str(e)}), 400
+                
+                # 指定了回调URL时在后台下载并转换，完成后通知
+                if callback:
+                    if profile_requested:
+                        return jsonify({'error': '异步回调转换不支持性能分析'}), 400
+                    return jsonify(submit_conversion_task(tenant_id, lambda: download_for_tenant(tenant_id, url),
+                                                          callback, source_url=url, chunk_tokens=chunk_tokens)), 202
+                
+                # 下载文件（同时检查文件类型），并扣减租户的字节配额
+                file_stream, filename, file_size, detected = download_for_tenant(tenant_id, url)
+            
+            # 等待公平份额转换槽位并转换文件
+            markdown_content = convert_for_tenant(tenant_id, file_stream, filename, file_size, profiler,
+                                                  detected=detected)
+            
+            # 按 token 上限切分
+            if chunk_tokens is not None:
+                with profiler.stage('chunking'):
+                    chunks = chunk_markdown(markdown_content, chunk_tokens)
+            
+            # 保存Markdown文件
+            with profiler.stage('disk_write'):
+                file_id, md_filename = save_markdown_file(markdown_content, filename)
         
-        return jsonify({
-            'success': True,
-            'file_id': file_id,
-            'download_url': f'/api/download/{file_id}',
-            'filename': md_filename,
-            'original_filename': filename,
-            'source_url': url,
-            'expires_at': (datetime.now() + timedelta(minutes=FILE_EXPIRY_MINUTES)).isoformat()
-        })
+        response = build_conversion_result(file_id, md_filename, filename, source_url=url)
+        if chunk_tokens is not None:
+            response['chunks'] = chunks
+        if profiler.enabled:
+            response['profile'] = profiler.report()
+        return jsonify(response)
         
+    except UploadRejectedError as e:
+        return jsonify({'error': str(e)}), 400
+    except RateLimitedError as e:
+        return rate_limited_response(e)
+    except ProfilerBusyError as e:
+        return jsonify({'error': str(e)}), 409
+    except ConversionTimeoutException:
+        return jsonify({'error': f"转换超时（超过 {CONVERSION_TIMEOUT:g} 秒）"}), 504
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -563,35 +1470,18 @@ def download_file(file_id):
               type: string
               example: "文件不存在或已过期"
     """
-    with file_lock:
-        if file_id not in file_records:
-            abort(404, description="文件不存在或已过期")
-        
-        record = file_records[file_id]
-        
-        # 检查文件是否过期
-        if datetime.now() - record['created_at'] > timedelta(minutes=FILE_EXPIRY_MINUTES):
-            # 清理过期文件
-            try:
-                if os.path.exists(record['filepath']):
-                    os.remove(record['filepath'])
-                del file_records[file_id]
-            except:
-                pass
-            abort(404, description="文件已过期")
-        
-        # 检查文件是否存在
-        if not os.path.exists(record['filepath']):
-            del file_records[file_id]
-            abort(404, description="文件不存在")
-        
-        # 返回文件
-        return send_file(
-            record['filepath'],
-            as_attachment=True,
-            download_name=record['filename'],
-            mimetype='text/markdown'
-        )
+    try:
+        record, content = open_artifact(file_id)
+    except FileNotFoundError as e:
+        abort(404, description=str(e))
+    
+    # 返回文件
+    return send_file(
+        content,
+        as_attachment=True,
+        download_name=record['filename'],
+        mimetype='text/markdown'
+    )
 
 @app.route('/api/files', methods=['GET'])
 def list_files():
@@ -640,23 +1530,252 @@ def list_files():
                     description: 下载链接
                     example: "/api/download/bcf5d839-97e2-4036-8ccd-902bfa3e8205"
     """
-    with file_lock:
-        files = []
-        current_time = datetime.now()
-        
-        for file_id, record in file_records.items():
-            remaining_time = FILE_EXPIRY_MINUTES * 60 - (current_time - record['created_at']).total_seconds()
-            if remaining_time > 0:
-                files.append({
-                    'file_id': file_id,
-                    'filename': record['filename'],
-                    'original_filename': record['original_filename'],
-                    'created_at': record['created_at'].isoformat(),
-                    'remaining_seconds': int(remaining_time),
-                    'download_url': f'/api/download/{file_id}'
-                })
-        
-        return jsonify({'files': files})
+    return jsonify({'files': list_available_files()})
+
+@app.route('/api/debug/profiles/<profile_id>', methods=['GET'])
+def download_profile(profile_id):
+    """性能分析文件下载端点
+    ---
+    tags:
+      - 调试
+    summary: 下载单次转换请求的 pstats 性能分析文件
+    description: |
+      下载通过 `?profile=1` 生成的 cProfile 统计文件，可使用 `python -m pstats` 或 snakeviz 查看。
+      仅限管理员使用，需要 X-Admin-Token 请求头。文件在创建30分钟后会自动删除。
+    parameters:
+      - name: profile_id
+        in: path
+        type: string
+        required: true
+        description: 性能分析唯一标识符
+    produces:
+      - application/octet-stream
+    responses:
+      200:
+        description: 文件下载成功
+      403:
+        description: 非管理员请求
+      404:
+        description: 文件不存在或已过期
+    """
+    if not is_admin_request():
+        abort(403, description="仅限管理员使用")
+    
+    filename = secure_filename(f"{profile_id}.pstats")
+    if not os.path.exists(os.path.join(PROFILE_FOLDER, filename)):
+        abort(404, description="文件不存在或已过期")
+    
+    return send_from_directory(PROFILE_FOLDER, filename, as_attachment=True,
+                               mimetype='application/octet-stream')
+
+@app.route('/api/debug/profile', methods=['GET'])
+def download_sampling_profile():
+    """采样分析数据下载端点
+    ---
+    tags:
+      - 调试
+    summary: 下载后台采样分析器聚合的 collapsed-stack 火焰图数据
+    description: |
+      返回后台采样分析器在最近 N 秒内采集的调用栈，格式为 collapsed-stack（每行 `栈;帧 次数`），
+      可直接用 flamegraph.pl 或 speedscope 生成火焰图。
+      采样分析器需通过环境变量 SAMPLING_PROFILER_ENABLED=true 启用。
+      仅限管理员使用，需要 X-Admin-Token 请求头。
+    parameters:
+      - name: seconds
+        in: query
+        type: integer
+        required: false
+        description: 时间窗口（秒），默认返回全部保留的数据
+    produces:
+      - text/plain
+    responses:
+      200:
+        description: 下载成功
+      400:
+        description: 参数错误
+      403:
+        description: 非管理员请求
+      503:
+        description: 采样分析器未启用
+    """
+    if not is_admin_request():
+        abort(403, description="仅限管理员使用")
+    
+    if not sampling_profiler.running:
+        return jsonify({'error': '采样分析器未启用'}), 503
+    
+    seconds = request.args.get('seconds')
+    if seconds is not None:
+        try:
+            seconds = int(seconds)
+        except ValueError:
+            seconds = 0
+        if seconds <= 0:
+            return jsonify({'error': 'seconds 必须为正整数'}), 400
+    
+    filename = f"profile_{datetime.now().strftime('%Y%m%d%H%M%S')}.folded"
+    return Response(
+        sampling_profiler.collapsed(seconds),
+        mimetype='text/plain',
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+@app.route('/api/debug/tenants', methods=['GET'])
+def tenant_usage():
+    """租户用量统计端点
+    ---
+    tags:
+      - 调试
+    summary: 查看各租户的转换用量和排队情况
+    description: |
+      返回每个租户（API Key 摘要或客户端地址）的请求数、转换字节数、被限流次数、累计转换耗时和排队等待耗时，
+      以及当前排队和执行中的转换数。仅限管理员使用，需要 X-Admin-Token 请求头。
+    responses:
+      200:
+        description: 查询成功
+        schema:
+          type: object
+          properties:
+            active_conversions:
+              type: integer
+              example: 4
+            concurrency:
+              type: integer
+              example: 8
+            bytes_per_minute:
+              type: integer
+              description: 每个租户每分钟可转换的字节数，0 表示不限制
+              example: 104857600
+            tenants:
+              type: object
+              description: 近期活跃租户的用量，空闲超过 TENANT_IDLE_MINUTES 分钟的租户不再列出
+              additionalProperties:
+                type: object
+                properties:
+                  requests:
+                    type: integer
+                  bytes:
+                    type: integer
+                  rate_limited:
+                    type: integer
+                  conversion_seconds:
+                    type: number
+                  queue_wait_seconds:
+                    type: number
+                  weight:
+                    type: number
+                  queued:
+                    type: integer
+                    description: 正在等待转换槽位的请求数
+                  pending_tasks:
+                    type: integer
+                    description: 尚未开始的异步转换任务数
+      403:
+        description: 非管理员请求
+    """
+    if not is_admin_request():
+        abort(403, description="仅限管理员使用")
+    
+    tenants = tenant_registry.usage()
+    queued, active = conversion_scheduler.snapshot()
+    pending = conversion_executor.pending()
+    for tenant_id, usage in tenants.items():
+        usage['queued'] = queued.get(tenant_id, 0)
+        usage['pending_tasks'] = pending.get(tenant_id, 0)
+    
+    return jsonify({
+        'active_conversions': active,
+        'concurrency': CONVERSION_CONCURRENCY,
+        'bytes_per_minute': TENANT_BYTES_PER_MINUTE,
+        'tenants': tenants,
+    })
+
+@app.route('/api/debug/detection', methods=['GET'])
+def detection_stats():
+    """文件类型检测统计端点
+    ---
+    tags:
+      - 调试
+    summary: 查看文件类型检测走各路径的次数
+    description: |
+      signature 表示由文件头魔数确认类型、跳过了 Magika 推理，magika 表示运行了 Magika 推理，
+      extension 表示仅按扩展名和 MIME 类型判断（DETECTION_POLICY=never）。
+      每次转换只统计一次（上传和下载时的文件类型检查不计入），且只统计本进程内的转换，不包括工作进程池。仅限管理员使用，需要 X-Admin-Token 请求头。
+    responses:
+      200:
+        description: 查询成功
+        schema:
+          type: object
+          properties:
+            policy:
+              type: string
+              example: when_ambiguous
+            counts:
+              type: object
+              properties:
+                signature:
+                  type: integer
+                magika:
+                  type: integer
+                extension:
+                  type: integer
+      403:
+        description: 非管理员请求
+    """
+    if not is_admin_request():
+        abort(403, description="仅限管理员使用")
+    
+    return jsonify({
+        'policy': DETECTION_POLICY,
+        'counts': md_converter.detection_counts,
+    })
+
+@app.route('/api/debug/cache', methods=['GET'])
+def cache_stats():
+    """转换结果缓存统计端点
+    ---
+    tags:
+      - 调试
+    summary: 查看转换结果缓存的命中情况和占用
+    description: |
+      hits、misses、evictions 只统计本进程内的转换，不包括工作进程池；entries 和 size 为缓存当前的条目数和总字节数
+      （memory 缓存同样只包括本进程）。未启用缓存（RESULT_CACHE 为空）时 stats 为 null。
+      仅限管理员使用，需要 X-Admin-Token 请求头。
+    responses:
+      200:
+        description: 查询成功
+        schema:
+          type: object
+          properties:
+            backend:
+              type: string
+              example: sqlite
+            max_size:
+              type: integer
+            stats:
+              type: object
+              properties:
+                hits:
+                  type: integer
+                misses:
+                  type: integer
+                evictions:
+                  type: integer
+                entries:
+                  type: integer
+                size:
+                  type: integer
+      403:
+        description: 非管理员请求
+    """
+    if not is_admin_request():
+        abort(403, description="仅限管理员使用")
+    
+    return jsonify({
+        'backend': RESULT_CACHE or None,
+        'max_size': result_cache.max_size if result_cache else None,
+        'stats': result_cache.stats if result_cache else None,
+    })
 
 @app.route('/')
 def index():
@@ -676,18 +1795,38 @@ scheduler.add_job(
     minutes=CLEANUP_INTERVAL_MINUTES,
     id='cleanup_files'
 )
-scheduler.start()
+
+# 直接运行 python app.py 时，工作进程池（spawn 方式启动）会以 __mp_main__ 的名义重新执行本脚本，
+# 此时不启动后台任务。以模块方式启动（flask run、gunicorn app:app、uvicorn asgi:app）时不会重新执行。
+if __name__ != '__mp_main__':
+    scheduler.start()
+    
+    # 启动后台采样分析器
+    if SAMPLING_PROFILER_ENABLED:
+        sampling_profiler.start()
 
 if __name__ == '__main__':
     print("MarkItDown 后端服务正在启动...")
     print(f"文件过期时间: {FILE_EXPIRY_MINUTES} 分钟")
     print(f"最大文件大小: {MAX_FILE_SIZE//1024//1024} MB")
+    if worker_pools:
+        print(f"工作进程池: {WORKER_POOLS}")
+    if result_cache:
+        print(f"转换结果缓存: {RESULT_CACHE}（上限 {RESULT_CACHE_MAX_MB} MB）")
+    if CONVERSION_TIMEOUT:
+        print(f"转换时限: {CONVERSION_TIMEOUT:g} 秒")
     print("API端点:")
     print("  POST /api/convert/file - 文件上传转换")
     print("  POST /api/convert/url - URL转换")
+    print("  （两个转换接口均可通过 callback_url 参数转为异步处理并回调通知）")
     print("  GET /api/download/<file_id> - 文件下载")
     print("  GET /api/files - 列出所有文件")
     print("  GET /api/health - 健康检查")
+    print("  GET /api/debug/profiles/<profile_id> - 下载性能分析文件（管理员）")
+    print("  GET /api/debug/profile?seconds=N - 下载采样分析火焰图数据（管理员）")
+    print("  GET /api/debug/tenants - 查看各租户用量（管理员）")
+    print("  GET /api/debug/detection - 查看文件类型检测统计（管理员）")
+    print("  GET /api/debug/cache - 查看转换结果缓存统计（管理员）")
     
     # 获取环境变量中的端口，如果不存在则使用默认端口5000
     port = int(os.environ.get('PORT', 5000))
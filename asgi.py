@@ -0,0 +1,278 @@
+"""
+MarkItDown API 的 ASGI 版本
+提供与 app.py 相同的转换、下载和文件列表接口，上传使用异步解析，下载使用流式响应。
+REST 接口与 MCP 服务（markitdown_mcp）运行在同一个 Starlette/uvicorn 进程中，
+共享同一个已预热的 MarkItDown 实例、转换调度器和存储后端。
+
+运行方式：uvicorn asgi:app --host 0.0.0.0 --port 5000
+MCP 端点：/mcp（Streamable HTTP）和 /sse（SSE），需设置 ASGI_ENABLE_MCP=true 启用。
+启用后 MCP 端点仅限管理员使用（X-Admin-Token 请求头），且 MCP 工具不接受 file: URI，
+避免能访问 REST 端口的任何人读取服务器上的文件。未设置 ADMIN_TOKEN 时 MCP 端点拒绝所有请求。
+上传请求体由 Starlette 完整接收后才检查文件头，无法像 Flask 服务那样在收到文件开头时即拒绝。
+性能分析与调试接口仍由 Flask 服务（app.py）提供。
+"""
+
+import io
+import os
+from datetime import datetime
+from urllib.parse import quote
+
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from starlette.exceptions import HTTPException
+from starlette.middleware.cors import CORSMiddleware
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, JSONResponse, StreamingResponse
+from starlette.routing import Route
+from markitdown import ConversionTimeoutException
+from markitdown_mcp.__main__ import create_starlette_app, mcp, set_allow_file_uris, set_markitdown
+
+from app import (
+    CONVERSION_TIMEOUT,
+    MAX_FILE_SIZE,
+    UPLOAD_SNIFF_BYTES,
+    RateLimitedError,
+    UploadRejectedError,
+    _env_flag,
+    build_conversion_result,
+    charge_tenant,
+    chunk_markdown,
+    convert_for_tenant,
+    download_for_tenant,
+    identify_tenant,
+    is_admin_token,
+    is_allowed_file,
+    list_available_files,
+    md_converter,
+    open_artifact,
+    parse_callback_options,
+    parse_chunk_tokens,
+    save_markdown_file,
+    sniff_content,
+    submit_conversion_task,
+)
+
+MAX_MULTIPART_OVERHEAD = 1024 * 1024  # 请求体中除文件外的表单字段和分隔符的上限
+ASGI_ENABLE_MCP = _env_flag('ASGI_ENABLE_MCP')  # 是否同时提供 MCP 端点，启用后仅限管理员使用
+MCP_PATH_PREFIXES = ('/mcp', '/sse', '/messages/')  # MCP 服务的路径
+
+def error_response(message, status_code):
+    """构造错误响应"""
+    return JSONResponse({'error': message}, status_code=status_code)
+
+def rate_limited_response(error):
+    """构造 429 响应"""
+    return JSONResponse({'error': str(error)}, status_code=429,
+                        headers={'Retry-After': str(error.retry_after)})
+
+def request_tenant(request):
+    """返回请求所属的租户ID"""
+    return identify_tenant(request.headers, request.client.host if request.client else None)
+
+async def finish_conversion(markdown_content, filename, chunk_tokens, source_url=None):
+    """保存转换结果，并按需切分文本块，返回响应内容"""
+    if chunk_tokens is not None:
+        chunks = await run_in_threadpool(chunk_markdown, markdown_content, chunk_tokens)
+    file_id, md_filename = await run_in_threadpool(save_markdown_file, markdown_content, filename)
+
+    response = build_conversion_result(file_id, md_filename, filename, source_url)
+    if chunk_tokens is not None:
+        response['chunks'] = chunks
+    return response
+
+async def health_check(request):
+    """健康检查端点"""
+    return JSONResponse({
+        'status': 'healthy',
+        'service': 'MarkItDown API',
+        'version': '1.0.0',
+        'timestamp': datetime.now().isoformat()
+    })
+
+async def convert_file(request):
+    """文件上传转换端点，参数和响应与 app.py 相同"""
+    if request.query_params.get('profile') == '1':
+        return error_response('ASGI 服务不支持性能分析，请使用 Flask 服务', 400)
+
+    # 请求体明显超过上限时不再读取
+    content_length = request.headers.get('content-length')
+    if content_length and content_length.isdigit() and int(content_length) > MAX_FILE_SIZE + MAX_MULTIPART_OVERHEAD:
+        return error_response(f'文件太大，最大支持 {MAX_FILE_SIZE//1024//1024}MB', 400)
+
+    try:
+        tenant_id = request_tenant(request)
+
+        # 上传的文件由 Starlette 异步读取到临时文件中，表单关闭时删除。
+        # 除上面的 Content-Length 预检查外，文件头和文件大小都要在请求体完整接收后才能检查，见模块说明
+        async with request.form(max_files=1) as form:
+            # 解析回调和切分设置
+            try:
+                callback = parse_callback_options(form)
+                chunk_tokens = parse_chunk_tokens(request.query_params.get('chunk_tokens'))
+            except ValueError as e:
+                return error_response(str(e), 400)
+
+            # 检查是否有文件
+            upload = form.get('file')
+            if upload is None or isinstance(upload, str):
+                return error_response('没有文件上传', 400)
+            if not upload.filename:
+                return error_response('没有选择文件', 400)
+            filename = upload.filename
+
+            # 检查文件类型和大小
+            if not is_allowed_file(filename):
+                return error_response('不支持的文件类型', 400)
+            if upload.size > MAX_FILE_SIZE:
+                return error_response(f'文件太大，最大支持 {MAX_FILE_SIZE//1024//1024}MB', 400)
+
+            # 根据文件头检查文件内容与扩展名是否相符
+            head = await upload.read(UPLOAD_SNIFF_BYTES)
+            detected = await run_in_threadpool(sniff_content, head, filename)
+
+            # 读取文件内容（临时文件在表单关闭时删除），并扣减租户的字节配额
+            file_stream = io.BytesIO(head + await upload.read())
+            file_size = charge_tenant(tenant_id, file_stream)
+
+        # 指定了回调URL时在后台转换，完成后通知
+        if callback:
+            return JSONResponse(submit_conversion_task(tenant_id, lambda: (file_stream, filename, file_size, detected),
+                                                       callback, chunk_tokens=chunk_tokens), status_code=202)
+
+        # 等待公平份额转换槽位并转换文件
+        markdown_content = await run_in_threadpool(convert_for_tenant, tenant_id, file_stream, filename, file_size,
+                                                   detected=detected)
+        return JSONResponse(await finish_conversion(markdown_content, filename, chunk_tokens))
+
+    except HTTPException as e:
+        # 表单解析失败（格式错误、文件数量过多等）
+        return error_response(e.detail, e.status_code)
+    except UploadRejectedError as e:
+        return error_response(str(e), 400)
+    except RateLimitedError as e:
+        return rate_limited_response(e)
+    except ConversionTimeoutException:
+        return error_response(f"转换超时（超过 {CONVERSION_TIMEOUT:g} 秒）", 504)
+    except Exception as e:
+        return error_response(str(e), 500)
+
+async def convert_url(request):
+    """URL转换端点，参数和响应与 app.py 相同"""
+    if request.query_params.get('profile') == '1':
+        return error_response('ASGI 服务不支持性能分析，请使用 Flask 服务', 400)
+
+    try:
+        tenant_id = request_tenant(request)
+
+        try:
+            data = await request.json()
+        except ValueError:
+            data = None
+        if not isinstance(data, dict) or 'url' not in data:
+            return error_response('需要提供URL', 400)
+
+        url = data['url'].strip()
+        if not url:
+            return error_response('URL不能为空', 400)
+
+        # 解析回调和切分设置
+        try:
+            callback = parse_callback_options(data)
+            chunk_tokens = parse_chunk_tokens(request.query_params.get('chunk_tokens'))
+        except ValueError as e:
+            return error_response(str(e), 400)
+
+        # 指定了回调URL时在后台下载并转换，完成后通知
+        if callback:
+            return JSONResponse(submit_conversion_task(tenant_id, lambda: download_for_tenant(tenant_id, url),
+                                                       callback, source_url=url, chunk_tokens=chunk_tokens),
+                                status_code=202)
+
+        # 下载文件（同时检查文件类型）并扣减租户的字节配额，然后等待转换槽位并转换
+        file_stream, filename, file_size, detected = await run_in_threadpool(download_for_tenant, tenant_id, url)
+        markdown_content = await run_in_threadpool(convert_for_tenant, tenant_id, file_stream, filename, file_size,
+                                                   detected=detected)
+
+        return JSONResponse(await finish_conversion(markdown_content, filename, chunk_tokens, source_url=url))
+
+    except UploadRejectedError as e:
+        return error_response(str(e), 400)
+    except RateLimitedError as e:
+        return rate_limited_response(e)
+    except ConversionTimeoutException:
+        return error_response(f"转换超时（超过 {CONVERSION_TIMEOUT:g} 秒）", 504)
+    except Exception as e:
+        return error_response(str(e), 500)
+
+async def download_file(request):
+    """文件下载端点，以流式响应返回 Markdown 文件"""
+    try:
+        record, content = await run_in_threadpool(open_artifact, request.path_params['file_id'])
+    except FileNotFoundError as e:
+        return error_response(str(e), 404)
+
+    # 本地存储返回文件路径，对象存储返回可迭代读取的响应体
+    if isinstance(content, str):
+        return FileResponse(content, media_type='text/markdown', filename=record['filename'])
+    return StreamingResponse(
+        iterate_in_threadpool(content.iter_chunks()),
+        media_type='text/markdown',
+        headers={'Content-Disposition': f"attachment; filename*=utf-8''{quote(record['filename'])}"},
+        background=BackgroundTask(content.close),
+    )
+
+async def list_files(request):
+    """列出所有可用文件"""
+    files = await run_in_threadpool(list_available_files)
+    return JSONResponse({'files': files})
+
+routes = [
+    Route('/api/health', health_check, methods=['GET']),
+    Route('/api/convert/file', convert_file, methods=['POST']),
+    Route('/api/convert/url', convert_url, methods=['POST']),
+    Route('/api/download/{file_id}', download_file, methods=['GET']),
+    Route('/api/files', list_files, methods=['GET']),
+]
+
+class AdminOnlyMCPMiddleware:
+    """MCP 端点仅限管理员使用：没有有效 X-Admin-Token 请求头的请求返回 403"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and scope['path'].startswith(MCP_PATH_PREFIXES):
+            if not is_admin_token(Headers(scope=scope).get('x-admin-token')):
+                await error_response('仅限管理员使用', 403)(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+def create_app(enable_mcp=ASGI_ENABLE_MCP):
+    """创建 ASGI 应用，enable_mcp 为 True 时同时提供仅限管理员使用的 MCP 端点"""
+    if enable_mcp:
+        # MCP 工具与 REST 接口共用同一个 MarkItDown 实例；MCP 端点与 REST 接口一样对外开放，
+        # 因此不允许通过 file: URI 读取本地文件
+        set_markitdown(md_converter)
+        set_allow_file_uris(False)
+        asgi_app = create_starlette_app(mcp._mcp_server, routes=routes)
+        asgi_app.add_middleware(AdminOnlyMCPMiddleware)
+    else:
+        asgi_app = Starlette(routes=routes)
+
+    asgi_app.add_middleware(
+        CORSMiddleware,
+        allow_origins=['*'],  # 允许所有域名
+        allow_methods=['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS'],
+        allow_headers=['*'],
+    )
+    return asgi_app
+
+app = create_app()
+
+if __name__ == '__main__':
+    import uvicorn
+
+    # 获取环境变量中的端口，如果不存在则使用默认端口5000
+    port = int(os.environ.get('PORT', 5000))
+    uvicorn.run(app, host='0.0.0.0', port=port)
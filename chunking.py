@@ -0,0 +1,190 @@
+"""
+将转换得到的 Markdown 切分为有 token 上限的文本块，供 RAG 检索使用
+每个块包含所属的标题路径、在 Markdown 中的字符偏移量以及 token 数
+
+切分在转换完成后对完整的 Markdown 进行，而不是在转换器逐页产出内容时同步进行：
+偏移量指向保存的 Markdown 文件，而该文件是合并各部分并统一规范化（空行、行尾空白）之后的结果，
+转换也可能在工作进程中完成或直接取自缓存，此时没有逐页产出的内容可用。
+切分只是对文本的一次线性扫描，相对转换本身的开销很小。
+"""
+
+import os
+import re
+import threading
+
+# 匹配 ATX 标题（# 到 ######）
+HEADING_RE = re.compile(r'^(#{1,6})[ \t]+(.*?)[ \t#]*$')
+# 匹配代码块围栏，围栏内的空行和 # 不作为分隔或标题处理
+FENCE_RE = re.compile(r'^[ \t]*(```|~~~)')
+# 内置 token 估算：每个中日韩字符、每个单词、每个标点各计为一个 token
+ESTIMATE_TOKEN_RE = re.compile(r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]|\w+|[^\w\s]')
+
+_token_counter = None
+_token_counter_lock = threading.Lock()
+
+
+def _estimate_tokens(text):
+    return len(ESTIMATE_TOKEN_RE.findall(text))
+
+
+def get_token_counter():
+    """返回 token 计数函数
+
+    安装了 tiktoken 且编码可用时使用 tiktoken（编码由 CHUNK_TOKEN_ENCODING 指定，默认 cl100k_base），
+    否则使用内置估算。
+    """
+    global _token_counter
+    with _token_counter_lock:
+        if _token_counter is None:
+            try:
+                import tiktoken
+                encoding = tiktoken.get_encoding(os.environ.get('CHUNK_TOKEN_ENCODING', 'cl100k_base'))
+                _token_counter = lambda text: len(encoding.encode(text, disallowed_special=()))
+            except Exception:
+                # 未安装 tiktoken，或无法加载编码文件（例如离线环境）
+                _token_counter = _estimate_tokens
+        return _token_counter
+
+
+def _iter_blocks(markdown):
+    """按空行切分 Markdown，产出 (起始偏移, 结束偏移, 标题级别, 标题文本)
+
+    标题行单独成块；非标题块的标题级别和标题文本为 None。代码块内部不切分。
+    """
+    block_start = None
+    block_end = None
+    in_fence = False
+    position = 0
+
+    for line in markdown.splitlines(keepends=True):
+        line_start = position
+        position += len(line)
+        content = line.rstrip('\r\n')
+        line_end = line_start + len(content)
+
+        if FENCE_RE.match(content):
+            in_fence = not in_fence
+        elif not in_fence:
+            if not content.strip():
+                if block_start is not None:
+                    yield block_start, block_end, None, None
+                    block_start = None
+                continue
+
+            heading = HEADING_RE.match(content)
+            if heading:
+                if block_start is not None:
+                    yield block_start, block_end, None, None
+                    block_start = None
+                yield line_start, line_end, len(heading.group(1)), heading.group(2).strip()
+                continue
+
+        if block_start is None:
+            block_start = line_start
+        block_end = line_end
+
+    if block_start is not None:
+        yield block_start, block_end, None, None
+
+
+def _split_oversized(markdown, start, end, max_tokens, count_tokens):
+    """将超出上限的块先按行、再按字符切分，产出 (起始偏移, 结束偏移)"""
+    piece_start = None
+    piece_end = None
+    piece_tokens = 0
+    newline_tokens = count_tokens('\n')
+    position = start
+
+    for line in markdown[start:end].splitlines(keepends=True):
+        line_start = position
+        position += len(line)
+        line_end = line_start + len(line.rstrip('\r\n'))
+        line_tokens = count_tokens(markdown[line_start:line_end])
+
+        if piece_start is not None and piece_tokens + newline_tokens + line_tokens > max_tokens:
+            yield piece_start, piece_end
+            piece_start = None
+
+        if line_tokens > max_tokens:
+            # 单行仍然过长：二分查找不超过上限的最长前缀
+            while line_start < line_end:
+                low, high = line_start + 1, line_end
+                while low < high:
+                    middle = (low + high + 1) // 2
+                    if count_tokens(markdown[line_start:middle]) <= max_tokens:
+                        low = middle
+                    else:
+                        high = middle - 1
+                yield line_start, low
+                line_start = low
+            continue
+
+        if piece_start is None:
+            piece_start = line_start
+            piece_tokens = line_tokens
+        else:
+            piece_tokens += newline_tokens + line_tokens
+        piece_end = line_end
+
+    if piece_start is not None:
+        yield piece_start, piece_end
+
+
+def chunk_markdown(markdown, max_tokens, count_tokens=None):
+    """将 Markdown 切分为不超过 max_tokens 个 token 的块
+
+    尽量在段落边界处切分，并在遇到新标题时开始新块；单个段落超出上限时再按行或字符切分。
+    返回的每个块包含 index、heading_path（从最外层到最内层的标题）、start/end（在 markdown 中的字符偏移，
+    markdown[start:end] 即为块内容）、token_count 和 text。
+    """
+    if max_tokens <= 0:
+        raise ValueError("max_tokens 必须为正整数")
+    if count_tokens is None:
+        count_tokens = get_token_counter()
+
+    separator_tokens = count_tokens('\n\n')
+    chunks = []
+    headings = []  # (级别, 标题) 栈
+    current = None  # [起始偏移, 结束偏移, token 数, 标题路径]
+
+    def emit(start, end, heading_path):
+        text = markdown[start:end]
+        chunks.append({
+            'index': len(chunks),
+            'heading_path': heading_path,
+            'start': start,
+            'end': end,
+            'token_count': count_tokens(text),
+            'text': text,
+        })
+
+    for start, end, level, title in _iter_blocks(markdown):
+        if level is not None:
+            # 新标题开始新的章节
+            if current is not None:
+                emit(*current[:2], current[3])
+                current = None
+            headings = [h for h in headings if h[0] < level] + [(level, title)]
+
+        block_tokens = count_tokens(markdown[start:end])
+        heading_path = [h[1] for h in headings]
+
+        if current is not None and current[2] + separator_tokens + block_tokens > max_tokens:
+            emit(*current[:2], current[3])
+            current = None
+
+        if block_tokens > max_tokens:
+            for piece_start, piece_end in _split_oversized(markdown, start, end, max_tokens, count_tokens):
+                emit(piece_start, piece_end, heading_path)
+            continue
+
+        if current is None:
+            current = [start, end, block_tokens, heading_path]
+        else:
+            current[1] = end
+            current[2] += separator_tokens + block_tokens
+
+    if current is not None:
+        emit(*current[:2], current[3])
+
+    return chunks
@@ -1,12 +1,13 @@
 import contextlib
 import sys
 import os
-from collections.abc import AsyncIterator
+import threading
+from collections.abc import AsyncIterator, Sequence
 from mcp.server.fastmcp import FastMCP
 from starlette.applications import Starlette
 from mcp.server.sse import SseServerTransport
 from starlette.requests import Request
-from starlette.routing import Mount, Route
+from starlette.routing import BaseRoute, Mount, Route
 from starlette.types import Receive, Scope, Send
 from mcp.server import Server
 from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
@@ -16,11 +17,51 @@ import uvicorn
 # Initialize FastMCP server for MarkItDown (SSE)
 mcp = FastMCP("markitdown")
 
+# A single MarkItDown instance is shared by all tool calls (and, optionally, by
+# other apps hosted in the same process -- see set_markitdown)
+_markitdown: MarkItDown | None = None
+_markitdown_lock = threading.Lock()
+
+
+def get_markitdown() -> MarkItDown:
+    """Return the shared MarkItDown instance, creating it on first use."""
+    global _markitdown
+    with _markitdown_lock:
+        if _markitdown is None:
+            _markitdown = MarkItDown(enable_plugins=check_plugins_enabled())
+        return _markitdown
+
+
+def set_markitdown(markitdown: MarkItDown) -> None:
+    """Use an existing MarkItDown instance for all tool calls, e.g., when the MCP
+    server is co-hosted with another app that already holds a warm instance."""
+    global _markitdown
+    with _markitdown_lock:
+        _markitdown = markitdown
+
+
+# Whether tool calls may read local files through file: URIs (see set_allow_file_uris)
+_allow_file_uris = True
+
+
+def set_allow_file_uris(allow: bool) -> None:
+    """Allow or refuse file: URIs in tool calls. Apps that expose the MCP server beyond
+    the local machine (e.g., co-hosted with a public API) should refuse them, since they
+    would let any client read the files that the server can read."""
+    global _allow_file_uris
+    _allow_file_uris = allow
+
 
 @mcp.tool()
 async def convert_to_markdown(uri: str) -> str:
     """Convert a resource described by an http:, https:, file: or data: URI to markdown"""
-    return MarkItDown(enable_plugins=check_plugins_enabled()).convert_uri(uri).markdown
+    if not _allow_file_uris and uri.strip().lower().startswith("file:"):
+        raise ValueError("file: URIs are not allowed by this server")
+
+    # Downloads are asynchronous and conversions run on an executor, so a slow
+    # conversion does not block the other sessions
+    result = await get_markitdown().aconvert_uri(uri)
+    return result.markdown
 
 
 def check_plugins_enabled() -> bool:
@@ -31,7 +72,16 @@ def check_plugins_enabled() -> bool:
     )
 
 
-def create_starlette_app(mcp_server: Server, *, debug: bool = False) -> Starlette:
+def create_starlette_app(
+    mcp_server: Server,
+    *,
+    debug: bool = False,
+    routes: Sequence[BaseRoute] | None = None,
+) -> Starlette:
+    """Create the Starlette app serving the MCP server over Streamable HTTP and SSE.
+
+    Additional `routes` (e.g., a REST API) are served by the same app, after the MCP routes.
+    """
     sse = SseServerTransport("/messages/")
     session_manager = StreamableHTTPSessionManager(
         app=mcp_server,
@@ -73,6 +123,7 @@ def create_starlette_app(mcp_server: Server, *, debug: bool = False) -> Starlett
             Route("/sse", endpoint=handle_sse),
             Mount("/mcp", app=handle_streamable_http),
             Mount("/messages/", app=sse.handle_post_message),
+            *(routes or []),
         ],
         lifespan=lifespan,
     )
@@ -8,14 +8,28 @@ from ._markitdown import (
     PRIORITY_SPECIFIC_FILE_FORMAT,
     PRIORITY_GENERIC_FILE_FORMAT,
 )
-from ._base_converter import DocumentConverterResult, DocumentConverter
+from ._base_converter import (
+    DocumentConverterResult,
+    DocumentConverter,
+    read_stream_header,
+    join_units,
+    select_units,
+)
+from ._lazy_converter import LazyConverter
+from ._normalize import MarkdownNormalizer, normalize_markdown
+from ._cache import ResultCache, MemoryCache, DiskCache, SQLiteCache
+from ._trace import ConversionTrace, TraceSpan
+from ._deadline import Deadline, check_deadline
 from ._stream_info import StreamInfo
+from ._magika import configure_magika
 from ._exceptions import (
     MarkItDownException,
     MissingDependencyException,
     FailedConversionAttempt,
     FileConversionException,
     UnsupportedFormatException,
+    InputTooLargeException,
+    ConversionTimeoutException,
 )
 
 __all__ = [
@@ -23,12 +37,29 @@ __all__ = [
     "MarkItDown",
     "DocumentConverter",
     "DocumentConverterResult",
+    "read_stream_header",
+    "join_units",
+    "select_units",
+    "LazyConverter",
+    "MarkdownNormalizer",
+    "normalize_markdown",
+    "ResultCache",
+    "MemoryCache",
+    "DiskCache",
+    "SQLiteCache",
+    "ConversionTrace",
+    "TraceSpan",
+    "Deadline",
+    "check_deadline",
     "MarkItDownException",
     "MissingDependencyException",
     "FailedConversionAttempt",
     "FileConversionException",
     "UnsupportedFormatException",
+    "InputTooLargeException",
+    "ConversionTimeoutException",
     "StreamInfo",
+    "configure_magika",
     "PRIORITY_SPECIFIC_FILE_FORMAT",
     "PRIORITY_GENERIC_FILE_FORMAT",
 ]
@@ -1,5 +1,42 @@
-from typing import Any, BinaryIO, Optional
+from typing import (
+    Any,
+    BinaryIO,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 from ._stream_info import StreamInfo
+from ._trace import ConversionTrace
+from ._exceptions import ConversionTimeoutException
+
+# Number of leading bytes read from a stream to sniff its type (see read_stream_header)
+STREAM_HEADER_SIZE = 8192
+
+T = TypeVar("T")
+
+
+def read_stream_header(file_stream: BinaryIO, **kwargs: Any) -> bytes:
+    """
+    Return the first STREAM_HEADER_SIZE bytes of file_stream, without changing its position.
+
+    During conversion, MarkItDown reads the header once and shares it with every converter
+    through the `_stream_header` keyword argument. Converters that sniff the content in
+    accepts() should call this helper (passing along their kwargs) rather than reading the
+    stream, so that acceptance never reads more than the header.
+    """
+    header = kwargs.get("_stream_header")
+    if header is not None:
+        return header
+
+    cur_pos = file_stream.tell()
+    try:
+        return file_stream.read(STREAM_HEADER_SIZE)
+    finally:
+        file_stream.seek(cur_pos)
 
 
 class DocumentConverterResult:
@@ -10,6 +47,8 @@ class DocumentConverterResult:
         markdown: str,
         *,
         title: Optional[str] = None,
+        trace: Optional[ConversionTrace] = None,
+        truncated: bool = False,
     ):
         """
         Initialize the DocumentConverterResult.
@@ -20,9 +59,14 @@ class DocumentConverterResult:
         Parameters:
         - markdown: The converted Markdown text.
         - title: Optional title of the document.
+        - trace: Optional timing of the conversion's stages (see MarkItDown's `trace` option).
+        - truncated: Whether the conversion stopped early, when its deadline expired (see
+          MarkItDown's `on_deadline` option).
         """
         self.markdown = markdown
         self.title = title
+        self.trace = trace
+        self.truncated = truncated
 
     @property
     def text_content(self) -> str:
@@ -39,9 +83,72 @@ class DocumentConverterResult:
         return self.markdown
 
 
+def join_units(
+    units: Iterable[str], *, separator: str = "\n\n", **kwargs: Any
+) -> DocumentConverterResult:
+    """
+    Join the units of a document (e.g., as yielded by convert_iter()) into a result,
+    separated by blank lines (or by `separator`).
+
+    If the conversion's deadline expires (see check_deadline) and the `on_deadline` keyword
+    argument is "truncate", the units converted so far are returned, flagged as truncated;
+    otherwise the ConversionTimeoutException is raised.
+    """
+    parts: List[str] = []
+    try:
+        for unit in units:
+            parts.append(unit)
+    except ConversionTimeoutException:
+        if kwargs.get("on_deadline") != "truncate":
+            raise
+        return DocumentConverterResult(markdown=separator.join(parts), truncated=True)
+    return DocumentConverterResult(markdown=separator.join(parts))
+
+
+def select_units(units: Iterable[T], **kwargs: Any) -> Iterator[Tuple[int, T]]:
+    """
+    Number the units of a document (e.g., its slides or sheets) from 1, and yield the
+    (number, unit) pairs selected by the `pages` and `max_units` keyword arguments: the
+    units whose numbers are in `pages` (default: all of them), and at most `max_units` of
+    those. Iteration of `units` stops after the last selected unit, so converters should
+    pass units that are cheap to produce, and convert the selected ones.
+    """
+    pages = kwargs.get("pages")
+    max_units = kwargs.get("max_units")
+    if pages is None and max_units is None:
+        yield from enumerate(units, start=1)
+        return
+
+    selected = None if pages is None else set(pages)
+    last_selected = None if pages is None else max(pages)
+    count = 0
+    for number, unit in enumerate(units, start=1):
+        if selected is not None and number not in selected:
+            continue
+
+        yield number, unit
+
+        # Stop without producing the next unit
+        count += 1
+        if number == last_selected or count == max_units:
+            return
+
+
 class DocumentConverter:
     """Abstract superclass of all DocumentConverters."""
 
+    # Optional dispatch hints. When any is set, MarkItDown only consults accepts() for
+    # streams whose extension is in `accepted_extensions`, whose mimetype starts with one
+    # of `accepted_mimetype_prefixes`, or whose header starts with one of `signatures`.
+    # Leave all of them as None if accepts() may also return True on other grounds; such
+    # converters are consulted for every stream.
+    accepted_extensions: Optional[Sequence[str]] = None
+    accepted_mimetype_prefixes: Optional[Sequence[str]] = None
+
+    # Byte signatures (e.g., magic numbers) that documents handled by this converter start
+    # with, whatever their extension or mimetype.
+    signatures: Optional[Sequence[bytes]] = None
+
     def accepts(
         self,
         file_stream: BinaryIO,
@@ -69,6 +176,9 @@ class DocumentConverter:
         data = file_stream.read(100) # ... peek at the first 100 bytes, etc.
         file_stream.seek(cur_pos)    # Reset the position to the original position
 
+        Better yet, sniff the leading bytes shared by MarkItDown, which leaves the position untouched:
+        header = read_stream_header(file_stream, **kwargs)
+
         Parameters:
         - file_stream: The file-like object to convert. Must support seek(), tell(), and read() methods.
         - stream_info: The StreamInfo object containing metadata about the file (mimetype, extension, charset, set)
@@ -103,3 +213,24 @@ class DocumentConverter:
         - MissingDependencyException: If the converter requires a dependency that is not installed.
         """
         raise NotImplementedError("Subclasses must implement this method")
+
+    def convert_iter(
+        self,
+        file_stream: BinaryIO,
+        stream_info: StreamInfo,
+        **kwargs: Any,  # Options to pass to the converter
+    ) -> Iterator[str]:
+        """
+        Convert a document to Markdown text incrementally, yielding the Markdown of one unit
+        (e.g., a page, slide, sheet or chapter) at a time. Joined with blank lines, the units
+        make up the Markdown returned by convert().
+
+        Converters for documents made of such units should override this method, so that
+        callers can process the first units before the whole document is converted, and so
+        that only one unit is held in memory at a time. By default, the whole document is
+        converted with convert(), and yielded as a single unit.
+
+        The parameters and exceptions are those of convert(). Like convert(), this may
+        advance the position of file_stream.
+        """
+        yield self.convert(file_stream, stream_info, **kwargs).markdown
@@ -0,0 +1,166 @@
+import itertools
+import os
+import pickle
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+from ._base_converter import DocumentConverterResult
+from ._exceptions import FileConversionException
+
+if TYPE_CHECKING:
+    from ._markitdown import MarkItDown
+
+# The outcome of converting one source: its result, or the exception it raised
+BatchOutcome = Union[DocumentConverterResult, Exception]
+
+# MarkItDown instance of a batch worker process, created by _init_worker
+_worker_markitdown = None
+
+
+def _init_worker(options: Dict[str, Any]) -> None:
+    """Build the worker process's MarkItDown instance, once, from the parent's options."""
+    global _worker_markitdown
+    from ._markitdown import MarkItDown
+
+    _worker_markitdown = MarkItDown(**options)
+
+
+def _picklable(exc: Exception) -> Exception:
+    # Exceptions carrying tracebacks (e.g., FileConversionException.attempts) cannot be
+    # sent back from a worker process, so they are reduced to their message
+    try:
+        pickle.dumps(exc)
+        return exc
+    except Exception:
+        return FileConversionException(f"{type(exc).__name__}: {exc}")
+
+
+def _convert_chunk(
+    markitdown: "MarkItDown", chunk: List[Any], kwargs: Dict[str, Any]
+) -> List[BatchOutcome]:
+    outcomes: List[BatchOutcome] = []
+    for source in chunk:
+        try:
+            outcomes.append(markitdown.convert(source, **kwargs))
+        except Exception as e:
+            outcomes.append(e)
+    return outcomes
+
+
+def _convert_chunk_in_worker(
+    chunk: List[Any], kwargs: Dict[str, Any]
+) -> List[BatchOutcome]:
+    assert _worker_markitdown is not None
+    outcomes = _convert_chunk(_worker_markitdown, chunk, kwargs)
+    return [
+        _picklable(outcome) if isinstance(outcome, Exception) else outcome
+        for outcome in outcomes
+    ]
+
+
+def convert_many(
+    markitdown: "MarkItDown",
+    sources: Iterable[Any],
+    *,
+    max_workers: Union[int, None],
+    executor: str,
+    ordered: bool,
+    chunksize: int,
+    kwargs: Dict[str, Any],
+) -> Iterator[Tuple[Any, BatchOutcome]]:
+    """See MarkItDown.convert_many."""
+    # Check the arguments up front, rather than when the caller starts iterating
+    if executor not in ("process", "thread"):
+        raise ValueError(
+            f"Unknown executor '{executor}'. Expected 'process' or 'thread'."
+        )
+    if chunksize < 1:
+        raise ValueError("chunksize must be a positive integer.")
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers < 1:
+        raise ValueError("max_workers must be a positive integer.")
+
+    return _convert_many(
+        markitdown, iter(sources), max_workers, executor, ordered, chunksize, kwargs
+    )
+
+
+def _convert_many(
+    markitdown: "MarkItDown",
+    source_iter: Iterator[Any],
+    max_workers: int,
+    executor: str,
+    ordered: bool,
+    chunksize: int,
+    kwargs: Dict[str, Any],
+) -> Iterator[Tuple[Any, BatchOutcome]]:
+    pool: Executor
+    if executor == "process":
+        pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(markitdown._init_options,),
+        )
+
+        def submit(chunk: List[Any]) -> Future:
+            return pool.submit(_convert_chunk_in_worker, chunk, kwargs)
+
+    else:
+        pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="markitdown"
+        )
+
+        def submit(chunk: List[Any]) -> Future:
+            return pool.submit(_convert_chunk, markitdown, chunk, kwargs)
+
+    # Sources are read lazily, with a bounded number of chunks in flight
+    max_in_flight = max_workers * 2
+    in_flight: Dict[Future, List[Any]] = {}
+    order: deque = deque()
+
+    def submit_next() -> bool:
+        chunk = list(itertools.islice(source_iter, chunksize))
+        if not chunk:
+            return False
+        future = submit(chunk)
+        in_flight[future] = chunk
+        if ordered:
+            order.append(future)
+        return True
+
+    try:
+        while len(in_flight) < max_in_flight and submit_next():
+            pass
+
+        while in_flight:
+            if ordered:
+                future = order.popleft()
+                wait([future])
+                done = [future]
+            else:
+                done = list(wait(in_flight, return_when=FIRST_COMPLETED).done)
+
+            for future in done:
+                chunk = in_flight.pop(future)
+                try:
+                    outcomes = future.result()
+                except Exception as e:
+                    # The worker itself failed (e.g., it was killed)
+                    outcomes = [e] * len(chunk)
+                for source, outcome in zip(chunk, outcomes):
+                    yield source, outcome
+
+            while len(in_flight) < max_in_flight and submit_next():
+                pass
+    finally:
+        # Also reached when the caller stops iterating early
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,346 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from warnings import warn
+
+from ._base_converter import DocumentConverterResult
+
+# Default size limits, in bytes of UTF-8 encoded Markdown and title
+DEFAULT_MEMORY_CACHE_SIZE = 256 * 1024 * 1024
+DEFAULT_PERSISTENT_CACHE_SIZE = 1024 * 1024 * 1024
+
+# When a persistent cache outgrows its limit, the least recently used entries are evicted
+# until it is back under this fraction of the limit, so that evictions are batched
+_EVICTION_TARGET = 0.9
+
+# A cached result: its Markdown, its title, and its size
+_Entry = Tuple[str, Optional[str], int]
+
+
+class ResultCache:
+    """
+    Base class of the caches that MarkItDown stores conversion results in (see the `cache`
+    option of MarkItDown). Entries are keyed on a hash of the converted content, the
+    registered converters and their versions, and the conversion options; the least recently
+    used entries are evicted once the total size of the cached results exceeds `max_size`
+    bytes.
+
+    Subclasses implement _load(), _store(), _usage() and clear(). A cache that fails (e.g.,
+    because its disk is full) is treated as a miss, with a warning.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._counts = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key: str) -> Optional[DocumentConverterResult]:
+        """Return the cached result for the key, or None."""
+        try:
+            entry = self._load(key)
+        except Exception as e:
+            warn(f"{type(self).__name__} failed to read an entry: {e}")
+            entry = None
+
+        with self._lock:
+            self._counts["hits" if entry is not None else "misses"] += 1
+
+        if entry is None:
+            return None
+        markdown, title, _ = entry
+        return DocumentConverterResult(markdown=markdown, title=title)
+
+    def set(self, key: str, result: DocumentConverterResult) -> None:
+        """Cache the result under the key, evicting older entries as needed."""
+        markdown = result.markdown
+        title = result.title
+        size = len(markdown.encode("utf-8")) + len((title or "").encode("utf-8"))
+        if size > self.max_size:
+            return
+
+        try:
+            evictions = self._store(key, (markdown, title, size))
+        except Exception as e:
+            warn(f"{type(self).__name__} failed to write an entry: {e}")
+            return
+
+        with self._lock:
+            self._counts["evictions"] += evictions
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """The numbers of hits, misses and evictions so far, and the current number of
+        entries and their total size in bytes."""
+        entries, size = self._usage()
+        with self._lock:
+            stats = dict(self._counts)
+        stats.update(entries=entries, size=size)
+        return stats
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        raise NotImplementedError()
+
+    def _load(self, key: str) -> Optional[_Entry]:
+        raise NotImplementedError()
+
+    def _store(self, key: str, entry: _Entry) -> int:
+        """Store the entry, and return the number of entries evicted to make room."""
+        raise NotImplementedError()
+
+    def _usage(self) -> Tuple[int, int]:
+        """Return the number of entries and their total size."""
+        raise NotImplementedError()
+
+
+class MemoryCache(ResultCache):
+    """
+    Caches results in memory, in this process. When a MarkItDown is copied to worker
+    processes (see MarkItDown.convert_many), each worker starts with an empty cache.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MEMORY_CACHE_SIZE):
+        super().__init__(max_size)
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._size = 0
+
+    def __reduce__(self):
+        return (type(self), (self.max_size,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _load(self, key: str) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _store(self, key: str, entry: _Entry) -> int:
+        evictions = 0
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous[2]
+            self._entries[key] = entry
+            self._size += entry[2]
+
+            while self._size > self.max_size:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted[2]
+                evictions += 1
+        return evictions
+
+    def _usage(self) -> Tuple[int, int]:
+        with self._lock:
+            return len(self._entries), self._size
+
+
+class DiskCache(ResultCache):
+    """
+    Caches results as files in a directory, which persists across runs and can be shared by
+    processes. Each entry is a JSON file, whose modification time records when it was last
+    used.
+    """
+
+    def __init__(self, directory: str, max_size: int = DEFAULT_PERSISTENT_CACHE_SIZE):
+        super().__init__(max_size)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+        # Total size of the entries, counted on first use
+        self._size: Optional[int] = None
+
+    def __reduce__(self):
+        return (type(self), (self.directory, self.max_size))
+
+    def clear(self) -> None:
+        with self._lock:
+            for path, _, _ in self._scan():
+                _remove(path)
+            self._size = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def _scan(self) -> List[Tuple[str, int, float]]:
+        """Return the path, size and last use of every entry."""
+        entries = []
+        for subdirectory in os.scandir(self.directory):
+            if not subdirectory.is_dir():
+                continue
+            for file in os.scandir(subdirectory.path):
+                if file.name.endswith(".json"):
+                    try:
+                        stat = file.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((file.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _load(self, key: str) -> Optional[_Entry]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as fh:
+                data = fh.read()
+        except FileNotFoundError:
+            return None
+
+        # Mark the entry as recently used
+        os.utime(path)
+
+        cached = json.loads(data)
+        return cached["markdown"], cached["title"], len(data)
+
+    def _store(self, key: str, entry: _Entry) -> int:
+        markdown, title, _ = entry
+        data = json.dumps(
+            {"markdown": markdown, "title": title}, ensure_ascii=False
+        ).encode("utf-8")
+
+        # Write to a temporary file first, so that readers never see a partial entry
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            with self._lock:
+                previous_size = _file_size(path)
+                os.replace(temp_path, path)
+                if self._size is None:
+                    self._size = sum(size for _, size, _ in self._scan())
+                else:
+                    self._size += len(data) - previous_size
+                return self._evict()
+        except BaseException:
+            _remove(temp_path)
+            raise
+
+    def _evict(self) -> int:
+        assert self._size is not None
+        if self._size <= self.max_size:
+            return 0
+
+        # Rescan, since other processes may share the directory
+        entries = sorted(self._scan(), key=lambda entry: entry[2])
+        self._size = sum(size for _, size, _ in entries)
+        evictions = 0
+        for path, size, _ in entries:
+            if self._size <= self.max_size * _EVICTION_TARGET:
+                break
+            _remove(path)
+            self._size -= size
+            evictions += 1
+        return evictions
+
+    def _usage(self) -> Tuple[int, int]:
+        with self._lock:
+            entries = self._scan()
+            self._size = sum(size for _, size, _ in entries)
+            return len(entries), self._size
+
+
+class SQLiteCache(ResultCache):
+    """
+    Caches results in an SQLite database, which persists across runs and can be shared by
+    processes.
+    """
+
+    def __init__(self, path: str, max_size: int = DEFAULT_PERSISTENT_CACHE_SIZE):
+        super().__init__(max_size)
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        # The connection is shared by threads, and guarded by the lock
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, markdown TEXT NOT NULL, title TEXT, "
+                "size INTEGER NOT NULL, used REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS results_used ON results (used)"
+            )
+
+    def __reduce__(self):
+        return (type(self), (self.path, self.max_size))
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM results")
+
+    def _load(self, key: str) -> Optional[_Entry]:
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT markdown, title, size FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            # Mark the entry as recently used
+            self._connection.execute(
+                "UPDATE results SET used = ? WHERE key = ?", (time.time(), key)
+            )
+        return row[0], row[1], row[2]
+
+    def _store(self, key: str, entry: _Entry) -> int:
+        markdown, title, size = entry
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO results (key, markdown, title, size, used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, markdown, title, size, time.time()),
+            )
+
+            (total,) = self._connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()
+            if total <= self.max_size:
+                return 0
+
+            evictions = 0
+            rows = self._connection.execute(
+                "SELECT key, size FROM results ORDER BY used"
+            ).fetchall()
+            for evicted_key, evicted_size in rows:
+                if total <= self.max_size * _EVICTION_TARGET:
+                    break
+                self._connection.execute(
+                    "DELETE FROM results WHERE key = ?", (evicted_key,)
+                )
+                total -= evicted_size
+                evictions += 1
+            return evictions
+
+    def _usage(self) -> Tuple[int, int]:
+        with self._lock:
+            entries, size = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()
+        return entries, size
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
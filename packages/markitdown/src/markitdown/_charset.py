@@ -0,0 +1,90 @@
+import codecs
+from typing import BinaryIO, Optional
+
+import charset_normalizer
+
+# Bytes read from the stream to detect its charset
+CHARSET_SAMPLE_SIZE = 64 * 1024
+
+# Bytes passed to charset_normalizer, which is much slower than the checks that precede it
+CHARSET_NORMALIZER_SAMPLE_SIZE = 4096
+
+# Mimetypes outside text/ that are text
+_TEXT_APPLICATION_MIMETYPES = [
+    "application/json",
+    "application/xml",
+    "application/markdown",
+    "application/javascript",
+    "application/x-ndjson",
+]
+
+# Byte order marks, longest first (the UTF-32 LE mark starts with the UTF-16 LE mark)
+_BOMS = [
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+
+def detect_charset(file_stream: BinaryIO) -> Optional[str]:
+    """
+    Detect the charset of a text stream from a bounded sample, without changing its position.
+
+    The cheap checks run first: a byte order mark, then ASCII, then strict UTF-8. Only if
+    all of them fail is charset_normalizer consulted, on the first few KB. Returns the
+    canonical codec name, or None if no charset could be determined (e.g., binary data).
+    """
+    cur_pos = file_stream.tell()
+    try:
+        sample = file_stream.read(CHARSET_SAMPLE_SIZE)
+        truncated = len(sample) == CHARSET_SAMPLE_SIZE and file_stream.read(1) != b""
+    finally:
+        file_stream.seek(cur_pos)
+
+    for bom, charset in _BOMS:
+        if sample.startswith(bom):
+            return charset
+
+    # A sample that is ASCII only says the rest is probably ASCII-compatible
+    if sample.isascii():
+        return "utf-8" if truncated else "ascii"
+
+    # The sample may end partway through a multi-byte character
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=not truncated)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+
+    result = charset_normalizer.from_bytes(
+        sample[:CHARSET_NORMALIZER_SAMPLE_SIZE]
+    ).best()
+    if result is None:
+        return None
+    return normalize_charset(result.encoding)
+
+
+def is_text_mimetype(mimetype: Optional[str]) -> bool:
+    """Return True if the mimetype describes text, whose charset should be detected."""
+    if mimetype is None:
+        return False
+    mimetype = mimetype.lower()
+    return (
+        mimetype.startswith("text/")
+        or mimetype in _TEXT_APPLICATION_MIMETYPES
+        or mimetype.endswith(("+xml", "+json"))
+    )
+
+
+def normalize_charset(charset: Optional[str]) -> Optional[str]:
+    """
+    Normalize a charset string to a canonical form.
+    """
+    if charset is None:
+        return None
+    try:
+        return codecs.lookup(charset).name
+    except LookupError:
+        return charset
@@ -0,0 +1,71 @@
+import threading
+import time
+from typing import Any, Optional
+
+from ._exceptions import ConversionTimeoutException
+
+
+class Deadline:
+    """
+    A point in time after which a conversion should stop, which can also be cancelled early
+    (e.g., because the client went away). Pass it to a conversion as the `deadline` option;
+    passing a number of seconds instead starts a new Deadline when the conversion starts.
+
+    Converters check the deadline between units of work (pages, slides, sheets, ZIP members,
+    ...), so a conversion stops at the next check, not immediately. A Deadline may be shared
+    by several conversions, e.g., to bound a whole batch. Copies sent to other processes
+    keep the remaining time, but are not cancelled with the original.
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        """
+        Parameters:
+        - timeout: Seconds from now until the deadline expires, or None to only expire
+          when cancelled.
+        """
+        self._expires_at = None if timeout is None else time.monotonic() + timeout
+        self._cancelled = threading.Event()
+
+    def __reduce__(self):
+        return (type(self), (self.remaining(),))
+
+    def cancel(self) -> None:
+        """Expire the deadline now."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def expired(self) -> bool:
+        """Whether the deadline was cancelled or its time is up."""
+        return self.cancelled or (
+            self._expires_at is not None and time.monotonic() >= self._expires_at
+        )
+
+    def remaining(self) -> Optional[float]:
+        """Seconds until the deadline expires (0 once expired), or None if it has no timeout."""
+        if self.cancelled:
+            return 0.0
+        if self._expires_at is None:
+            return None
+        return max(0.0, self._expires_at - time.monotonic())
+
+    def check(self) -> None:
+        """Raise a ConversionTimeoutException if the deadline expired."""
+        if self.cancelled:
+            raise ConversionTimeoutException("The conversion was cancelled.")
+        if self.expired:
+            raise ConversionTimeoutException("The conversion's deadline expired.")
+
+
+def check_deadline(**kwargs: Any) -> None:
+    """
+    Raise a ConversionTimeoutException if the conversion's deadline (the `deadline` keyword
+    argument, if any) expired. Converters that work through a document in units should call
+    this helper (passing along their kwargs) before each unit.
+    """
+    deadline = kwargs.get("deadline")
+    if deadline is not None:
+        deadline.check()
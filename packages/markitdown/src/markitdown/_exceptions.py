@@ -39,6 +39,25 @@ class UnsupportedFormatException(MarkItDownException):
     pass
 
 
+class InputTooLargeException(MarkItDownException):
+    """
+    Thrown when a stream that must be buffered before it can be converted
+    (e.g., stdin, or the body of an HTTP response) is larger than the
+    `max_buffered_size` given to MarkItDown.
+    """
+
+    pass
+
+
+class ConversionTimeoutException(MarkItDownException):
+    """
+    Thrown when a conversion's `deadline` expires or is cancelled before the conversion
+    completes (see Deadline).
+    """
+
+    pass
+
+
 class FailedConversionAttempt(object):
     """
     Represents an a single attempt to convert a file.
@@ -0,0 +1,139 @@
+import importlib
+import threading
+from typing import Any, BinaryIO, Callable, Iterator, Optional, Sequence, Union
+
+from ._base_converter import (
+    DocumentConverter,
+    DocumentConverterResult,
+    read_stream_header,
+)
+from ._stream_info import StreamInfo
+
+
+class LazyConverter(DocumentConverter):
+    """
+    Stands in for a converter whose module is only imported when a stream it declares
+    (by extension, mimetype prefix or signature) is first offered to it. This keeps
+    MarkItDown's startup time and memory low, since converters for formats that are
+    never converted never load their dependencies.
+
+    The target is either a "module:attribute" string, or a callable. Either way, it is
+    called without arguments to create the converter. For example, a plugin can register
+    a converter that lives in a separate module:
+
+        markitdown.register_converter(
+            LazyConverter(
+                "my_plugin._rtf_converter:RtfConverter",
+                accepted_extensions=[".rtf"],
+                accepted_mimetype_prefixes=["text/rtf", "application/rtf"],
+            )
+        )
+
+    The declared extensions, mimetype prefixes and signatures must cover every stream the
+    converter accepts. If none are declared, the converter is loaded for the first stream.
+    """
+
+    def __init__(
+        self,
+        target: Union[str, Callable[[], DocumentConverter]],
+        *,
+        accepted_extensions: Optional[Sequence[str]] = None,
+        accepted_mimetype_prefixes: Optional[Sequence[str]] = None,
+        signatures: Optional[Sequence[bytes]] = None,
+    ):
+        self.target = target
+        self.accepted_extensions = (
+            None
+            if accepted_extensions is None
+            else [e.lower() for e in accepted_extensions]
+        )
+        self.accepted_mimetype_prefixes = (
+            None
+            if accepted_mimetype_prefixes is None
+            else [p.lower() for p in accepted_mimetype_prefixes]
+        )
+        self.signatures = signatures
+        self._converter: Optional[DocumentConverter] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded_converter(self) -> Optional[DocumentConverter]:
+        """The underlying converter, or None if it has not been loaded yet."""
+        return self._converter
+
+    @property
+    def converter(self) -> DocumentConverter:
+        """The underlying converter, loading it if needed."""
+        converter = self._converter
+        if converter is None:
+            with self._lock:
+                if self._converter is None:
+                    self._converter = self._load()
+                converter = self._converter
+        return converter
+
+    def _load(self) -> DocumentConverter:
+        factory = self.target
+        if isinstance(factory, str):
+            module_name, _, attribute = factory.partition(":")
+            factory = importlib.import_module(module_name)
+            for name in attribute.split("."):
+                factory = getattr(factory, name)
+        return factory()
+
+    def _is_declared(
+        self, file_stream: BinaryIO, stream_info: StreamInfo, **kwargs: Any
+    ) -> bool:
+        if (
+            self.accepted_extensions is None
+            and self.accepted_mimetype_prefixes is None
+            and self.signatures is None
+        ):
+            return True
+
+        extension = (stream_info.extension or "").lower()
+        if extension in (self.accepted_extensions or []):
+            return True
+
+        mimetype = (stream_info.mimetype or "").lower()
+        for prefix in self.accepted_mimetype_prefixes or []:
+            if mimetype.startswith(prefix):
+                return True
+
+        if self.signatures:
+            header = read_stream_header(file_stream, **kwargs)
+            for signature in self.signatures:
+                if header.startswith(signature):
+                    return True
+
+        return False
+
+    def accepts(
+        self,
+        file_stream: BinaryIO,
+        stream_info: StreamInfo,
+        **kwargs: Any,  # Options to pass to the converter
+    ) -> bool:
+        # Streams the converter did not declare are rejected without loading it
+        if not self._is_declared(file_stream, stream_info, **kwargs):
+            return False
+        return self.converter.accepts(file_stream, stream_info, **kwargs)
+
+    def convert(
+        self,
+        file_stream: BinaryIO,
+        stream_info: StreamInfo,
+        **kwargs: Any,  # Options to pass to the converter
+    ) -> DocumentConverterResult:
+        return self.converter.convert(file_stream, stream_info, **kwargs)
+
+    def convert_iter(
+        self,
+        file_stream: BinaryIO,
+        stream_info: StreamInfo,
+        **kwargs: Any,  # Options to pass to the converter
+    ) -> Iterator[str]:
+        return self.converter.convert_iter(file_stream, stream_info, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.target!r})"
@@ -0,0 +1,77 @@
+import os
+import threading
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import magika
+
+# Magika (and ONNX Runtime) are imported, and the model is loaded, once per process on first
+# use and shared by all MarkItDown instances. Processes that never run Magika (e.g., with
+# detection_policy="never") never import them. Inference is stateless, so the detector can
+# be used from several threads.
+_magika_lock = threading.Lock()
+_magika: Optional["magika.Magika"] = None
+_intra_op_threads: Optional[int] = None
+
+if os.getenv("MARKITDOWN_MAGIKA_THREADS"):
+    _intra_op_threads = int(os.environ["MARKITDOWN_MAGIKA_THREADS"])
+
+
+def _load_magika(intra_op_threads: Optional[int]) -> "magika.Magika":
+    """Import Magika and load the model, optionally limiting ONNX intra-op threads."""
+    import magika
+
+    if intra_op_threads is None:
+        return magika.Magika()
+
+    class _ThreadLimitedMagika(magika.Magika):
+        """Magika with a limited number of ONNX intra-op threads."""
+
+        def _init_onnx_session(self):
+            import onnxruntime as rt
+
+            options = rt.SessionOptions()
+            options.intra_op_num_threads = intra_op_threads
+            options.inter_op_num_threads = 1
+            return rt.InferenceSession(
+                self._model_path,
+                sess_options=options,
+                providers=["CPUExecutionProvider"],
+            )
+
+    return _ThreadLimitedMagika()
+
+
+def configure_magika(*, intra_op_threads: Optional[int] = None) -> None:
+    """
+    Configure the process-wide Magika detector used to guess stream types.
+
+    Parameters:
+    - intra_op_threads: The number of threads ONNX Runtime may use to run the model. None
+      (the default) lets ONNX Runtime decide, which is usually one thread per core. Can
+      also be set with the MARKITDOWN_MAGIKA_THREADS environment variable.
+
+    The detector is reloaded on next use if the setting changes.
+    """
+    global _magika, _intra_op_threads
+
+    if intra_op_threads is not None and intra_op_threads <= 0:
+        raise ValueError("intra_op_threads must be a positive integer.")
+
+    with _magika_lock:
+        if intra_op_threads != _intra_op_threads:
+            _intra_op_threads = intra_op_threads
+            _magika = None
+
+
+def get_magika() -> "magika.Magika":
+    """Return the process-wide Magika detector, loading the model on first use."""
+    global _magika
+
+    detector = _magika
+    if detector is None:
+        with _magika_lock:
+            if _magika is None:
+                _magika = _load_magika(_intra_op_threads)
+            detector = _magika
+    return detector
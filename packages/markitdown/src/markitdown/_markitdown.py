@@ -5,48 +5,78 @@ import sys
 import shutil
 import traceback
 import io
+import asyncio
+import contextlib
+import functools
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import Executor
 from dataclasses import dataclass
-from importlib.metadata import entry_points
-from typing import Any, List, Dict, Optional, Union, BinaryIO
+from importlib.metadata import (
+    PackageNotFoundError,
+    entry_points,
+    packages_distributions,
+    version,
+)
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 from pathlib import Path
 from urllib.parse import urlparse
 from warnings import warn
 import requests
-import magika
-import charset_normalizer
-import codecs
 
+# Optional: fetch URLs asynchronously in the aconvert* methods. Without httpx, they fall back
+# to fetching with requests on the executor.
+try:
+    import httpx
+except ImportError:
+    httpx = None  # type: ignore[assignment]
+
+from .__about__ import __version__
 from ._stream_info import StreamInfo
+from ._magika import get_magika
+from ._charset import detect_charset, is_text_mimetype, normalize_charset
+from ._signatures import identify_by_signature
+from ._normalize import normalize_markdown
+from ._cache import ResultCache
+from ._trace import ConversionTrace
+from ._deadline import Deadline, check_deadline
+from ._spool import (
+    DEFAULT_SPOOL_MEMORY_LIMIT,
+    SPOOL_CHUNK_SIZE,
+    StreamSpool,
+    content_length,
+)
 from ._uri_utils import parse_data_uri, file_uri_to_path
 
-from .converters import (
-    PlainTextConverter,
-    HtmlConverter,
-    RssConverter,
-    WikipediaConverter,
-    YouTubeConverter,
-    IpynbConverter,
-    BingSerpConverter,
-    PdfConverter,
-    DocxConverter,
-    XlsxConverter,
-    XlsConverter,
-    PptxConverter,
-    ImageConverter,
-    AudioConverter,
-    OutlookMsgConverter,
-    ZipConverter,
-    EpubConverter,
-    DocumentIntelligenceConverter,
-    CsvConverter,
-)
+from . import converters
 
-from ._base_converter import DocumentConverter, DocumentConverterResult
+from ._lazy_converter import LazyConverter
+from ._batch import convert_many
+from ._base_converter import (
+    STREAM_HEADER_SIZE,
+    DocumentConverter,
+    DocumentConverterResult,
+)
 
 from ._exceptions import (
     FileConversionException,
     UnsupportedFormatException,
     FailedConversionAttempt,
+    ConversionTimeoutException,
 )
 
 
@@ -59,6 +89,156 @@ PRIORITY_GENERIC_FILE_FORMAT = (
 )
 
 
+@dataclass(frozen=True)
+class _BuiltinConverter:
+    """
+    A built-in converter (a class in markitdown.converters), and the streams it accepts.
+    The streams are declared here so that the converter's module, and its dependencies,
+    are only imported when such a stream is converted (see LazyConverter).
+    """
+
+    name: str
+    priority: float
+    extensions: Optional[List[str]] = None
+    mimetype_prefixes: Optional[List[str]] = None
+    signatures: Optional[List[bytes]] = None
+
+
+_HTML_EXTENSIONS = [".html", ".htm"]
+_HTML_MIME_TYPE_PREFIXES = ["text/html", "application/xhtml"]
+
+# Built-in converters.
+# Later registrations are tried first / take higher priority than earlier registrations
+# To this end, the most specific converters should appear below the most generic converters
+_BUILTIN_CONVERTERS = [
+    _BuiltinConverter(
+        name="PlainTextConverter",
+        priority=PRIORITY_GENERIC_FILE_FORMAT,
+        # Accepts any stream with a charset, so it is consulted for every stream
+    ),
+    _BuiltinConverter(
+        name="ZipConverter",
+        priority=PRIORITY_GENERIC_FILE_FORMAT,
+        extensions=[".zip"],
+        mimetype_prefixes=["application/zip"],
+    ),
+    _BuiltinConverter(
+        name="HtmlConverter",
+        priority=PRIORITY_GENERIC_FILE_FORMAT,
+        extensions=_HTML_EXTENSIONS,
+        mimetype_prefixes=_HTML_MIME_TYPE_PREFIXES,
+    ),
+    _BuiltinConverter(
+        name="RssConverter",
+        priority=PRIORITY_SPECIFIC_FILE_FORMAT,
+        extensions=[".rss", ".atom", ".xml"],
+        mimetype_prefixes=[
+            "application/rss",
+            "application/rss+xml",
+            "application/atom",
+            "application/atom+xml",
+            "text/xml",
+            "application/xml",
+        ],
+    ),
+    _BuiltinConverter(
+        name="WikipediaConverter",
+        priority=PRIORITY_SPECIFIC_FILE_FORMAT,
+        extensions=_HTML_EXTENSIONS,
+        mimetype_prefixes=_HTML_MIME_TYPE_PREFIXES,
+    ),
+    _BuiltinConverter(
+        name="YouTubeConverter",
+        priority=PRIORITY_SPECIFIC_FILE_FORMAT,
+        extensions=_HTML_EXTENSIONS,
+        mimetype_prefixes=_HTML_MIME_TYPE_PREFIXES,
+    ),
+    _BuiltinConverter(
+        name="BingSerpConverter",
+        priority=PRIORITY_SPECIFIC_FILE_FORMAT,
+        extensions=_HTML_EXTENSIONS,
+        mimetype_prefixes=_HTML_MIME_TYPE_PREFIXES,
+    ),
+    _BuiltinConverter(
+        name="DocxConverter",
+        priority=PRIORITY_SPECIFIC_FILE_FORMAT,
+        extensions=[".docx"],
+        mimetype_prefixes=[
+            "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+        ],
+    ),
+    _BuiltinConverter(
+        name="XlsxConverter",
+        priority=PRIORITY_SPECIFIC_FILE_FORMAT,
+        extensions=[".xlsx"],
+        mimetype_prefixes=[
+            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        ],
+    ),
+    _BuiltinConverter(
+        name="XlsConverter",
+        priority=PRIORITY_SPECIFIC_FILE_FORMAT,
+        extensions=[".xls"],
+        mimetype_prefixes=["application/vnd.ms-excel", "application/excel"],
+    ),
+    _BuiltinConverter(
+        name="PptxConverter",
+        priority=PRIORITY_SPECIFIC_FILE_FORMAT,
+        extensions=[".pptx"],
+        mimetype_prefixes=[
+            "application/vnd.openxmlformats-officedocument.presentationml"
+        ],
+    ),
+    _BuiltinConverter(
+        name="AudioConverter",
+        priority=PRIORITY_SPECIFIC_FILE_FORMAT,
+        extensions=[".wav", ".mp3", ".m4a", ".mp4"],
+        mimetype_prefixes=["audio/x-wav", "audio/mpeg", "video/mp4"],
+    ),
+    _BuiltinConverter(
+        name="ImageConverter",
+        priority=PRIORITY_SPECIFIC_FILE_FORMAT,
+        extensions=[".jpg", ".jpeg", ".png"],
+        mimetype_prefixes=["image/jpeg", "image/png"],
+    ),
+    _BuiltinConverter(
+        name="IpynbConverter",
+        priority=PRIORITY_SPECIFIC_FILE_FORMAT,
+        extensions=[".ipynb"],
+        mimetype_prefixes=["application/json"],
+    ),
+    _BuiltinConverter(
+        name="PdfConverter",
+        priority=PRIORITY_SPECIFIC_FILE_FORMAT,
+        extensions=[".pdf"],
+        mimetype_prefixes=["application/pdf", "application/x-pdf"],
+    ),
+    _BuiltinConverter(
+        name="OutlookMsgConverter",
+        priority=PRIORITY_SPECIFIC_FILE_FORMAT,
+        extensions=[".msg"],
+        mimetype_prefixes=["application/vnd.ms-outlook"],
+        signatures=[b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"],
+    ),
+    _BuiltinConverter(
+        name="EpubConverter",
+        priority=PRIORITY_SPECIFIC_FILE_FORMAT,
+        extensions=[".epub"],
+        mimetype_prefixes=[
+            "application/epub",
+            "application/epub+zip",
+            "application/x-epub+zip",
+        ],
+    ),
+    _BuiltinConverter(
+        name="CsvConverter",
+        priority=PRIORITY_SPECIFIC_FILE_FORMAT,
+        extensions=[".csv"],
+        mimetype_prefixes=["text/csv", "application/csv"],
+    ),
+]
+
+
 _plugins: Union[None, List[Any]] = None  # If None, plugins have not been loaded yet.
 
 
@@ -82,6 +262,56 @@ def _load_plugins() -> Union[None, List[Any]]:
     return _plugins
 
 
+def _start_trace(kwargs: Dict[str, Any]) -> Optional[ConversionTrace]:
+    """Pop the `trace` option from the kwargs, and return a new trace if it was set."""
+    return ConversionTrace() if kwargs.pop("trace", False) else None
+
+
+def _start_options(kwargs: Dict[str, Any]) -> None:
+    """
+    Prepare the options of a conversion as it starts: start its deadline, if the `deadline`
+    option is a number of seconds, check its `on_deadline` option, and check and sort its
+    `pages` option (so that equal selections share cache entries).
+    """
+    deadline = kwargs.get("deadline")
+    if deadline is not None and not isinstance(deadline, Deadline):
+        kwargs["deadline"] = Deadline(deadline)
+
+    on_deadline = kwargs.get("on_deadline", "raise")
+    if on_deadline not in _ON_DEADLINE:
+        raise ValueError(
+            f"Unknown on_deadline '{on_deadline}'. Expected one of: {', '.join(_ON_DEADLINE)}"
+        )
+
+    pages = kwargs.get("pages")
+    if pages is not None:
+        try:
+            pages = tuple(sorted(set(pages)))
+        except TypeError:
+            pages = ()
+        if not pages or not all(isinstance(page, int) and page >= 1 for page in pages):
+            raise ValueError(
+                "pages must be a non-empty collection of page numbers, counted from 1."
+            )
+        kwargs["pages"] = pages
+
+    max_units = kwargs.get("max_units")
+    if max_units is not None and not (isinstance(max_units, int) and max_units >= 1):
+        raise ValueError("max_units must be a positive integer.")
+
+
+def _conversion_error(failed_attempts: List[FailedConversionAttempt]) -> Exception:
+    """The exception to raise when no converter converted a stream."""
+    # If we got this far without success, report any exceptions
+    if len(failed_attempts) > 0:
+        return FileConversionException(attempts=failed_attempts)
+
+    # Nothing can handle it!
+    return UnsupportedFormatException(
+        "Could not convert stream to Markdown. No converter attempted a conversion, suggesting that the filetype is simply not supported."
+    )
+
+
 @dataclass(kw_only=True, frozen=True)
 class ConverterRegistration:
     """A registration of a converter with its priority and other metadata."""
@@ -90,6 +320,117 @@ class ConverterRegistration:
     priority: float
 
 
+# Stream type detection policies (see MarkItDown's `detection_policy` option)
+_DETECTION_POLICIES = ["always", "when_ambiguous", "never"]
+
+# What a conversion does when its deadline expires (see the `on_deadline` option of convert())
+_ON_DEADLINE = ["raise", "truncate"]
+
+# Options that do not change a conversion's result, and so are not part of its cache key.
+# (Results truncated by a deadline are not cached.)
+_UNKEYED_OPTIONS = {"deadline", "on_deadline"}
+
+# Maximum number of (extension, mimetype) pairs whose candidate lists are memoized
+_DISPATCH_CACHE_SIZE = 1024
+
+# Bytes read at a time to hash a stream's content for the result cache
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+# Signature of ZIP archives, whose converted content names the archive's path (see
+# _cache_key)
+_ZIP_SIGNATURE = b"PK\x03\x04"
+
+
+def _converter_name(converter: DocumentConverter) -> str:
+    """Name a converter by its class, or a LazyConverter by its target (without loading it)."""
+    if isinstance(converter, LazyConverter):
+        target = converter.target
+        if isinstance(target, str):
+            return target.replace(":", ".")
+        return f"{target.__module__}.{target.__qualname__}"
+    return f"{type(converter).__module__}.{type(converter).__qualname__}"
+
+
+@functools.lru_cache(maxsize=None)
+def _package_version(module_name: str) -> str:
+    """Return the version of the distribution providing a module's top-level package."""
+    package = module_name.split(".")[0]
+    if package == "markitdown":
+        return __version__
+    for distribution in packages_distributions().get(package, []):
+        try:
+            return version(distribution)
+        except PackageNotFoundError:
+            pass
+    return ""
+
+
+class _DispatchIndex:
+    """
+    Maps a stream's extension, mimetype and leading bytes to the registrations whose
+    accepts() might return True, in priority order. Converters that declare
+    `accepted_extensions`, `accepted_mimetype_prefixes` or `signatures` are indexed by
+    them; all others are always candidates.
+    """
+
+    def __init__(self, registrations: List[ConverterRegistration]):
+        # Sort by priority. The sort is guaranteed to be stable, so converters with the same
+        # priority will remain in the same order.
+        self.registrations = sorted(registrations, key=lambda x: x.priority)
+
+        self._unindexed: List[int] = []
+        self._by_extension: Dict[str, List[int]] = {}
+        self._by_mimetype_prefix: Dict[str, List[int]] = {}
+        self._signatures: List[Tuple[bytes, int]] = []
+        for rank, registration in enumerate(self.registrations):
+            converter = registration.converter
+            extensions = getattr(converter, "accepted_extensions", None)
+            prefixes = getattr(converter, "accepted_mimetype_prefixes", None)
+            signatures = getattr(converter, "signatures", None)
+            if extensions is None and prefixes is None and signatures is None:
+                self._unindexed.append(rank)
+                continue
+            for extension in extensions or []:
+                self._by_extension.setdefault(extension.lower(), []).append(rank)
+            for prefix in prefixes or []:
+                self._by_mimetype_prefix.setdefault(prefix.lower(), []).append(rank)
+            for signature in signatures or []:
+                self._signatures.append((signature, rank))
+
+        self._prefix_lengths = sorted({len(p) for p in self._by_mimetype_prefix})
+        self._cache: Dict[Tuple[str, str], List[int]] = {}
+
+    def signature_ranks(self, header: bytes) -> List[int]:
+        """Return the ranks of the converters whose signatures the header starts with."""
+        return [
+            rank for signature, rank in self._signatures if header.startswith(signature)
+        ]
+
+    def candidates(
+        self, stream_info: StreamInfo, signature_ranks: List[int]
+    ) -> List[ConverterRegistration]:
+        extension = (stream_info.extension or "").lower()
+        mimetype = (stream_info.mimetype or "").lower()
+        key = (extension, mimetype)
+
+        ranks = self._cache.get(key)
+        if ranks is None:
+            matched = set(self._unindexed)
+            matched.update(self._by_extension.get(extension, []))
+            for length in self._prefix_lengths:
+                if length > len(mimetype):
+                    break
+                matched.update(self._by_mimetype_prefix.get(mimetype[:length], []))
+
+            ranks = sorted(matched)
+            if len(self._cache) < _DISPATCH_CACHE_SIZE:
+                self._cache[key] = ranks
+
+        if signature_ranks:
+            ranks = sorted(set(ranks).union(signature_ranks))
+        return [self.registrations[rank] for rank in ranks]
+
+
 class MarkItDown:
     """(In preview) An extremely simple text-based document reader, suitable for LLM use.
     This reader will convert common file-types or webpages to Markdown."""
@@ -104,13 +445,47 @@ class MarkItDown:
         self._builtins_enabled = False
         self._plugins_enabled = False
 
+        # Constructor options, used to build equivalent instances in worker processes
+        self._init_options: Dict[str, Any] = {
+            k: v for k, v in kwargs.items() if k != "async_executor"
+        }
+        self._init_options.update(
+            enable_builtins=enable_builtins, enable_plugins=enable_plugins
+        )
+
         requests_session = kwargs.get("requests_session")
         if requests_session is None:
             self._requests_session = requests.Session()
         else:
             self._requests_session = requests_session
+        self._custom_requests_session = requests_session is not None
+
+        # Streams that must be buffered to be converted (non-seekable streams, such as stdin,
+        # and HTTP response bodies) are held in memory up to spool_memory_limit bytes, then
+        # moved to a temporary file. Buffering more than max_buffered_size bytes (default:
+        # no limit) raises an InputTooLargeException.
+        self._spool_memory_limit: int = kwargs.get(
+            "spool_memory_limit", DEFAULT_SPOOL_MEMORY_LIMIT
+        )
+        self._max_buffered_size: Optional[int] = kwargs.get("max_buffered_size")
+
+        # Cache of conversion results (see ResultCache), or None
+        self._cache: Optional[ResultCache] = kwargs.get("cache")
 
-        self._magika = magika.Magika()
+        # Executor for the blocking work of the aconvert* methods (None: the event loop's
+        # default executor)
+        self._async_executor: Optional[Executor] = kwargs.get("async_executor")
+
+        # How stream types are detected: "always" runs Magika on every stream,
+        # "when_ambiguous" skips it when a magic number confirms the extension or mimetype,
+        # and "never" relies on magic numbers, extensions and mimetypes alone.
+        self._detection_policy = kwargs.get("detection_policy", "when_ambiguous")
+        if self._detection_policy not in _DETECTION_POLICIES:
+            raise ValueError(
+                f"Unknown detection_policy '{self._detection_policy}'. Expected one of: {', '.join(_DETECTION_POLICIES)}"
+            )
+        self._detection_counts = {"signature": 0, "magika": 0, "extension": 0}
+        self._detection_counts_lock = threading.Lock()
 
         # TODO - remove these (see enable_builtins)
         self._llm_client: Any = None
@@ -121,6 +496,8 @@ class MarkItDown:
 
         # Register the converters
         self._converters: List[ConverterRegistration] = []
+        self._dispatch_index: Optional[_DispatchIndex] = None
+        self._converter_versions: Optional[List[str]] = None
 
         if (
             enable_builtins is None or enable_builtins
@@ -135,6 +512,10 @@ class MarkItDown:
         Enable and register built-in converters.
         Built-in converters are enabled by default.
         This method should only be called once, if built-ins were initially disabled.
+
+        Pass `builtin_converters` (an iterable of converter class names, e.g., ["PdfConverter"])
+        to register only those built-ins. Converter modules that are not registered are never
+        imported, so their dependencies are not loaded.
         """
         if not self._builtins_enabled:
             # TODO: Move these into converter constructors
@@ -169,36 +550,41 @@ class MarkItDown:
                         self._exiftool_path = candidate
 
             # Register converters for successful browsing operations
-            # Later registrations are tried first / take higher priority than earlier registrations
-            # To this end, the most specific converters should appear below the most generic converters
-            self.register_converter(
-                PlainTextConverter(), priority=PRIORITY_GENERIC_FILE_FORMAT
-            )
-            self.register_converter(
-                ZipConverter(markitdown=self), priority=PRIORITY_GENERIC_FILE_FORMAT
-            )
-            self.register_converter(
-                HtmlConverter(), priority=PRIORITY_GENERIC_FILE_FORMAT
-            )
-            self.register_converter(RssConverter())
-            self.register_converter(WikipediaConverter())
-            self.register_converter(YouTubeConverter())
-            self.register_converter(BingSerpConverter())
-            self.register_converter(DocxConverter())
-            self.register_converter(XlsxConverter())
-            self.register_converter(XlsConverter())
-            self.register_converter(PptxConverter())
-            self.register_converter(AudioConverter())
-            self.register_converter(ImageConverter())
-            self.register_converter(IpynbConverter())
-            self.register_converter(PdfConverter())
-            self.register_converter(OutlookMsgConverter())
-            self.register_converter(EpubConverter())
-            self.register_converter(CsvConverter())
+            builtin_converters = kwargs.get("builtin_converters")
+            if builtin_converters is not None:
+                builtin_converters = set(builtin_converters)
+                unknown = (
+                    builtin_converters
+                    - {builtin.name for builtin in _BUILTIN_CONVERTERS}
+                    - {"DocumentIntelligenceConverter"}
+                )
+                if unknown:
+                    raise ValueError(
+                        f"Unknown built-in converters: {', '.join(sorted(unknown))}"
+                    )
+
+            for builtin in _BUILTIN_CONVERTERS:
+                if (
+                    builtin_converters is not None
+                    and builtin.name not in builtin_converters
+                ):
+                    continue
+                self.register_converter(
+                    LazyConverter(
+                        self._builtin_converter_factory(builtin.name),
+                        accepted_extensions=builtin.extensions,
+                        accepted_mimetype_prefixes=builtin.mimetype_prefixes,
+                        signatures=builtin.signatures,
+                    ),
+                    priority=builtin.priority,
+                )
 
             # Register Document Intelligence converter at the top of the stack if endpoint is provided
             docintel_endpoint = kwargs.get("docintel_endpoint")
-            if docintel_endpoint is not None:
+            if docintel_endpoint is not None and (
+                builtin_converters is None
+                or "DocumentIntelligenceConverter" in builtin_converters
+            ):
                 docintel_args: Dict[str, Any] = {}
                 docintel_args["endpoint"] = docintel_endpoint
 
@@ -215,13 +601,26 @@ class MarkItDown:
                     docintel_args["api_version"] = docintel_version
 
                 self.register_converter(
-                    DocumentIntelligenceConverter(**docintel_args),
+                    converters.DocumentIntelligenceConverter(**docintel_args),
                 )
 
             self._builtins_enabled = True
         else:
             warn("Built-in converters are already enabled.", RuntimeWarning)
 
+    def _builtin_converter_factory(self, name: str) -> Callable[[], DocumentConverter]:
+        def factory() -> DocumentConverter:
+            converter_class = getattr(converters, name)
+            if name == "ZipConverter":
+                # The ZipConverter recursively converts members using this instance
+                return converter_class(markitdown=self)
+            return converter_class()
+
+        # Name the factory after the converter (e.g., for the result cache's keys)
+        factory.__module__ = converters.__name__
+        factory.__qualname__ = factory.__name__ = name
+        return factory
+
     def enable_plugins(self, **kwargs) -> None:
         """
         Enable and register converters provided by plugins.
@@ -253,6 +652,23 @@ class MarkItDown:
         Args:
             - source: can be a path (str or Path), url, or a requests.response object
             - stream_info: optional stream info to use for the conversion. If None, infer from source
+            - normalize: if False, skip normalizing the Markdown (stripping trailing whitespace
+              and collapsing blank lines), e.g., when the caller post-processes it anyway
+            - trace: if True, attach a ConversionTrace to the result, recording the time spent
+              buffering, detecting the stream type and charset, in each converter's accepts()
+              and convert(), and normalizing
+            - deadline: a Deadline, or a number of seconds, after which the conversion stops.
+              Converters check it between pages, slides, sheets, ZIP members, etc.; a
+              Deadline can also be cancelled from another thread.
+            - on_deadline: what happens when the deadline expires: "raise" (the default)
+              raises a ConversionTimeoutException, and "truncate" returns the Markdown
+              converted so far, with the result's `truncated` flag set. Truncated results
+              are not cached.
+            - pages: the numbers (counted from 1) of the units to convert: the pages of a
+              PDF, the slides of a PPTX, the sheets of an XLSX or XLS, the chapters (spine
+              items) of an EPUB, or the members of a ZIP. Other documents are converted
+              whole.
+            - max_units: the maximum number of those units to convert, e.g., for a preview
             - kwargs: additional arguments to pass to the converter
         """
 
@@ -292,6 +708,192 @@ class MarkItDown:
                 f"Invalid source type: {type(source)}. Expected str, requests.Response, BinaryIO."
             )
 
+    def convert_iter(
+        self,
+        source: Union[str, requests.Response, Path, BinaryIO],
+        *,
+        stream_info: Optional[StreamInfo] = None,
+        **kwargs: Any,
+    ) -> Iterator[str]:
+        """
+        Convert a source incrementally, yielding the Markdown of one unit at a time (e.g., a
+        PDF page, slide, sheet, EPUB chapter or ZIP member), as soon as it is converted.
+        Joined with blank lines, the units make up the Markdown that convert() returns.
+        Converters that do not divide documents into units yield them whole (see
+        DocumentConverter.convert_iter).
+
+        As with convert(), a converter that fails falls back to the next one, but only until
+        it yields its first unit. Later failures raise a FileConversionException.
+
+        Args:
+            - source: can be a path (str or Path), url, or a requests.response object
+            - stream_info: optional stream info to use for the conversion. If None, infer from source
+            - normalize: if False, skip normalizing each unit (see convert())
+            - deadline, on_deadline: as in convert(), except that "truncate" just stops the
+              iteration after the units converted so far
+            - pages, max_units: select the units to convert (see convert())
+            - kwargs: additional arguments to pass to the converter
+        """
+        # The deadline starts when the iteration does
+        _start_options(kwargs)
+        with self._open_source(source, stream_info) as (file_stream, base_guess):
+            guesses = self._get_stream_info_guesses(
+                file_stream=file_stream, base_guess=base_guess
+            )
+            yield from self._convert_iter(
+                file_stream=file_stream, stream_info_guesses=guesses, **kwargs
+            )
+
+    async def aconvert(
+        self,
+        source: Union[str, requests.Response, Path, BinaryIO],
+        *,
+        stream_info: Optional[StreamInfo] = None,
+        **kwargs: Any,
+    ) -> DocumentConverterResult:
+        """
+        Asynchronous version of convert(). The conversion runs on the `async_executor`
+        given to the constructor (by default, the event loop's default executor), so it
+        never blocks the event loop. HTTP(S) URLs are fetched as in aconvert_uri().
+        """
+        if isinstance(source, str) and (
+            source.startswith("http:") or source.startswith("https:")
+        ):
+            # Rename the url argument to mock_url, as in convert()
+            _kwargs = {k: v for k, v in kwargs.items()}
+            if "url" in _kwargs:
+                _kwargs["mock_url"] = _kwargs["url"]
+                del _kwargs["url"]
+            return await self.aconvert_uri(source, stream_info=stream_info, **_kwargs)
+
+        return await self._run_in_executor(
+            self.convert, source, stream_info=stream_info, **kwargs
+        )
+
+    async def aconvert_stream(
+        self,
+        stream: BinaryIO,
+        *,
+        stream_info: Optional[StreamInfo] = None,
+        **kwargs: Any,
+    ) -> DocumentConverterResult:
+        """Asynchronous version of convert_stream(). See aconvert()."""
+        return await self._run_in_executor(
+            self.convert_stream, stream, stream_info=stream_info, **kwargs
+        )
+
+    async def aconvert_uri(
+        self,
+        uri: str,
+        *,
+        stream_info: Optional[StreamInfo] = None,
+        file_extension: Optional[str] = None,  # Deprecated -- use stream_info
+        mock_url: Optional[
+            str
+        ] = None,  # Mock the request as if it came from a different URL
+        **kwargs: Any,
+    ) -> DocumentConverterResult:
+        """
+        Asynchronous version of convert_uri(). HTTP(S) resources are downloaded without
+        blocking the event loop if httpx is installed, and converted on the executor (see
+        aconvert()). A requests_session given to the constructor is honored by fetching
+        with it, on the executor, instead.
+        """
+        uri = uri.strip()
+        if (
+            httpx is None
+            or self._custom_requests_session
+            or not (uri.startswith("http:") or uri.startswith("https:"))
+        ):
+            return await self._run_in_executor(
+                self.convert_uri,
+                uri,
+                stream_info=stream_info,
+                file_extension=file_extension,
+                mock_url=mock_url,
+                **kwargs,
+            )
+
+        spool = self._new_spool()
+        try:
+            async with httpx.AsyncClient(
+                headers=dict(self._requests_session.headers), follow_redirects=True
+            ) as client:
+                async with client.stream("GET", uri) as response:
+                    response.raise_for_status()
+                    spool.check_size(content_length(response.headers))
+                    async for chunk in response.aiter_bytes(SPOOL_CHUNK_SIZE):
+                        spool.write(chunk)
+        except BaseException:
+            spool.close()
+            raise
+
+        base_guess = self._get_response_base_guess(
+            response.headers,
+            str(response.url),
+            stream_info=stream_info,
+            file_extension=file_extension,
+            url=mock_url,
+        )
+        trace = _start_trace(kwargs)
+        with spool.getfile() as buffer:
+            return await self._run_in_executor(
+                self._guess_and_convert, buffer, base_guess, trace=trace, **kwargs
+            )
+
+    async def _run_in_executor(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        # The executor cannot interrupt a conversion, so a cancelled task cancels the
+        # conversion's deadline instead, and the converters stop at their next check
+        _start_options(kwargs)
+        deadline = kwargs.setdefault("deadline", Deadline())
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self._async_executor, functools.partial(func, *args, **kwargs)
+            )
+        except asyncio.CancelledError:
+            deadline.cancel()
+            raise
+
+    def convert_many(
+        self,
+        sources: Iterable[Union[str, Path, BinaryIO]],
+        *,
+        max_workers: Optional[int] = None,
+        executor: str = "process",
+        ordered: bool = True,
+        chunksize: int = 1,
+        **kwargs: Any,
+    ) -> Iterator[Tuple[Any, Union[DocumentConverterResult, Exception]]]:
+        """
+        Convert many sources in parallel, yielding (source, result) pairs as they complete.
+        If a source fails to convert, its result is the exception that was raised, and the
+        batch continues.
+
+        Args:
+            - sources: the sources to convert, as accepted by convert(). Read lazily.
+            - max_workers: the number of workers (default: the number of CPUs)
+            - executor: "process" (the default) converts in worker processes, each with its
+              own MarkItDown built once from this instance's constructor options. Sources
+              and options must be picklable, and converters registered after construction
+              are not available. "thread" converts with this instance, in threads.
+            - ordered: if True (the default), results are yielded in the order of the
+              sources; otherwise as soon as they complete
+            - chunksize: the number of sources sent to a worker at once. Larger chunks
+              reduce the overhead of many small conversions.
+            - kwargs: additional arguments to pass to convert()
+        """
+        return convert_many(
+            self,
+            sources,
+            max_workers=max_workers,
+            executor=executor,
+            ordered=ordered,
+            chunksize=chunksize,
+            kwargs=kwargs,
+        )
+
     def convert_local(
         self,
         path: Union[str, Path],
@@ -323,11 +925,10 @@ class MarkItDown:
             # Deprecated -- use stream_info
             base_guess = base_guess.copy_and_update(url=url)
 
+        _start_options(kwargs)
+        trace = _start_trace(kwargs)
         with open(path, "rb") as fh:
-            guesses = self._get_stream_info_guesses(
-                file_stream=fh, base_guess=base_guess
-            )
-            return self._convert(file_stream=fh, stream_info_guesses=guesses, **kwargs)
+            return self._guess_and_convert(fh, base_guess, trace=trace, **kwargs)
 
     def convert_stream(
         self,
@@ -359,22 +960,20 @@ class MarkItDown:
                 assert base_guess is not None  # for mypy
                 base_guess = base_guess.copy_and_update(url=url)
 
-        # Check if we have a seekable stream. If not, load the entire stream into memory.
-        if not stream.seekable():
-            buffer = io.BytesIO()
-            while True:
-                chunk = stream.read(4096)
-                if not chunk:
-                    break
-                buffer.write(chunk)
-            buffer.seek(0)
-            stream = buffer
-
-        # Add guesses based on stream content
-        guesses = self._get_stream_info_guesses(
-            file_stream=stream, base_guess=base_guess or StreamInfo()
-        )
-        return self._convert(file_stream=stream, stream_info_guesses=guesses, **kwargs)
+        # Check if we have a seekable stream. If not, buffer it.
+        _start_options(kwargs)
+        trace = _start_trace(kwargs)
+        start = time.perf_counter()
+        buffer = self._make_seekable(stream)
+        if trace is not None and buffer is not stream:
+            trace.add("buffer", time.perf_counter() - start)
+        try:
+            return self._guess_and_convert(
+                buffer, base_guess or StreamInfo(), trace=trace, **kwargs
+            )
+        finally:
+            if buffer is not stream:
+                buffer.close()
 
     def convert_url(
         self,
@@ -408,6 +1007,9 @@ class MarkItDown:
     ) -> DocumentConverterResult:
         uri = uri.strip()
 
+        # The deadline covers the download too
+        _start_options(kwargs)
+
         # File URIs
         if uri.startswith("file:"):
             netloc, path = file_uri_to_path(uri)
@@ -465,12 +1067,73 @@ class MarkItDown:
         url: Optional[str] = None,  # Deprecated -- use stream_info
         **kwargs: Any,
     ) -> DocumentConverterResult:
+        base_guess = self._get_response_base_guess(
+            response.headers,
+            response.url,
+            stream_info=stream_info,
+            file_extension=file_extension,
+            url=url,
+        )
+
+        # Convert
+        _start_options(kwargs)
+        trace = _start_trace(kwargs)
+        start = time.perf_counter()
+        with self._read_response(response) as buffer:
+            if trace is not None:
+                trace.add("buffer", time.perf_counter() - start)
+            return self._guess_and_convert(buffer, base_guess, trace=trace, **kwargs)
+
+    def _new_spool(self) -> StreamSpool:
+        return StreamSpool(
+            memory_limit=self._spool_memory_limit, max_size=self._max_buffered_size
+        )
+
+    def _spool(self, chunks: Iterable[bytes], size: Optional[int] = None) -> BinaryIO:
+        """Buffer the chunks in a seekable stream (see StreamSpool), which the caller closes."""
+        spool = self._new_spool()
+        try:
+            spool.check_size(size)
+            for chunk in chunks:
+                spool.write(chunk)
+        except BaseException:
+            spool.close()
+            raise
+        return spool.getfile()
+
+    def _make_seekable(self, stream: BinaryIO) -> BinaryIO:
+        """Return the stream if it is seekable. If not, return a buffered copy."""
+        if stream.seekable():
+            return stream
+        read_chunk = functools.partial(stream.read, SPOOL_CHUNK_SIZE)
+        return self._spool(iter(read_chunk, b""))
+
+    def _read_response(self, response: requests.Response) -> BinaryIO:
+        """Buffer the body of an HTTP response."""
+        return self._spool(
+            response.iter_content(chunk_size=SPOOL_CHUNK_SIZE),
+            content_length(response.headers),
+        )
+
+    def _get_response_base_guess(
+        self,
+        headers: Any,
+        response_url: str,
+        *,
+        stream_info: Optional[StreamInfo] = None,
+        file_extension: Optional[str] = None,  # Deprecated -- use stream_info
+        url: Optional[str] = None,  # Deprecated -- use stream_info
+    ) -> StreamInfo:
+        """
+        Build the initial guess for an HTTP response from its (case-insensitive) headers
+        and final URL, updated with the caller's stream info.
+        """
         # If there is a content-type header, get the mimetype and charset (if present)
         mimetype: Optional[str] = None
         charset: Optional[str] = None
 
-        if "content-type" in response.headers:
-            parts = response.headers["content-type"].split(";")
+        if "content-type" in headers:
+            parts = headers["content-type"].split(";")
             mimetype = parts.pop(0).strip()
             for part in parts:
                 if part.strip().startswith("charset="):
@@ -481,8 +1144,8 @@ class MarkItDown:
         # If there is a content-disposition header, get the filename and possibly the extension
         filename: Optional[str] = None
         extension: Optional[str] = None
-        if "content-disposition" in response.headers:
-            m = re.search(r"filename=([^;]+)", response.headers["content-disposition"])
+        if "content-disposition" in headers:
+            m = re.search(r"filename=([^;]+)", headers["content-disposition"])
             if m:
                 filename = m.group(1).strip("\"'")
                 _, _extension = os.path.splitext(filename)
@@ -491,7 +1154,7 @@ class MarkItDown:
 
         # If there is still no filename, try to read it from the url
         if filename is None:
-            parsed_url = urlparse(response.url)
+            parsed_url = urlparse(response_url)
             _, _extension = os.path.splitext(parsed_url.path)
             if len(_extension) > 0:  # Looks like this might be a file!
                 filename = os.path.basename(parsed_url.path)
@@ -503,7 +1166,7 @@ class MarkItDown:
             charset=charset,
             filename=filename,
             extension=extension,
-            url=response.url,
+            url=response_url,
         )
 
         # Update with any additional info from the arguments
@@ -516,112 +1179,463 @@ class MarkItDown:
             # Deprecated -- use stream_info
             base_guess = base_guess.copy_and_update(url=url)
 
-        # Read into BytesIO
-        buffer = io.BytesIO()
-        for chunk in response.iter_content(chunk_size=512):
-            buffer.write(chunk)
-        buffer.seek(0)
+        return base_guess
 
-        # Convert
-        guesses = self._get_stream_info_guesses(
-            file_stream=buffer, base_guess=base_guess
+    def _guess_and_convert(
+        self,
+        file_stream: BinaryIO,
+        base_guess: StreamInfo,
+        trace: Optional[ConversionTrace] = None,
+        **kwargs: Any,
+    ) -> DocumentConverterResult:
+        if trace is not None:
+            cur_pos = file_stream.tell()
+            trace.bytes_in = file_stream.seek(0, os.SEEK_END) - cur_pos
+            file_stream.seek(cur_pos)
+
+        # The cache is checked before guessing the stream info, so hits skip Magika too
+        cache_key = None
+        result = None
+        if self._cache is not None:
+            start = time.perf_counter()
+            cache_key = self._cache_key(file_stream, base_guess, kwargs)
+            result = self._cache.get(cache_key)
+            if trace is not None:
+                trace.cached = result is not None
+                trace.add(
+                    "cache",
+                    time.perf_counter() - start,
+                    outcome="hit" if result is not None else "miss",
+                )
+
+        if result is None:
+            # Add guesses based on stream content
+            guesses = self._get_stream_info_guesses(
+                file_stream=file_stream, base_guess=base_guess, trace=trace
+            )
+            result = self._convert(
+                file_stream=file_stream,
+                stream_info_guesses=guesses,
+                trace=trace,
+                **kwargs,
+            )
+
+            if (
+                self._cache is not None
+                and cache_key is not None
+                and not result.truncated
+            ):
+                start = time.perf_counter()
+                self._cache.set(cache_key, result)
+                if trace is not None:
+                    trace.add("cache", time.perf_counter() - start, outcome="store")
+
+        if trace is not None:
+            trace.bytes_out = len(result.markdown.encode("utf-8"))
+            result.trace = trace
+        return result
+
+    def _cache_key(
+        self, file_stream: BinaryIO, base_guess: StreamInfo, kwargs: Dict[str, Any]
+    ) -> str:
+        """
+        Key a conversion on a hash of the stream's content, on the parts of its stream info
+        that affect the conversion (extension, mimetype, charset and url), on the registered
+        converters (and their versions), and on the options passed to them.
+
+        The local path and filename are not part of the key, so copies of a file at different
+        paths share a result; except for ZIP archives (including Office documents, which
+        cannot be told apart from the signature alone), as the ZipConverter names the
+        archive's path in the heading of its content.
+        """
+        content_hash = hashlib.sha256()
+        cur_pos = file_stream.tell()
+        try:
+            read_chunk = functools.partial(file_stream.read, _HASH_CHUNK_SIZE)
+            first_chunk = read_chunk()
+            content_hash.update(first_chunk)
+            for chunk in iter(read_chunk, b""):
+                content_hash.update(chunk)
+        finally:
+            file_stream.seek(cur_pos)
+
+        stream_info = {
+            "extension": base_guess.extension,
+            "mimetype": base_guess.mimetype,
+            "charset": base_guess.charset,
+            "url": base_guess.url,
+        }
+        if first_chunk.startswith(_ZIP_SIGNATURE):
+            stream_info["local_path"] = base_guess.local_path
+            stream_info["filename"] = base_guess.filename
+
+        converter_versions = self._converter_versions
+        if converter_versions is None:
+            converter_versions = self._converter_versions = []
+            for registration in self._converters:
+                name = _converter_name(registration.converter)
+                converter_versions.append(
+                    f"{name}=={_package_version(name)}@{registration.priority}"
+                )
+
+        options = self._conversion_options(kwargs)
+        key = json.dumps(
+            {
+                "content": content_hash.hexdigest(),
+                "stream_info": stream_info,
+                "converters": converter_versions,
+                "detection_policy": self._detection_policy,
+                "options": {
+                    k: v
+                    for k, v in options.items()
+                    if not k.startswith("_") and k not in _UNKEYED_OPTIONS
+                },
+            },
+            sort_keys=True,
+            # Other objects (e.g., an LLM client) are keyed on their type
+            default=lambda o: f"{type(o).__module__}.{type(o).__qualname__}",
         )
-        return self._convert(file_stream=buffer, stream_info_guesses=guesses, **kwargs)
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    @contextlib.contextmanager
+    def _open_source(
+        self,
+        source: Union[str, requests.Response, Path, BinaryIO],
+        stream_info: Optional[StreamInfo],
+    ) -> Iterator[Tuple[BinaryIO, StreamInfo]]:
+        """
+        Open any source accepted by convert() as a seekable stream, and build the initial
+        guess of its stream info. Local files stay open until the context exits.
+        """
+        # URIs
+        if isinstance(source, str):
+            if source.startswith("http:") or source.startswith("https:"):
+                response = self._requests_session.get(source.strip(), stream=True)
+                response.raise_for_status()
+                source = response
+            elif source.startswith("file:"):
+                netloc, path = file_uri_to_path(source.strip())
+                if netloc and netloc != "localhost":
+                    raise ValueError(
+                        f"Unsupported file URI: {source}. Netloc must be empty or localhost."
+                    )
+                source = path
+            elif source.startswith("data:"):
+                mimetype, attributes, data = parse_data_uri(source.strip())
+                base_guess = StreamInfo(
+                    mimetype=mimetype,
+                    charset=attributes.get("charset"),
+                )
+                if stream_info is not None:
+                    base_guess = base_guess.copy_and_update(stream_info)
+                yield io.BytesIO(data), base_guess
+                return
+
+        # Local path
+        if isinstance(source, (str, Path)):
+            path = str(source)
+            base_guess = StreamInfo(
+                local_path=path,
+                extension=os.path.splitext(path)[1],
+                filename=os.path.basename(path),
+            )
+            if stream_info is not None:
+                base_guess = base_guess.copy_and_update(stream_info)
+            with open(path, "rb") as fh:
+                yield fh, base_guess
+        # Request response
+        elif isinstance(source, requests.Response):
+            base_guess = self._get_response_base_guess(
+                source.headers, source.url, stream_info=stream_info
+            )
+            with self._read_response(source) as buffer:
+                yield buffer, base_guess
+        # Binary stream
+        elif (
+            hasattr(source, "read")
+            and callable(source.read)
+            and not isinstance(source, io.TextIOBase)
+        ):
+            buffer = self._make_seekable(source)
+            try:
+                yield buffer, stream_info or StreamInfo()
+            finally:
+                if buffer is not source:
+                    buffer.close()
+        else:
+            raise TypeError(
+                f"Invalid source type: {type(source)}. Expected str, requests.Response, BinaryIO."
+            )
 
     def _convert(
-        self, *, file_stream: BinaryIO, stream_info_guesses: List[StreamInfo], **kwargs
+        self,
+        *,
+        file_stream: BinaryIO,
+        stream_info_guesses: List[StreamInfo],
+        normalize: bool = True,
+        trace: Optional[ConversionTrace] = None,
+        **kwargs,
     ) -> DocumentConverterResult:
         res: Union[None, DocumentConverterResult] = None
 
         # Keep track of which converters throw exceptions
         failed_attempts: List[FailedConversionAttempt] = []
 
-        # Create a copy of the page_converters list, sorted by priority.
-        # We do this with each call to _convert because the priority of converters may change between calls.
-        # The sort is guaranteed to be stable, so converters with the same priority will remain in the same order.
-        sorted_registrations = sorted(self._converters, key=lambda x: x.priority)
+        # Converters that already failed on these bytes are not run again for later guesses
+        # (see _accepting_converters)
+        failed_keys: Set[Tuple[int, Optional[str]]] = set()
 
         # Remember the initial stream position so that we can return to it
         cur_pos = file_stream.tell()
 
-        for stream_info in stream_info_guesses + [StreamInfo()]:
-            for converter_registration in sorted_registrations:
-                converter = converter_registration.converter
-                # Sanity check -- make sure the cur_pos is still the same
-                assert (
-                    cur_pos == file_stream.tell()
-                ), "File stream position should NOT change between guess iterations"
+        for converter, stream_info, _kwargs, attempt_key in self._accepting_converters(
+            file_stream, stream_info_guesses, kwargs, failed_keys, trace=trace
+        ):
+            check_deadline(**kwargs)
+
+            start = time.perf_counter()
+            outcome = "ok"
+            try:
+                res = converter.convert(file_stream, stream_info, **_kwargs)
+            except Exception as e:
+                outcome = type(e).__name__
+
+                # The deadline is the conversion's, so no other converter is tried
+                if isinstance(e, ConversionTimeoutException):
+                    raise
+
+                failed_attempts.append(
+                    FailedConversionAttempt(
+                        converter=converter, exc_info=sys.exc_info()
+                    )
+                )
+                failed_keys.add(attempt_key)
+            finally:
+                file_stream.seek(cur_pos)
+                if trace is not None:
+                    trace.add(
+                        "convert",
+                        time.perf_counter() - start,
+                        converter=_converter_name(converter),
+                        outcome=outcome,
+                    )
 
-                _kwargs = {k: v for k, v in kwargs.items()}
+            if res is not None:
+                if trace is not None:
+                    trace.stream_info = stream_info
+                    trace.converter = _converter_name(converter)
 
-                # Copy any additional global options
-                if "llm_client" not in _kwargs and self._llm_client is not None:
-                    _kwargs["llm_client"] = self._llm_client
+                # Normalize the content
+                if normalize:
+                    start = time.perf_counter()
+                    res.text_content = normalize_markdown(res.text_content)
+                    if trace is not None:
+                        trace.add("normalize", time.perf_counter() - start)
+                return res
 
-                if "llm_model" not in _kwargs and self._llm_model is not None:
-                    _kwargs["llm_model"] = self._llm_model
+        raise _conversion_error(failed_attempts)
 
-                if "llm_prompt" not in _kwargs and self._llm_prompt is not None:
-                    _kwargs["llm_prompt"] = self._llm_prompt
+    def _convert_iter(
+        self,
+        *,
+        file_stream: BinaryIO,
+        stream_info_guesses: List[StreamInfo],
+        normalize: bool = True,
+        **kwargs,
+    ) -> Iterator[str]:
+        # Keep track of which converters throw exceptions
+        failed_attempts: List[FailedConversionAttempt] = []
 
-                if "style_map" not in _kwargs and self._style_map is not None:
-                    _kwargs["style_map"] = self._style_map
+        # Converters that already failed on these bytes are not run again for later guesses
+        # (see _accepting_converters)
+        failed_keys: Set[Tuple[int, Optional[str]]] = set()
 
-                if "exiftool_path" not in _kwargs and self._exiftool_path is not None:
-                    _kwargs["exiftool_path"] = self._exiftool_path
+        # Remember the initial stream position so that we can return to it
+        cur_pos = file_stream.tell()
 
-                # Add the list of converters for nested processing
-                _kwargs["_parent_converters"] = self._converters
+        for converter, stream_info, _kwargs, attempt_key in self._accepting_converters(
+            file_stream, stream_info_guesses, kwargs, failed_keys
+        ):
+            check_deadline(**kwargs)
 
-                # Add legaxy kwargs
-                if stream_info is not None:
-                    if stream_info.extension is not None:
-                        _kwargs["file_extension"] = stream_info.extension
+            units: Iterator[str] = iter([])
+            converted = False
+            try:
+                units = iter(
+                    converter.convert_iter(file_stream, stream_info, **_kwargs)
+                )
+                for unit in units:
+                    # Normalize each unit, and separate them with exactly one blank line
+                    if normalize:
+                        unit = normalize_markdown(unit).strip("\n")
+                    if unit:
+                        converted = True
+                        yield unit
+                converted = True
+            except Exception as e:
+                # The deadline is the conversion's, so no other converter is tried. When
+                # truncating, the units yielded so far are the output.
+                if isinstance(e, ConversionTimeoutException):
+                    if converted and kwargs.get("on_deadline") == "truncate":
+                        return
+                    raise
+
+                # Once units were yielded, it is too late to fall back to another converter
+                if converted:
+                    raise FileConversionException(
+                        attempts=[
+                            FailedConversionAttempt(
+                                converter=converter, exc_info=sys.exc_info()
+                            )
+                        ]
+                    )
+                failed_attempts.append(
+                    FailedConversionAttempt(
+                        converter=converter, exc_info=sys.exc_info()
+                    )
+                )
+                failed_keys.add(attempt_key)
+            finally:
+                # Release the converter's resources (e.g., open archives), even if the
+                # caller stopped iterating early
+                close = getattr(units, "close", None)
+                if close is not None:
+                    close()
+                file_stream.seek(cur_pos)
+
+            if converted:
+                return
+
+        raise _conversion_error(failed_attempts)
+
+    def _conversion_options(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the options passed to the converters: the kwargs, and the global options."""
+        options = {k: v for k, v in kwargs.items()}
+
+        # Copy any additional global options
+        if "llm_client" not in options and self._llm_client is not None:
+            options["llm_client"] = self._llm_client
+
+        if "llm_model" not in options and self._llm_model is not None:
+            options["llm_model"] = self._llm_model
+
+        if "llm_prompt" not in options and self._llm_prompt is not None:
+            options["llm_prompt"] = self._llm_prompt
+
+        if "style_map" not in options and self._style_map is not None:
+            options["style_map"] = self._style_map
+
+        if "exiftool_path" not in options and self._exiftool_path is not None:
+            options["exiftool_path"] = self._exiftool_path
+
+        return options
+
+    def _get_dispatch_index(self) -> _DispatchIndex:
+        """
+        Return the index of candidate converters by extension, mimetype and signature,
+        rebuilding it after the registrations change.
+        """
+        dispatch_index = self._dispatch_index
+        if dispatch_index is None:
+            dispatch_index = self._dispatch_index = _DispatchIndex(self._converters)
+        return dispatch_index
+
+    def _accepting_converters(
+        self,
+        file_stream: BinaryIO,
+        stream_info_guesses: List[StreamInfo],
+        kwargs: Dict[str, Any],
+        failed_keys: Set[Tuple[int, Optional[str]]],
+        trace: Optional[ConversionTrace] = None,
+    ) -> Iterator[
+        Tuple[DocumentConverter, StreamInfo, Dict[str, Any], Tuple[int, Optional[str]]]
+    ]:
+        """
+        Yield the converters that accept the stream, in the order in which they should be
+        tried, with the guess and the options to convert with, and the key under which the
+        caller adds a failed attempt to failed_keys. The caller must restore the stream
+        position before resuming the iteration.
+        """
+        dispatch_index = self._get_dispatch_index()
+
+        # Remember the initial stream position so that we can return to it
+        cur_pos = file_stream.tell()
+
+        # Read the leading bytes once, for signature matching and for converters that sniff
+        # the content in accepts()
+        stream_header = file_stream.read(STREAM_HEADER_SIZE)
+        file_stream.seek(cur_pos)
+        signature_ranks = dispatch_index.signature_ranks(stream_header)
+
+        # Build the options passed to the converters once per call
+        base_kwargs = self._conversion_options(kwargs)
+
+        # Add the list of converters for nested processing
+        base_kwargs["_parent_converters"] = self._converters
+
+        # Share the header with the converters (see read_stream_header)
+        base_kwargs["_stream_header"] = stream_header
+
+        for stream_info in stream_info_guesses + [StreamInfo()]:
+            # Add legaxy kwargs
+            _kwargs = base_kwargs
+            if stream_info.extension is not None or stream_info.url is not None:
+                _kwargs = dict(base_kwargs)
+
+                if stream_info.extension is not None:
+                    _kwargs["file_extension"] = stream_info.extension
+
+                if stream_info.url is not None:
+                    _kwargs["url"] = stream_info.url
 
-                    if stream_info.url is not None:
-                        _kwargs["url"] = stream_info.url
+            for converter_registration in dispatch_index.candidates(
+                stream_info, signature_ranks
+            ):
+                converter = converter_registration.converter
+                # Sanity check -- make sure the cur_pos is still the same
+                assert (
+                    cur_pos == file_stream.tell()
+                ), "File stream position should NOT change between guess iterations"
+
+                # The guesses only steer which converter is chosen, except for the charset,
+                # which changes how the bytes are decoded; so a converter that failed is
+                # only tried again with a different charset.
+                attempt_key = (id(converter), stream_info.charset)
+                if attempt_key in failed_keys:
+                    continue
 
-                # Check if the converter will accept the file, and if so, try to convert it
+                # Check if the converter will accept the file
                 _accepts = False
+                start = time.perf_counter()
                 try:
                     _accepts = converter.accepts(file_stream, stream_info, **_kwargs)
                 except NotImplementedError:
                     pass
+                if trace is not None:
+                    # Name a loaded LazyConverter as its target, as in the "convert" spans
+                    traced_converter = converter
+                    if (
+                        isinstance(converter, LazyConverter)
+                        and converter.loaded_converter is not None
+                    ):
+                        traced_converter = converter.loaded_converter
+                    trace.add(
+                        "accepts",
+                        time.perf_counter() - start,
+                        converter=_converter_name(traced_converter),
+                        outcome="accepted" if _accepts else "rejected",
+                    )
 
                 # accept() should not have changed the file stream position
                 assert (
                     cur_pos == file_stream.tell()
                 ), f"{type(converter).__name__}.accept() should NOT change the file_stream position"
 
-                # Attempt the conversion
                 if _accepts:
-                    try:
-                        res = converter.convert(file_stream, stream_info, **_kwargs)
-                    except Exception:
-                        failed_attempts.append(
-                            FailedConversionAttempt(
-                                converter=converter, exc_info=sys.exc_info()
-                            )
-                        )
-                    finally:
-                        file_stream.seek(cur_pos)
-
-                if res is not None:
-                    # Normalize the content
-                    res.text_content = "\n".join(
-                        [line.rstrip() for line in re.split(r"\r?\n", res.text_content)]
-                    )
-                    res.text_content = re.sub(r"\n{3,}", "\n\n", res.text_content)
-                    return res
-
-        # If we got this far without success, report any exceptions
-        if len(failed_attempts) > 0:
-            raise FileConversionException(attempts=failed_attempts)
-
-        # Nothing can handle it!
-        raise UnsupportedFormatException(
-            "Could not convert stream to Markdown. No converter attempted a conversion, suggesting that the filetype is simply not supported."
-        )
+                    # Convert with (and report failures of) the converter a LazyConverter loaded
+                    if isinstance(converter, LazyConverter):
+                        converter = converter.converter
+                    yield converter, stream_info, _kwargs, attempt_key
 
     def register_page_converter(self, converter: DocumentConverter) -> None:
         """DEPRECATED: User register_converter instead."""
@@ -646,10 +1660,12 @@ class MarkItDown:
         priority PRIORITY_SPECIFIC_FILE_FORMAT (== 10), with lower values
         being tried first (i.e., higher priority).
 
-        Just prior to conversion, the converters are sorted by priority, using
-        a stable sort. This means that converters with the same priority will
-        remain in the same order, with the most recently registered converters
-        appearing first.
+        The converters are sorted by priority, using a stable sort. This means
+        that converters with the same priority will remain in the same order,
+        with the most recently registered converters appearing first.
+
+        Converters that declare `accepted_extensions` or `accepted_mimetype_prefixes`
+        are only offered streams that match them (see DocumentConverter).
 
         We have tight control over the order of built-in converters, but
         plugins can register converters in any order. The registration's priority
@@ -662,12 +1678,34 @@ class MarkItDown:
         self._converters.insert(
             0, ConverterRegistration(converter=converter, priority=priority)
         )
+        self._dispatch_index = None
+        self._converter_versions = None
+
+    @property
+    def detection_counts(self) -> Dict[str, int]:
+        """
+        The number of streams whose type was detected from a magic number ("signature"),
+        by Magika ("magika"), or from the extension and mimetype alone ("extension").
+        """
+        with self._detection_counts_lock:
+            return dict(self._detection_counts)
+
+    def _count_detection(self, path: str) -> None:
+        with self._detection_counts_lock:
+            self._detection_counts[path] += 1
 
     def _get_stream_info_guesses(
-        self, file_stream: BinaryIO, base_guess: StreamInfo
+        self,
+        file_stream: BinaryIO,
+        base_guess: StreamInfo,
+        trace: Optional[ConversionTrace] = None,
+        count: bool = True,
     ) -> List[StreamInfo]:
         """
         Given a base guess, attempt to guess or expand on the stream info using the stream content (via magika).
+
+        Unless `count` is False (e.g., when only checking an upload before converting it), the
+        detection is counted in detection_counts.
         """
         guesses: List[StreamInfo] = []
 
@@ -688,21 +1726,64 @@ class MarkItDown:
             if len(_e) > 0:
                 enhanced_guess = enhanced_guess.copy_and_update(extension=_e[0])
 
+        # Detect the charset of text, so that converters need not detect it again
+        detected_charset = None
+        if enhanced_guess.charset is None and is_text_mimetype(enhanced_guess.mimetype):
+            start = time.perf_counter()
+            detected_charset = detect_charset(file_stream)
+            if trace is not None:
+                trace.add(
+                    "charset", time.perf_counter() - start, outcome=detected_charset
+                )
+            if detected_charset is not None:
+                enhanced_guess = enhanced_guess.copy_and_update(
+                    charset=detected_charset
+                )
+
+        # Skip Magika when a magic number confirms the extension or mimetype
+        if self._detection_policy != "always":
+            signature_guess = self._get_signature_guess(file_stream, base_guess)
+            if signature_guess is not None:
+                if count:
+                    self._count_detection("signature")
+                return [signature_guess]
+
+            if self._detection_policy == "never":
+                if count:
+                    self._count_detection("extension")
+                return [enhanced_guess]
+
+        if count:
+            self._count_detection("magika")
+
         # Call magika to guess from the stream
         cur_pos = file_stream.tell()
         try:
-            result = self._magika.identify_stream(file_stream)
+            start = time.perf_counter()
+            result = get_magika().identify_stream(file_stream)
+            if trace is not None:
+                trace.add(
+                    "magika",
+                    time.perf_counter() - start,
+                    outcome=(
+                        result.prediction.output.label
+                        if result.status == "ok"
+                        else str(result.status)
+                    ),
+                )
             if result.status == "ok" and result.prediction.output.label != "unknown":
                 # If it's text, also guess the charset
                 charset = None
                 if result.prediction.output.is_text:
-                    # Read the first 4k to guess the charset
                     file_stream.seek(cur_pos)
-                    stream_page = file_stream.read(4096)
-                    charset_result = charset_normalizer.from_bytes(stream_page).best()
-
-                    if charset_result is not None:
-                        charset = self._normalize_charset(charset_result.encoding)
+                    charset = detected_charset
+                    if charset is None:
+                        start = time.perf_counter()
+                        charset = detect_charset(file_stream)
+                        if trace is not None:
+                            trace.add(
+                                "charset", time.perf_counter() - start, outcome=charset
+                            )
 
                 # Normalize the first extension listed
                 guessed_extension = None
@@ -726,7 +1807,7 @@ class MarkItDown:
 
                 if (
                     base_guess.charset is not None
-                    and self._normalize_charset(base_guess.charset) != charset
+                    and normalize_charset(base_guess.charset) != charset
                 ):
                     compatible = False
 
@@ -764,13 +1845,40 @@ class MarkItDown:
 
         return guesses
 
-    def _normalize_charset(self, charset: str | None) -> str | None:
+    def _get_signature_guess(
+        self, file_stream: BinaryIO, base_guess: StreamInfo
+    ) -> Optional[StreamInfo]:
         """
-        Normalize a charset string to a canonical form.
+        Identify the stream from its magic number. Returns a guess shaped like Magika's
+        compatible guess, or None if the format is not recognized or the base guess disagrees.
         """
-        if charset is None:
+        identified = identify_by_signature(file_stream)
+        if identified is None:
             return None
-        try:
-            return codecs.lookup(charset).name
-        except LookupError:
-            return charset
+        mimetype, extensions = identified
+
+        # Without an extension or mimetype to confirm, the stream is ambiguous
+        if (
+            base_guess.mimetype is None
+            and base_guess.extension is None
+            and self._detection_policy == "when_ambiguous"
+        ):
+            return None
+
+        if base_guess.mimetype is not None and base_guess.mimetype.lower() != mimetype:
+            return None
+
+        if (
+            base_guess.extension is not None
+            and base_guess.extension.lstrip(".").lower() not in extensions
+        ):
+            return None
+
+        return StreamInfo(
+            mimetype=base_guess.mimetype or mimetype,
+            extension=base_guess.extension or "." + extensions[0],
+            charset=base_guess.charset,
+            filename=base_guess.filename,
+            local_path=base_guess.local_path,
+            url=base_guess.url,
+        )
@@ -0,0 +1,58 @@
+from typing import List
+
+
+class MarkdownNormalizer:
+    """
+    Normalizes Markdown as MarkItDown does after every conversion: strips trailing whitespace
+    from each line, and collapses runs of blank lines into one (at the start of the text, two
+    leading blank lines are kept).
+
+    Text is normalized in a single pass over its lines, and can be normalized incrementally:
+    feed() returns the normalized text of the lines completed so far, and finish() the rest.
+    The concatenated output is the same as normalize_markdown() over the concatenated input.
+    """
+
+    def __init__(self):
+        self._partial_line = ""
+        self._blank_lines = 0
+        self._seen_content = False
+
+    def feed(self, text: str) -> str:
+        if self._partial_line:
+            text = self._partial_line + text
+        lines = text.split("\n")
+
+        # The last line may continue in the next chunk
+        self._partial_line = lines.pop()
+
+        normalized = self._normalize_lines(lines)
+        if not normalized:
+            return ""
+        normalized.append("")
+        return "\n".join(normalized)
+
+    def finish(self) -> str:
+        line = self._partial_line.rstrip()
+        self._partial_line = ""
+        return line
+
+    def _normalize_lines(self, lines: List[str]) -> List[str]:
+        normalized: List[str] = []
+        for line in lines:
+            # Also strips the \r of \r\n line endings
+            line = line.rstrip()
+            if line:
+                self._blank_lines = 0
+                self._seen_content = True
+            else:
+                self._blank_lines += 1
+                if self._blank_lines > (1 if self._seen_content else 2):
+                    continue
+            normalized.append(line)
+        return normalized
+
+
+def normalize_markdown(text: str) -> str:
+    """Strip trailing whitespace from each line, and collapse runs of blank lines."""
+    normalizer = MarkdownNormalizer()
+    return normalizer.feed(text) + normalizer.finish()
@@ -0,0 +1,93 @@
+import zipfile
+from typing import BinaryIO, List, Optional, Tuple
+
+# Leading bytes of binary formats that can be identified without running Magika, with the
+# mimetype and extensions Magika would report for them
+_MAGIC_NUMBERS: List[Tuple[bytes, str, List[str]]] = [
+    (b"%PDF-", "application/pdf", ["pdf"]),
+    (b"\xff\xd8\xff", "image/jpeg", ["jpg", "jpeg"]),
+    (b"\x89PNG\r\n\x1a\n", "image/png", ["png"]),
+    (b"GIF87a", "image/gif", ["gif"]),
+    (b"GIF89a", "image/gif", ["gif"]),
+    (b"ID3", "audio/mpeg", ["mp3"]),
+]
+
+_ZIP_SIGNATURES = (b"PK\x03\x04", b"PK\x05\x06")
+
+# EPUB containers store their mimetype, uncompressed, as the first entry of the archive
+_EPUB_MIMETYPE_ENTRY = b"mimetypeapplication/epub+zip"
+
+# Office Open XML packages name the content type of their main part in [Content_Types].xml
+_OOXML_MAIN_PARTS: List[Tuple[bytes, str, List[str]]] = [
+    (
+        b"application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml",
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        ["docx", "docm"],
+    ),
+    (
+        b"application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml",
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        ["xlsx", "xlsm"],
+    ),
+    (
+        b"application/vnd.openxmlformats-officedocument.presentationml.presentation.main+xml",
+        "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+        ["pptx", "pptm"],
+    ),
+]
+
+# Largest [Content_Types].xml that is read to identify an Office Open XML package
+_MAX_CONTENT_TYPES_SIZE = 64 * 1024
+
+
+def identify_by_signature(file_stream: BinaryIO) -> Optional[Tuple[str, List[str]]]:
+    """
+    Identify common binary formats from their magic numbers (and, for ZIP archives, from
+    their directory). Returns the mimetype and extensions (without the leading dot), or None
+    if the format was not recognized. The stream position is left unchanged.
+    """
+    cur_pos = file_stream.tell()
+    try:
+        header = file_stream.read(64)
+
+        for magic, mimetype, extensions in _MAGIC_NUMBERS:
+            if header.startswith(magic):
+                return mimetype, extensions
+
+        if header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+            return "audio/x-wav", ["wav"]
+
+        if header.startswith(_ZIP_SIGNATURES):
+            file_stream.seek(cur_pos)
+            return _identify_zip(file_stream, header)
+
+        return None
+    finally:
+        file_stream.seek(cur_pos)
+
+
+def _identify_zip(
+    file_stream: BinaryIO, header: bytes
+) -> Optional[Tuple[str, List[str]]]:
+    if header[30:58] == _EPUB_MIMETYPE_ENTRY:
+        return "application/epub+zip", ["epub"]
+
+    try:
+        with zipfile.ZipFile(file_stream) as archive:
+            try:
+                info = archive.getinfo("[Content_Types].xml")
+            except KeyError:
+                return "application/zip", ["zip"]
+
+            if info.file_size > _MAX_CONTENT_TYPES_SIZE:
+                return None
+            content_types = archive.read(info)
+    except (zipfile.BadZipFile, OSError, EOFError, ValueError):
+        return None
+
+    for main_part, mimetype, extensions in _OOXML_MAIN_PARTS:
+        if main_part in content_types:
+            return mimetype, extensions
+
+    # Some other package (e.g., a macro-enabled or template variant); let Magika decide
+    return None
@@ -0,0 +1,77 @@
+import io
+import tempfile
+from typing import Any, BinaryIO, Optional
+
+from ._exceptions import InputTooLargeException
+
+# Bytes read from a stream, or requested from an HTTP response, at a time while buffering
+SPOOL_CHUNK_SIZE = 1024 * 1024
+
+# Bytes of a buffered stream held in memory before it is moved to a temporary file
+DEFAULT_SPOOL_MEMORY_LIMIT = 16 * 1024 * 1024
+
+
+class StreamSpool:
+    """
+    Buffers a stream that cannot be converted in place (e.g., stdin, or the body of an HTTP
+    response), so that converters can seek in it. Up to `memory_limit` bytes are held in
+    memory; larger streams are moved to an anonymous temporary file, which is deleted when
+    closed. If `max_size` is given, writing more than that raises InputTooLargeException.
+
+    (tempfile.SpooledTemporaryFile does the same, but it is not an io.IOBase, and is not
+    seekable(), before Python 3.11.)
+    """
+
+    def __init__(
+        self,
+        *,
+        memory_limit: int = DEFAULT_SPOOL_MEMORY_LIMIT,
+        max_size: Optional[int] = None,
+    ):
+        self._memory_limit = memory_limit
+        self._max_size = max_size
+        self._size = 0
+        self._buffer: BinaryIO = io.BytesIO()
+
+    def write(self, chunk: bytes) -> None:
+        self._size += len(chunk)
+        if self._max_size is not None and self._size > self._max_size:
+            raise InputTooLargeException(
+                f"The input is larger than the maximum of {self._max_size} bytes."
+            )
+
+        if self._size > self._memory_limit and isinstance(self._buffer, io.BytesIO):
+            temp_file = tempfile.TemporaryFile()
+            try:
+                temp_file.write(self._buffer.getbuffer())
+            except BaseException:
+                temp_file.close()
+                raise
+            self._buffer.close()
+            self._buffer = temp_file  # type: ignore[assignment]
+
+        self._buffer.write(chunk)
+
+    def check_size(self, size: Optional[int]) -> None:
+        """Fail early if a stream is known (e.g., from a Content-Length header) to be too large."""
+        if size is not None and self._max_size is not None and size > self._max_size:
+            raise InputTooLargeException(
+                f"The input ({size} bytes) is larger than the maximum of {self._max_size} bytes."
+            )
+
+    def close(self) -> None:
+        """Discard the buffered data."""
+        self._buffer.close()
+
+    def getfile(self) -> BinaryIO:
+        """Return the buffered stream, positioned at its start. The caller must close it."""
+        self._buffer.seek(0)
+        return self._buffer
+
+
+def content_length(headers: Any) -> Optional[int]:
+    """Return the Content-Length of an HTTP response, from its (case-insensitive) headers."""
+    try:
+        return int(headers["content-length"])
+    except (KeyError, ValueError):
+        return None
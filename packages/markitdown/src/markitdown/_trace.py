@@ -0,0 +1,81 @@
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+from ._stream_info import StreamInfo
+
+
+@dataclass(kw_only=True)
+class TraceSpan:
+    """The time spent in one stage of a conversion."""
+
+    # "buffer", "cache", "charset", "magika", "accepts", "convert" or "normalize"
+    stage: str
+    seconds: float
+    converter: Optional[str] = None  # For "accepts" and "convert"
+
+    # E.g., "accepted" or "rejected", "ok" or the name of the exception raised, "hit" or "miss"
+    outcome: Optional[str] = None
+
+
+class ConversionTrace:
+    """
+    Where the time of a conversion went, stage by stage. MarkItDown attaches a trace to the
+    result when a conversion is called with `trace=True`.
+
+    Attributes:
+    - spans: The TraceSpans of the conversion, in the order in which the stages ended.
+    - bytes_in: The size of the converted stream.
+    - bytes_out: The size of the Markdown, in UTF-8 encoded bytes.
+    - stream_info: The guess that the successful converter was given.
+    - converter: The name of the successful converter.
+    - cached: Whether the result came from the cache.
+    """
+
+    def __init__(self):
+        self.spans: List[TraceSpan] = []
+        self.bytes_in: Optional[int] = None
+        self.bytes_out: Optional[int] = None
+        self.stream_info: Optional[StreamInfo] = None
+        self.converter: Optional[str] = None
+        self.cached = False
+
+    def add(
+        self,
+        stage: str,
+        seconds: float,
+        *,
+        converter: Optional[str] = None,
+        outcome: Optional[str] = None,
+    ) -> None:
+        self.spans.append(
+            TraceSpan(
+                stage=stage, seconds=seconds, converter=converter, outcome=outcome
+            )
+        )
+
+    @property
+    def seconds(self) -> float:
+        """The total time of the traced stages."""
+        return sum(span.seconds for span in self.spans)
+
+    def stage_seconds(self) -> Dict[str, float]:
+        """The total time of each stage."""
+        totals: Dict[str, float] = {}
+        for span in self.spans:
+            totals[span.stage] = totals.get(span.stage, 0.0) + span.seconds
+        return totals
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the trace as a JSON-serializable dict, e.g., to log and aggregate."""
+        return {
+            "seconds": self.seconds,
+            "stages": self.stage_seconds(),
+            "spans": [asdict(span) for span in self.spans],
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "stream_info": (
+                asdict(self.stream_info) if self.stream_info is not None else None
+            ),
+            "converter": self.converter,
+            "cached": self.cached,
+        }
@@ -25,6 +25,9 @@ class AudioConverter(DocumentConverter):
     Converts audio files to markdown via extraction of metadata (if `exiftool` is installed), and speech transcription (if `speech_recognition` is installed).
     """
 
+    accepted_extensions = ACCEPTED_FILE_EXTENSIONS
+    accepted_mimetype_prefixes = ACCEPTED_MIME_TYPE_PREFIXES
+
     def accepts(
         self,
         file_stream: BinaryIO,
@@ -26,6 +26,9 @@ class BingSerpConverter(DocumentConverter):
     NOTE: It is better to use the Bing API
     """
 
+    accepted_extensions = ACCEPTED_FILE_EXTENSIONS
+    accepted_mimetype_prefixes = ACCEPTED_MIME_TYPE_PREFIXES
+
     def accepts(
         self,
         file_stream: BinaryIO,
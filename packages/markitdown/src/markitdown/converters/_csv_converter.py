@@ -1,9 +1,9 @@
 import csv
 import io
 from typing import BinaryIO, Any
-from charset_normalizer import from_bytes
 from .._base_converter import DocumentConverter, DocumentConverterResult
 from .._stream_info import StreamInfo
+from .._charset import detect_charset
 
 ACCEPTED_MIME_TYPE_PREFIXES = [
     "text/csv",
@@ -17,6 +17,9 @@ class CsvConverter(DocumentConverter):
     Converts CSV files to Markdown tables.
     """
 
+    accepted_extensions = ACCEPTED_FILE_EXTENSIONS
+    accepted_mimetype_prefixes = ACCEPTED_MIME_TYPE_PREFIXES
+
     def __init__(self):
         super().__init__()
 
@@ -45,7 +48,9 @@ class CsvConverter(DocumentConverter):
         if stream_info.charset:
             content = file_stream.read().decode(stream_info.charset)
         else:
-            content = str(from_bytes(file_stream.read()).best())
+            # MarkItDown normally detects the charset up front and passes it in stream_info
+            charset = detect_charset(file_stream) or "utf-8"
+            content = file_stream.read().decode(charset, errors="replace")
 
         # Parse CSV content
         reader = csv.reader(io.StringIO(content))
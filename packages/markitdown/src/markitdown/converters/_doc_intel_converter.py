@@ -159,6 +159,8 @@ class DocumentIntelligenceConverter(DocumentConverter):
 
         super().__init__()
         self._file_types = file_types
+        self.accepted_extensions = _get_file_extensions(file_types)
+        self.accepted_mimetype_prefixes = _get_mime_type_prefixes(file_types)
 
         # Raise an error if the dependencies are not available.
         # This is different than other converters since this one isn't even instantiated
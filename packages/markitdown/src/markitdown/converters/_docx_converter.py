@@ -40,6 +40,9 @@ class DocxConverter(HtmlConverter):
     Converts DOCX files to Markdown. Style information (e.g.m headings) and tables are preserved where possible.
     """
 
+    accepted_extensions = ACCEPTED_FILE_EXTENSIONS
+    accepted_mimetype_prefixes = ACCEPTED_MIME_TYPE_PREFIXES
+
     def __init__(self):
         super().__init__()
         self._html_converter = HtmlConverter()
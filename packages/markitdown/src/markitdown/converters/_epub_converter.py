@@ -3,10 +3,11 @@ import zipfile
 from defusedxml import minidom
 from xml.dom.minidom import Document
 
-from typing import BinaryIO, Any, Dict, List
+from typing import BinaryIO, Any, Dict, Iterator, List, Tuple
 
 from ._html_converter import HtmlConverter
-from .._base_converter import DocumentConverterResult
+from .._base_converter import DocumentConverterResult, join_units, select_units
+from .._deadline import check_deadline
 from .._stream_info import StreamInfo
 
 ACCEPTED_MIME_TYPE_PREFIXES = [
@@ -28,6 +29,9 @@ class EpubConverter(HtmlConverter):
     Converts EPUB files to Markdown. Style information (e.g.m headings) and tables are preserved where possible.
     """
 
+    accepted_extensions = ACCEPTED_FILE_EXTENSIONS
+    accepted_mimetype_prefixes = ACCEPTED_MIME_TYPE_PREFIXES
+
     def __init__(self):
         super().__init__()
         self._html_converter = HtmlConverter()
@@ -57,77 +61,102 @@ class EpubConverter(HtmlConverter):
         **kwargs: Any,  # Options to pass to the converter
     ) -> DocumentConverterResult:
         with zipfile.ZipFile(file_stream, "r") as z:
-            # Extracts metadata (title, authors, language, publisher, date, description, cover) from an EPUB file."""
-
-            # Locate content.opf
-            container_dom = minidom.parse(z.open("META-INF/container.xml"))
-            opf_path = container_dom.getElementsByTagName("rootfile")[0].getAttribute(
-                "full-path"
+            metadata, spine = self._read_package(z)
+            result = join_units(
+                self._convert_package(z, metadata, spine, **kwargs), **kwargs
             )
+            result.title = metadata["title"]
+            return result
 
-            # Parse content.opf
-            opf_dom = minidom.parse(z.open(opf_path))
-            metadata: Dict[str, Any] = {
-                "title": self._get_text_from_node(opf_dom, "dc:title"),
-                "authors": self._get_all_texts_from_nodes(opf_dom, "dc:creator"),
-                "language": self._get_text_from_node(opf_dom, "dc:language"),
-                "publisher": self._get_text_from_node(opf_dom, "dc:publisher"),
-                "date": self._get_text_from_node(opf_dom, "dc:date"),
-                "description": self._get_text_from_node(opf_dom, "dc:description"),
-                "identifier": self._get_text_from_node(opf_dom, "dc:identifier"),
-            }
-
-            # Extract manifest items (ID → href mapping)
-            manifest = {
-                item.getAttribute("id"): item.getAttribute("href")
-                for item in opf_dom.getElementsByTagName("item")
-            }
-
-            # Extract spine order (ID refs)
-            spine_items = opf_dom.getElementsByTagName("itemref")
-            spine_order = [item.getAttribute("idref") for item in spine_items]
-
-            # Convert spine order to actual file paths
-            base_path = "/".join(
-                opf_path.split("/")[:-1]
-            )  # Get base directory of content.opf
-            spine = [
-                f"{base_path}/{manifest[item_id]}" if base_path else manifest[item_id]
-                for item_id in spine_order
-                if item_id in manifest
-            ]
-
-            # Extract and convert the content
-            markdown_content: List[str] = []
-            for file in spine:
-                if file in z.namelist():
-                    with z.open(file) as f:
-                        filename = os.path.basename(file)
-                        extension = os.path.splitext(filename)[1].lower()
-                        mimetype = MIME_TYPE_MAPPING.get(extension)
-                        converted_content = self._html_converter.convert(
-                            f,
-                            StreamInfo(
-                                mimetype=mimetype,
-                                extension=extension,
-                                filename=filename,
-                            ),
-                        )
-                        markdown_content.append(converted_content.markdown.strip())
-
-            # Format and add the metadata
-            metadata_markdown = []
-            for key, value in metadata.items():
-                if isinstance(value, list):
-                    value = ", ".join(value)
-                if value:
-                    metadata_markdown.append(f"**{key.capitalize()}:** {value}")
-
-            markdown_content.insert(0, "\n".join(metadata_markdown))
-
-            return DocumentConverterResult(
-                markdown="\n\n".join(markdown_content), title=metadata["title"]
-            )
+    def convert_iter(
+        self,
+        file_stream: BinaryIO,
+        stream_info: StreamInfo,
+        **kwargs: Any,  # Options to pass to the converter
+    ) -> Iterator[str]:
+        with zipfile.ZipFile(file_stream, "r") as z:
+            metadata, spine = self._read_package(z)
+            yield from self._convert_package(z, metadata, spine, **kwargs)
+
+    def _read_package(self, z: zipfile.ZipFile) -> Tuple[Dict[str, Any], List[str]]:
+        # Extracts metadata (title, authors, language, publisher, date, description, cover) from an EPUB file."""
+
+        # Locate content.opf
+        container_dom = minidom.parse(z.open("META-INF/container.xml"))
+        opf_path = container_dom.getElementsByTagName("rootfile")[0].getAttribute(
+            "full-path"
+        )
+
+        # Parse content.opf
+        opf_dom = minidom.parse(z.open(opf_path))
+        metadata: Dict[str, Any] = {
+            "title": self._get_text_from_node(opf_dom, "dc:title"),
+            "authors": self._get_all_texts_from_nodes(opf_dom, "dc:creator"),
+            "language": self._get_text_from_node(opf_dom, "dc:language"),
+            "publisher": self._get_text_from_node(opf_dom, "dc:publisher"),
+            "date": self._get_text_from_node(opf_dom, "dc:date"),
+            "description": self._get_text_from_node(opf_dom, "dc:description"),
+            "identifier": self._get_text_from_node(opf_dom, "dc:identifier"),
+        }
+
+        # Extract manifest items (ID → href mapping)
+        manifest = {
+            item.getAttribute("id"): item.getAttribute("href")
+            for item in opf_dom.getElementsByTagName("item")
+        }
+
+        # Extract spine order (ID refs)
+        spine_items = opf_dom.getElementsByTagName("itemref")
+        spine_order = [item.getAttribute("idref") for item in spine_items]
+
+        # Convert spine order to actual file paths
+        base_path = "/".join(
+            opf_path.split("/")[:-1]
+        )  # Get base directory of content.opf
+        spine = [
+            f"{base_path}/{manifest[item_id]}" if base_path else manifest[item_id]
+            for item_id in spine_order
+            if item_id in manifest
+        ]
+
+        return metadata, spine
+
+    def _convert_package(
+        self,
+        z: zipfile.ZipFile,
+        metadata: Dict[str, Any],
+        spine: List[str],
+        **kwargs: Any,  # Options to pass to the converter
+    ) -> Iterator[str]:
+        """Yields the formatted metadata, then the Markdown of each content file."""
+        # Format and add the metadata
+        metadata_markdown = []
+        for key, value in metadata.items():
+            if isinstance(value, list):
+                value = ", ".join(value)
+            if value:
+                metadata_markdown.append(f"**{key.capitalize()}:** {value}")
+
+        yield "\n".join(metadata_markdown)
+
+        # Extract and convert the content, one file at a time
+        names = set(z.namelist())
+        content_files = [file for file in spine if file in names]
+        for _, file in select_units(content_files, **kwargs):
+            check_deadline(**kwargs)
+            with z.open(file) as f:
+                filename = os.path.basename(file)
+                extension = os.path.splitext(filename)[1].lower()
+                mimetype = MIME_TYPE_MAPPING.get(extension)
+                converted_content = self._html_converter.convert(
+                    f,
+                    StreamInfo(
+                        mimetype=mimetype,
+                        extension=extension,
+                        filename=filename,
+                    ),
+                )
+                yield converted_content.markdown.strip()
 
     def _get_text_from_node(self, dom: Document, tag_name: str) -> str | None:
         """Convenience function to extract a single occurrence of a tag (e.g., title)."""
@@ -1,7 +1,11 @@
 from typing import BinaryIO, Any
 import json
 
-from .._base_converter import DocumentConverter, DocumentConverterResult
+from .._base_converter import (
+    DocumentConverter,
+    DocumentConverterResult,
+    read_stream_header,
+)
 from .._exceptions import FileConversionException
 from .._stream_info import StreamInfo
 
@@ -11,10 +15,17 @@ CANDIDATE_MIME_TYPE_PREFIXES = [
 
 ACCEPTED_FILE_EXTENSIONS = [".ipynb"]
 
+# Top-level keys of a notebook, one of which appears near the start of the document
+# (nbformat writes its keys in sorted order)
+NOTEBOOK_KEYS = ['"cells"', '"nbformat"']
+
 
 class IpynbConverter(DocumentConverter):
     """Converts Jupyter Notebook (.ipynb) files to Markdown."""
 
+    accepted_extensions = ACCEPTED_FILE_EXTENSIONS
+    accepted_mimetype_prefixes = CANDIDATE_MIME_TYPE_PREFIXES
+
     def accepts(
         self,
         file_stream: BinaryIO,
@@ -29,17 +40,18 @@ class IpynbConverter(DocumentConverter):
 
         for prefix in CANDIDATE_MIME_TYPE_PREFIXES:
             if mimetype.startswith(prefix):
-                # Read further to see if it's a notebook
-                cur_pos = file_stream.tell()
+                # Sniff the header to see if it's a notebook. convert() checks the
+                # nbformat key, which usually comes last.
+                encoding = stream_info.charset or "utf-8"
                 try:
-                    encoding = stream_info.charset or "utf-8"
-                    notebook_content = file_stream.read().decode(encoding)
-                    return (
-                        "nbformat" in notebook_content
-                        and "nbformat_minor" in notebook_content
+                    header = read_stream_header(file_stream, **kwargs).decode(
+                        encoding, errors="ignore"
                     )
-                finally:
-                    file_stream.seek(cur_pos)
+                except LookupError:
+                    return False
+                return header.lstrip("\ufeff \t\r\n").startswith("{") and any(
+                    key in header for key in NOTEBOOK_KEYS
+                )
 
         return False
 
@@ -51,8 +63,12 @@ class IpynbConverter(DocumentConverter):
     ) -> DocumentConverterResult:
         # Parse and convert the notebook
         encoding = stream_info.charset or "utf-8"
-        notebook_content = file_stream.read().decode(encoding=encoding)
-        return self._convert(json.loads(notebook_content))
+        notebook_content = json.loads(file_stream.read().decode(encoding=encoding))
+        if not isinstance(notebook_content, dict) or "nbformat" not in notebook_content:
+            raise FileConversionException(
+                "The JSON document is not a Jupyter notebook."
+            )
+        return self._convert(notebook_content)
 
     def _convert(self, notebook_content: dict) -> DocumentConverterResult:
         """Helper function that converts notebook JSON content to Markdown."""
@@ -1,7 +1,11 @@
 import sys
 from typing import Any, Union, BinaryIO
 from .._stream_info import StreamInfo
-from .._base_converter import DocumentConverter, DocumentConverterResult
+from .._base_converter import (
+    DocumentConverter,
+    DocumentConverterResult,
+    read_stream_header,
+)
 from .._exceptions import MissingDependencyException, MISSING_DEPENDENCY_MESSAGE
 
 # Try loading optional (but in this case, required) dependencies
@@ -20,6 +24,9 @@ ACCEPTED_MIME_TYPE_PREFIXES = [
 
 ACCEPTED_FILE_EXTENSIONS = [".msg"]
 
+# Outlook messages are OLE compound files
+OLE_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
 
 class OutlookMsgConverter(DocumentConverter):
     """Converts Outlook .msg files to markdown by extracting email metadata and content.
@@ -29,6 +36,10 @@ class OutlookMsgConverter(DocumentConverter):
     - Email body content
     """
 
+    accepted_extensions = ACCEPTED_FILE_EXTENSIONS
+    accepted_mimetype_prefixes = ACCEPTED_MIME_TYPE_PREFIXES
+    signatures = [OLE_SIGNATURE]
+
     def accepts(
         self,
         file_stream: BinaryIO,
@@ -47,14 +58,11 @@ class OutlookMsgConverter(DocumentConverter):
                 return True
 
         # Brute force, check if we have an OLE file
-        cur_pos = file_stream.tell()
-        try:
-            if olefile and not olefile.isOleFile(file_stream):
-                return False
-        finally:
-            file_stream.seek(cur_pos)
+        if not read_stream_header(file_stream, **kwargs).startswith(OLE_SIGNATURE):
+            return False
 
         # Brue force, check if it's an Outlook file
+        cur_pos = file_stream.tell()
         try:
             if olefile is not None:
                 msg = olefile.OleFileIO(file_stream)
@@ -1,10 +1,11 @@
 import sys
 import io
 
-from typing import BinaryIO, Any
+from typing import BinaryIO, Any, Iterator, Optional, Set, Tuple
 
 
-from .._base_converter import DocumentConverter, DocumentConverterResult
+from .._base_converter import DocumentConverter, DocumentConverterResult, join_units
+from .._deadline import check_deadline
 from .._stream_info import StreamInfo
 from .._exceptions import MissingDependencyException, MISSING_DEPENDENCY_MESSAGE
 
@@ -14,7 +15,10 @@ from .._exceptions import MissingDependencyException, MISSING_DEPENDENCY_MESSAGE
 _dependency_exc_info = None
 try:
     import pdfminer
-    import pdfminer.high_level
+    import pdfminer.converter
+    import pdfminer.layout
+    import pdfminer.pdfinterp
+    import pdfminer.pdfpage
 except ImportError:
     # Preserve the error and stack trace for later
     _dependency_exc_info = sys.exc_info()
@@ -28,11 +32,31 @@ ACCEPTED_MIME_TYPE_PREFIXES = [
 ACCEPTED_FILE_EXTENSIONS = [".pdf"]
 
 
+def _page_selection(**kwargs: Any) -> Tuple[Optional[Set[int]], int]:
+    """
+    Translate the `pages` and `max_units` options (see select_units) to pdfminer's page
+    numbers (counted from 0) and maxpages (0: no limit), so that pdfminer stops parsing
+    after the last selected page.
+    """
+    pages = kwargs.get("pages")
+    max_units = kwargs.get("max_units")
+    if pages is None:
+        return None, max_units or 0
+
+    selected = sorted(pages)
+    if max_units is not None:
+        selected = selected[:max_units]
+    return {page - 1 for page in selected}, selected[-1]
+
+
 class PdfConverter(DocumentConverter):
     """
     Converts PDFs to Markdown. Most style information is ignored, so the results are essentially plain-text.
     """
 
+    accepted_extensions = ACCEPTED_FILE_EXTENSIONS
+    accepted_mimetype_prefixes = ACCEPTED_MIME_TYPE_PREFIXES
+
     def accepts(
         self,
         file_stream: BinaryIO,
@@ -57,6 +81,20 @@ class PdfConverter(DocumentConverter):
         stream_info: StreamInfo,
         **kwargs: Any,  # Options to pass to the converter
     ) -> DocumentConverterResult:
+        # The pages are concatenated as they are, so the text is the same as that of
+        # pdfminer.high_level.extract_text(): each page ends with a form feed
+        return join_units(
+            self.convert_iter(file_stream, stream_info, **kwargs),
+            separator="",
+            **kwargs,
+        )
+
+    def convert_iter(
+        self,
+        file_stream: BinaryIO,
+        stream_info: StreamInfo,
+        **kwargs: Any,  # Options to pass to the converter
+    ) -> Iterator[str]:
         # Check the dependencies
         if _dependency_exc_info is not None:
             raise MissingDependencyException(
@@ -72,6 +110,26 @@ class PdfConverter(DocumentConverter):
             )
 
         assert isinstance(file_stream, io.IOBase)  # for mypy
-        return DocumentConverterResult(
-            markdown=pdfminer.high_level.extract_text(file_stream),
-        )
+
+        # Extract the text as pdfminer.high_level.extract_text() does, page by page
+        page_numbers, max_pages = _page_selection(**kwargs)
+        resource_manager = pdfminer.pdfinterp.PDFResourceManager()
+        with io.StringIO() as output:
+            device = pdfminer.converter.TextConverter(
+                resource_manager, output, laparams=pdfminer.layout.LAParams()
+            )
+            interpreter = pdfminer.pdfinterp.PDFPageInterpreter(
+                resource_manager, device
+            )
+            for page in pdfminer.pdfpage.PDFPage.get_pages(
+                file_stream, pagenos=page_numbers, maxpages=max_pages
+            ):
+                check_deadline(**kwargs)
+                interpreter.process_page(page)
+
+                # The page's text as pdfminer writes it, ending with a form feed. Leading
+                # indentation is kept; MarkItDown.convert_iter() normalizes the whitespace
+                # around each unit.
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
@@ -1,18 +1,7 @@
-import sys
-
 from typing import BinaryIO, Any
-from charset_normalizer import from_bytes
 from .._base_converter import DocumentConverter, DocumentConverterResult
 from .._stream_info import StreamInfo
-
-# Try loading optional (but in this case, required) dependencies
-# Save reporting of any exceptions for later
-_dependency_exc_info = None
-try:
-    import mammoth  # noqa: F401
-except ImportError:
-    # Preserve the error and stack trace for later
-    _dependency_exc_info = sys.exc_info()
+from .._charset import detect_charset
 
 ACCEPTED_MIME_TYPE_PREFIXES = [
     "text/",
@@ -66,6 +55,8 @@ class PlainTextConverter(DocumentConverter):
         if stream_info.charset:
             text_content = file_stream.read().decode(stream_info.charset)
         else:
-            text_content = str(from_bytes(file_stream.read()).best())
+            # MarkItDown normally detects the charset up front and passes it in stream_info
+            charset = detect_charset(file_stream) or "utf-8"
+            text_content = file_stream.read().decode(charset, errors="replace")
 
         return DocumentConverterResult(markdown=text_content)
@@ -5,12 +5,18 @@ import io
 import re
 import html
 
-from typing import BinaryIO, Any
+from typing import BinaryIO, Any, Iterator
 from operator import attrgetter
 
 from ._html_converter import HtmlConverter
 from ._llm_caption import llm_caption
-from .._base_converter import DocumentConverter, DocumentConverterResult
+from .._base_converter import (
+    DocumentConverter,
+    DocumentConverterResult,
+    join_units,
+    select_units,
+)
+from .._deadline import check_deadline
 from .._stream_info import StreamInfo
 from .._exceptions import MissingDependencyException, MISSING_DEPENDENCY_MESSAGE
 
@@ -36,6 +42,9 @@ class PptxConverter(DocumentConverter):
     Converts PPTX files to Markdown. Supports heading, tables and images with alt text.
     """
 
+    accepted_extensions = ACCEPTED_FILE_EXTENSIONS
+    accepted_mimetype_prefixes = ACCEPTED_MIME_TYPE_PREFIXES
+
     def __init__(self):
         super().__init__()
         self._html_converter = HtmlConverter()
@@ -64,6 +73,16 @@ class PptxConverter(DocumentConverter):
         stream_info: StreamInfo,
         **kwargs: Any,  # Options to pass to the converter
     ) -> DocumentConverterResult:
+        return join_units(
+            self.convert_iter(file_stream, stream_info, **kwargs), **kwargs
+        )
+
+    def convert_iter(
+        self,
+        file_stream: BinaryIO,
+        stream_info: StreamInfo,
+        **kwargs: Any,  # Options to pass to the converter
+    ) -> Iterator[str]:
         # Check the dependencies
         if _dependency_exc_info is not None:
             raise MissingDependencyException(
@@ -80,12 +99,10 @@ class PptxConverter(DocumentConverter):
 
         # Perform the conversion
         presentation = pptx.Presentation(file_stream)
-        md_content = ""
-        slide_num = 0
-        for slide in presentation.slides:
-            slide_num += 1
+        for slide_num, slide in select_units(presentation.slides, **kwargs):
+            check_deadline(**kwargs)
 
-            md_content += f"\n\n<!-- Slide number: {slide_num} -->\n"
+            md_content = f"<!-- Slide number: {slide_num} -->\n"
 
             title = slide.shapes.title
 
@@ -197,7 +214,7 @@ class PptxConverter(DocumentConverter):
                     md_content += notes_frame.text
                 md_content = md_content.strip()
 
-        return DocumentConverterResult(markdown=md_content.strip())
+            yield md_content
 
     def _is_picture(self, shape):
         if shape.shape_type == pptx.enum.shapes.MSO_SHAPE_TYPE.PICTURE:
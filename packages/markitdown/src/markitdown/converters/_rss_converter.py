@@ -1,3 +1,5 @@
+import codecs
+import re
 from defusedxml import minidom
 from xml.dom.minidom import Document, Element
 from typing import BinaryIO, Any, Union
@@ -5,7 +7,11 @@ from bs4 import BeautifulSoup
 
 from ._markdownify import _CustomMarkdownify
 from .._stream_info import StreamInfo
-from .._base_converter import DocumentConverter, DocumentConverterResult
+from .._base_converter import (
+    DocumentConverter,
+    DocumentConverterResult,
+    read_stream_header,
+)
 
 PRECISE_MIME_TYPE_PREFIXES = [
     "application/rss",
@@ -25,10 +31,22 @@ CANDIDATE_FILE_EXTENSIONS = [
     ".xml",
 ]
 
+# The root element of an RSS or Atom feed, after any XML declaration, processing
+# instructions, comments and doctype
+FEED_ROOT_RE = re.compile(
+    r"^\ufeff?\s*(?:(?:<\?.*?\?>|<!--.*?-->|<!DOCTYPE[^>]*>)\s*)*<(rss|feed)[\s/>]",
+    re.DOTALL,
+)
+
 
 class RssConverter(DocumentConverter):
     """Convert RSS / Atom type to markdown"""
 
+    accepted_extensions = PRECISE_FILE_EXTENSIONS + CANDIDATE_FILE_EXTENSIONS
+    accepted_mimetype_prefixes = (
+        PRECISE_MIME_TYPE_PREFIXES + CANDIDATE_MIME_TYPE_PREFIXES
+    )
+
     def __init__(self):
         super().__init__()
         self._kwargs = {}
@@ -52,24 +70,29 @@ class RssConverter(DocumentConverter):
 
         # Check for precise mimetypes and file extensions
         if extension in CANDIDATE_FILE_EXTENSIONS:
-            return self._check_xml(file_stream)
+            return self._check_xml(file_stream, stream_info, **kwargs)
 
         for prefix in CANDIDATE_MIME_TYPE_PREFIXES:
             if mimetype.startswith(prefix):
-                return self._check_xml(file_stream)
+                return self._check_xml(file_stream, stream_info, **kwargs)
 
         return False
 
-    def _check_xml(self, file_stream: BinaryIO) -> bool:
-        cur_pos = file_stream.tell()
+    def _check_xml(
+        self, file_stream: BinaryIO, stream_info: StreamInfo, **kwargs: Any
+    ) -> bool:
+        # Only look at the root element, rather than parsing the whole document. convert()
+        # still verifies the feed, so other converters get their turn if this guess is wrong.
+        header = read_stream_header(file_stream, **kwargs)
+        if header[:2] in (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE):
+            encoding = "utf-16"
+        else:
+            encoding = stream_info.charset or "utf-8"
         try:
-            doc = minidom.parse(file_stream)
-            return self._feed_type(doc) is not None
-        except BaseException as _:
-            pass
-        finally:
-            file_stream.seek(cur_pos)
-        return False
+            text = header.decode(encoding, errors="ignore")
+        except LookupError:
+            return False
+        return FEED_ROOT_RE.match(text) is not None
 
     def _feed_type(self, doc: Any) -> str | None:
         if doc.getElementsByTagName("rss"):
@@ -1,7 +1,13 @@
 import sys
-from typing import BinaryIO, Any
+from typing import BinaryIO, Any, Iterator
 from ._html_converter import HtmlConverter
-from .._base_converter import DocumentConverter, DocumentConverterResult
+from .._base_converter import (
+    DocumentConverter,
+    DocumentConverterResult,
+    join_units,
+    select_units,
+)
+from .._deadline import check_deadline
 from .._exceptions import MissingDependencyException, MISSING_DEPENDENCY_MESSAGE
 from .._stream_info import StreamInfo
 
@@ -38,6 +44,9 @@ class XlsxConverter(DocumentConverter):
     Converts XLSX files to Markdown, with each sheet presented as a separate Markdown table.
     """
 
+    accepted_extensions = ACCEPTED_XLSX_FILE_EXTENSIONS
+    accepted_mimetype_prefixes = ACCEPTED_XLSX_MIME_TYPE_PREFIXES
+
     def __init__(self):
         super().__init__()
         self._html_converter = HtmlConverter()
@@ -66,6 +75,16 @@ class XlsxConverter(DocumentConverter):
         stream_info: StreamInfo,
         **kwargs: Any,  # Options to pass to the converter
     ) -> DocumentConverterResult:
+        return join_units(
+            self.convert_iter(file_stream, stream_info, **kwargs), **kwargs
+        )
+
+    def convert_iter(
+        self,
+        file_stream: BinaryIO,
+        stream_info: StreamInfo,
+        **kwargs: Any,  # Options to pass to the converter
+    ) -> Iterator[str]:
         # Check the dependencies
         if _xlsx_dependency_exc_info is not None:
             raise MissingDependencyException(
@@ -80,19 +99,14 @@ class XlsxConverter(DocumentConverter):
                 _xlsx_dependency_exc_info[2]
             )
 
-        sheets = pd.read_excel(file_stream, sheet_name=None, engine="openpyxl")
-        md_content = ""
-        for s in sheets:
-            md_content += f"## {s}\n"
-            html_content = sheets[s].to_html(index=False)
-            md_content += (
-                self._html_converter.convert_string(
+        # Read one sheet at a time, rather than all of them at once
+        with pd.ExcelFile(file_stream, engine="openpyxl") as workbook:
+            for _, s in select_units(workbook.sheet_names, **kwargs):
+                check_deadline(**kwargs)
+                html_content = workbook.parse(s).to_html(index=False)
+                yield f"## {s}\n" + self._html_converter.convert_string(
                     html_content, **kwargs
                 ).markdown.strip()
-                + "\n\n"
-            )
-
-        return DocumentConverterResult(markdown=md_content.strip())
 
 
 class XlsConverter(DocumentConverter):
@@ -100,6 +114,9 @@ class XlsConverter(DocumentConverter):
     Converts XLS files to Markdown, with each sheet presented as a separate Markdown table.
     """
 
+    accepted_extensions = ACCEPTED_XLS_FILE_EXTENSIONS
+    accepted_mimetype_prefixes = ACCEPTED_XLS_MIME_TYPE_PREFIXES
+
     def __init__(self):
         super().__init__()
         self._html_converter = HtmlConverter()
@@ -128,6 +145,16 @@ class XlsConverter(DocumentConverter):
         stream_info: StreamInfo,
         **kwargs: Any,  # Options to pass to the converter
     ) -> DocumentConverterResult:
+        return join_units(
+            self.convert_iter(file_stream, stream_info, **kwargs), **kwargs
+        )
+
+    def convert_iter(
+        self,
+        file_stream: BinaryIO,
+        stream_info: StreamInfo,
+        **kwargs: Any,  # Options to pass to the converter
+    ) -> Iterator[str]:
         # Load the dependencies
         if _xls_dependency_exc_info is not None:
             raise MissingDependencyException(
@@ -142,16 +169,11 @@ class XlsConverter(DocumentConverter):
                 _xls_dependency_exc_info[2]
             )
 
-        sheets = pd.read_excel(file_stream, sheet_name=None, engine="xlrd")
-        md_content = ""
-        for s in sheets:
-            md_content += f"## {s}\n"
-            html_content = sheets[s].to_html(index=False)
-            md_content += (
-                self._html_converter.convert_string(
+        # Read one sheet at a time, rather than all of them at once
+        with pd.ExcelFile(file_stream, engine="xlrd") as workbook:
+            for _, s in select_units(workbook.sheet_names, **kwargs):
+                check_deadline(**kwargs)
+                html_content = workbook.parse(s).to_html(index=False)
+                yield f"## {s}\n" + self._html_converter.convert_string(
                     html_content, **kwargs
                 ).markdown.strip()
-                + "\n\n"
-            )
-
-        return DocumentConverterResult(markdown=md_content.strip())
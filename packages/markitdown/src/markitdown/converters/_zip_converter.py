@@ -2,9 +2,15 @@ import zipfile
 import io
 import os
 
-from typing import BinaryIO, Any, TYPE_CHECKING
-
-from .._base_converter import DocumentConverter, DocumentConverterResult
+from typing import BinaryIO, Any, Iterator, TYPE_CHECKING
+
+from .._base_converter import (
+    DocumentConverter,
+    DocumentConverterResult,
+    join_units,
+    select_units,
+)
+from .._deadline import check_deadline
 from .._stream_info import StreamInfo
 from .._exceptions import UnsupportedFormatException, FileConversionException
 
@@ -58,6 +64,9 @@ class ZipConverter(DocumentConverter):
     - Cleans up temporary files after processing
     """
 
+    accepted_extensions = ACCEPTED_FILE_EXTENSIONS
+    accepted_mimetype_prefixes = ACCEPTED_MIME_TYPE_PREFIXES
+
     def __init__(
         self,
         *,
@@ -90,27 +99,78 @@ class ZipConverter(DocumentConverter):
         stream_info: StreamInfo,
         **kwargs: Any,  # Options to pass to the converter
     ) -> DocumentConverterResult:
-        file_path = stream_info.url or stream_info.local_path or stream_info.filename
-        md_content = f"Content from the zip file `{file_path}`:\n\n"
+        # Each file is converted whole, so that its own converter joins its units (e.g.,
+        # the form feeds between PDF pages)
+        return join_units(
+            self._convert_units(file_stream, stream_info, stream=False, **kwargs),
+            **kwargs,
+        )
+
+    def convert_iter(
+        self,
+        file_stream: BinaryIO,
+        stream_info: StreamInfo,
+        **kwargs: Any,  # Options to pass to the converter
+    ) -> Iterator[str]:
+        return self._convert_units(file_stream, stream_info, stream=True, **kwargs)
 
+    def _convert_units(
+        self,
+        file_stream: BinaryIO,
+        stream_info: StreamInfo,
+        *,
+        stream: bool,
+        **kwargs: Any,  # Options to pass to the converter
+    ) -> Iterator[str]:
+        # Open the archive before yielding anything, so that a file that is not a valid
+        # ZIP archive fails before any output, and another converter can be tried
         with zipfile.ZipFile(file_stream, "r") as zipObj:
-            for name in zipObj.namelist():
+            file_path = (
+                stream_info.url or stream_info.local_path or stream_info.filename
+            )
+            yield f"Content from the zip file `{file_path}`:"
+
+            for _, name in select_units(zipObj.namelist(), **kwargs):
+                check_deadline(**kwargs)
+                z_file_stream = io.BytesIO(zipObj.read(name))
+                z_file_stream_info = StreamInfo(
+                    extension=os.path.splitext(name)[1],
+                    filename=os.path.basename(name),
+                )
+
+                # Files that cannot be converted are skipped. Nested conversions share
+                # the deadline, and raise when it expires (see join_units).
+                if not stream:
+                    try:
+                        result = self._markitdown.convert_stream(
+                            z_file_stream,
+                            stream_info=z_file_stream_info,
+                            deadline=kwargs.get("deadline"),
+                        )
+                    except (UnsupportedFormatException, FileConversionException):
+                        continue
+
+                    yield f"## File: {name}"
+                    if result.markdown:
+                        yield result.markdown
+                    continue
+
+                # Start converting the file before writing its heading, so that files
+                # that cannot be converted are skipped
+                units = self._markitdown.convert_iter(
+                    z_file_stream,
+                    stream_info=z_file_stream_info,
+                    deadline=kwargs.get("deadline"),
+                )
                 try:
-                    z_file_stream = io.BytesIO(zipObj.read(name))
-                    z_file_stream_info = StreamInfo(
-                        extension=os.path.splitext(name)[1],
-                        filename=os.path.basename(name),
-                    )
-                    result = self._markitdown.convert_stream(
-                        stream=z_file_stream,
-                        stream_info=z_file_stream_info,
-                    )
-                    if result is not None:
-                        md_content += f"## File: {name}\n\n"
-                        md_content += result.markdown + "\n\n"
-                except UnsupportedFormatException:
-                    pass
-                except FileConversionException:
-                    pass
-
-        return DocumentConverterResult(markdown=md_content.strip())
+                    first_unit = next(units, None)
+                except (UnsupportedFormatException, FileConversionException):
+                    continue
+
+                yield f"## File: {name}"
+                if first_unit is not None:
+                    yield first_unit
+
+                # Nested documents are streamed too (e.g., a PDF, page by page). Once
+                # their heading is written, a failure partway through is raised.
+                yield from units
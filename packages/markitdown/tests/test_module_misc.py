@@ -3,16 +3,33 @@ import io
 import os
 import re
 import shutil
+import tempfile
+import zipfile
 import pytest
 from unittest.mock import MagicMock
 
 from markitdown._uri_utils import parse_data_uri, file_uri_to_path
+from markitdown._spool import StreamSpool
 
 from markitdown import (
     MarkItDown,
     UnsupportedFormatException,
     FileConversionException,
     StreamInfo,
+    DocumentConverter,
+    DocumentConverterResult,
+    configure_magika,
+    LazyConverter,
+    InputTooLargeException,
+    MarkdownNormalizer,
+    MemoryCache,
+    DiskCache,
+    SQLiteCache,
+    ConversionTrace,
+    Deadline,
+    ConversionTimeoutException,
+    check_deadline,
+    join_units,
 )
 
 # This file contains module tests that are not directly tested by the FileTestVectors.
@@ -341,6 +358,806 @@ def test_exceptions() -> None:
     assert type(exc_info.value.attempts[0].converter).__name__ == "PptxConverter"
 
 
+def test_builtin_converters_subset() -> None:
+    # Only the requested built-ins are registered
+    markitdown = MarkItDown(builtin_converters=["PlainTextConverter", "CsvConverter"])
+    assert sorted(
+        type(r.converter.converter).__name__ for r in markitdown._converters
+    ) == [
+        "CsvConverter",
+        "PlainTextConverter",
+    ]
+
+    result = markitdown.convert(os.path.join(TEST_FILES_DIR, "test.json"))
+    assert "5b64c88c-b3c3-4510-bcb8-da0b200602d8" in result.markdown
+
+    # Formats without a registered converter are unsupported
+    with pytest.raises(UnsupportedFormatException):
+        markitdown.convert(os.path.join(TEST_FILES_DIR, "test.docx"))
+
+    with pytest.raises(ValueError):
+        MarkItDown(builtin_converters=["NoSuchConverter"])
+
+
+def test_lazy_builtin_converters() -> None:
+    # The declared streams match what each converter accepts
+    for registration in MarkItDown()._converters:
+        lazy_converter = registration.converter
+        assert isinstance(lazy_converter, LazyConverter)
+        converter = lazy_converter.converter
+        assert lazy_converter.accepted_extensions == converter.accepted_extensions
+        assert (
+            lazy_converter.accepted_mimetype_prefixes
+            == converter.accepted_mimetype_prefixes
+        )
+        assert lazy_converter.signatures == converter.signatures
+
+    # Converters are only loaded when a stream they declare is converted
+    markitdown = MarkItDown()
+    markitdown.convert(os.path.join(TEST_FILES_DIR, "test.json"))
+    loaded = sorted(
+        type(r.converter.loaded_converter).__name__
+        for r in markitdown._converters
+        if r.converter.loaded_converter is not None
+    )
+    assert loaded == ["IpynbConverter", "PlainTextConverter"]
+
+    # Undeclared streams are rejected without loading the converter
+    pdf_converter = LazyConverter(
+        "markitdown.converters:PdfConverter", accepted_extensions=[".pdf"]
+    )
+    assert not pdf_converter.accepts(io.BytesIO(b"data"), StreamInfo(extension=".txt"))
+    assert pdf_converter.loaded_converter is None
+    assert pdf_converter.accepts(io.BytesIO(b"data"), StreamInfo(extension=".PDF"))
+    assert type(pdf_converter.loaded_converter).__name__ == "PdfConverter"
+
+
+def test_converter_dispatch_index() -> None:
+    class FooConverter(DocumentConverter):
+        accepted_extensions = [".foo"]
+
+        def __init__(self):
+            self.calls = 0
+
+        def accepts(self, file_stream, stream_info, **kwargs):
+            self.calls += 1
+            return True
+
+        def convert(self, file_stream, stream_info, **kwargs):
+            return DocumentConverterResult(markdown="foo")
+
+    markitdown = MarkItDown(builtin_converters=["PlainTextConverter"])
+    foo_converter = FooConverter()
+    markitdown.register_converter(foo_converter)
+
+    # Converters that declare their extensions are not consulted for other types
+    result = markitdown.convert_stream(io.BytesIO(b"hello"), file_extension=".txt")
+    assert result.markdown == "hello"
+    assert foo_converter.calls == 0
+
+    result = markitdown.convert_stream(io.BytesIO(b"hello"), file_extension=".FOO")
+    assert result.markdown == "foo"
+    assert foo_converter.calls == 1
+
+    # Registering a converter rebuilds the index
+    other_converter = FooConverter()
+    markitdown.register_converter(other_converter)
+    markitdown.convert_stream(io.BytesIO(b"hello"), file_extension=".foo")
+    assert other_converter.calls == 1
+
+    # Converters are also consulted for streams that start with their signatures
+    signed_converter = FooConverter()
+    signed_converter.signatures = [b"FOO1"]
+    markitdown.register_converter(signed_converter)
+    result = markitdown.convert_stream(io.BytesIO(b"FOO1 data"), file_extension=".txt")
+    assert result.markdown == "foo"
+    assert signed_converter.calls == 1
+
+
+def test_shared_magika() -> None:
+    from markitdown._magika import get_magika
+
+    # The detector is loaded once and shared by all instances
+    MarkItDown().convert_stream(io.BytesIO(b"Hello, world!"))
+    detector = get_magika()
+    MarkItDown().convert_stream(io.BytesIO(b"Hello again!"))
+    assert get_magika() is detector
+
+    with pytest.raises(ValueError):
+        configure_magika(intra_op_threads=0)
+
+    # Changing the settings reloads the detector
+    configure_magika(intra_op_threads=1)
+    try:
+        assert get_magika() is not detector
+        result = MarkItDown().convert_stream(
+            io.BytesIO(b'{"key": "value"}'), file_extension=".json"
+        )
+        assert "value" in result.markdown
+    finally:
+        configure_magika(intra_op_threads=None)
+
+
+def test_detection_policy() -> None:
+    pdf_path = os.path.join(TEST_FILES_DIR, "test.pdf")
+    with open(pdf_path, "rb") as fh:
+        pdf_bytes = fh.read()
+
+    # A magic number that agrees with the extension skips Magika
+    markitdown = MarkItDown()
+    guesses = markitdown._get_stream_info_guesses(
+        io.BytesIO(pdf_bytes), StreamInfo(extension=".pdf")
+    )
+    assert guesses == [StreamInfo(mimetype="application/pdf", extension=".pdf")]
+    assert markitdown.detection_counts["signature"] == 1
+
+    # Disagreements and unknown formats are ambiguous
+    markitdown._get_stream_info_guesses(
+        io.BytesIO(pdf_bytes), StreamInfo(extension=".docx")
+    )
+    markitdown._get_stream_info_guesses(io.BytesIO(pdf_bytes), StreamInfo())
+    assert markitdown.detection_counts == {"signature": 1, "magika": 2, "extension": 0}
+
+    # Same guesses as Magika
+    markitdown = MarkItDown(detection_policy="always")
+    assert (
+        markitdown._get_stream_info_guesses(
+            io.BytesIO(pdf_bytes), StreamInfo(extension=".pdf")
+        )
+        == guesses
+    )
+    assert markitdown.detection_counts["magika"] == 1
+
+    markitdown = MarkItDown(detection_policy="never")
+    result = markitdown.convert(os.path.join(TEST_FILES_DIR, "test.json"))
+    assert "5b64c88c-b3c3-4510-bcb8-da0b200602d8" in result.markdown
+    assert markitdown.detection_counts == {"signature": 0, "magika": 0, "extension": 1}
+
+    with pytest.raises(ValueError):
+        MarkItDown(detection_policy="sometimes")
+
+
+def test_detect_charset() -> None:
+    from markitdown._charset import CHARSET_SAMPLE_SIZE, detect_charset
+
+    def detect(data: bytes):
+        stream = io.BytesIO(data)
+        charset = detect_charset(stream)
+        assert stream.tell() == 0
+        return charset
+
+    assert detect("\ufeffhello".encode("utf-8")) == "utf-8-sig"
+    assert detect("hello".encode("utf-16")) == "utf-16"
+    assert detect(b"hello") == "ascii"
+    assert detect("h\u00e9llo w\u00f6rld".encode("utf-8")) == "utf-8"
+
+    # Only a sample is checked, so ASCII-only samples of longer streams may be UTF-8
+    assert detect(b"a" * CHARSET_SAMPLE_SIZE + "\u00e9".encode("utf-8")) == "utf-8"
+
+    # A multi-byte character split by the end of the sample is still valid UTF-8
+    data = b"a" * (CHARSET_SAMPLE_SIZE - 1) + "\u00e9".encode("utf-8")
+    assert detect(data) == "utf-8"
+
+    # Other encodings fall through to charset_normalizer
+    with open(os.path.join(TEST_FILES_DIR, "test_mskanji.csv"), "rb") as fh:
+        assert detect(fh.read()) in ("shift_jis", "cp932")
+
+    # The charset is carried in the stream info guesses
+    guesses = MarkItDown()._get_stream_info_guesses(
+        io.BytesIO("h\u00e9llo".encode("utf-8")), StreamInfo(extension=".txt")
+    )
+    assert guesses[0].charset == "utf-8"
+
+
+def test_convert_many() -> None:
+    markitdown = MarkItDown()
+    sources = [
+        os.path.join(TEST_FILES_DIR, "test.json"),
+        os.path.join(TEST_FILES_DIR, "random.bin"),
+        os.path.join(TEST_FILES_DIR, "test.docx"),
+    ]
+
+    for executor in ["thread", "process"]:
+        outcomes = list(
+            markitdown.convert_many(
+                sources, max_workers=2, executor=executor, chunksize=2
+            )
+        )
+        # Ordered by source, with per-item exceptions
+        assert [source for source, _ in outcomes] == sources
+        assert "5b64c88c-b3c3-4510-bcb8-da0b200602d8" in outcomes[0][1].markdown
+        assert isinstance(outcomes[1][1], UnsupportedFormatException)
+        assert "# Abstract" in outcomes[2][1].markdown
+
+    outcomes = markitdown.convert_many(sources, executor="thread", ordered=False)
+    assert sorted(source for source, _ in outcomes) == sorted(sources)
+
+    with pytest.raises(ValueError):
+        markitdown.convert_many(sources, executor="fiber")
+
+
+def test_async_conversion() -> None:
+    import asyncio
+    import functools
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+    class QuietHandler(SimpleHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+    handler = functools.partial(QuietHandler, directory=TEST_FILES_DIR)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    async def run(markitdown):
+        ticks = 0
+        stop = asyncio.Event()
+
+        async def heartbeat():
+            nonlocal ticks
+            while not stop.is_set():
+                ticks += 1
+                await asyncio.sleep(0.001)
+
+        beat = asyncio.create_task(heartbeat())
+        results = await asyncio.gather(
+            markitdown.aconvert(f"{base_url}/test.docx"),
+            markitdown.aconvert_uri(f"{base_url}/test.json"),
+            markitdown.aconvert(os.path.join(TEST_FILES_DIR, "test.pdf")),
+            markitdown.aconvert_stream(io.BytesIO(b"hello"), file_extension=".txt"),
+        )
+        stop.set()
+        await beat
+        return results, ticks
+
+    try:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            markitdown = MarkItDown(async_executor=executor)
+            results, ticks = asyncio.run(run(markitdown))
+    finally:
+        server.shutdown()
+
+    assert "# Abstract" in results[0].markdown
+    assert "5b64c88c-b3c3-4510-bcb8-da0b200602d8" in results[1].markdown
+    assert "While there is contemporaneous exploration" in results[2].markdown
+    assert results[3].markdown == "hello"
+
+    # The event loop kept running while converting
+    assert ticks > 1
+
+
+def test_failed_converter_not_retried() -> None:
+    class FailingConverter(DocumentConverter):
+        def __init__(self):
+            self.calls = 0
+
+        def accepts(self, file_stream, stream_info, **kwargs):
+            return True
+
+        def convert(self, file_stream, stream_info, **kwargs):
+            self.calls += 1
+            raise ValueError("corrupt")
+
+    markitdown = MarkItDown(enable_builtins=False)
+    failing_converter = FailingConverter()
+    markitdown.register_converter(failing_converter)
+
+    # Each guess (and the trailing empty guess) would otherwise retry the converter
+    guesses = [StreamInfo(extension=".foo"), StreamInfo(mimetype="text/foo")]
+    with pytest.raises(FileConversionException) as exc_info:
+        markitdown._convert(
+            file_stream=io.BytesIO(b"data"), stream_info_guesses=guesses
+        )
+    assert failing_converter.calls == 1
+    assert len(exc_info.value.attempts) == 1
+
+    # A different charset is a different attempt
+    guesses = [StreamInfo(charset="utf-8"), StreamInfo(charset="cp1252")]
+    with pytest.raises(FileConversionException) as exc_info:
+        markitdown._convert(
+            file_stream=io.BytesIO(b"data"), stream_info_guesses=guesses
+        )
+    assert failing_converter.calls == 4
+    assert len(exc_info.value.attempts) == 3
+
+
+def test_accepts_sniffs_stream_header() -> None:
+    markitdown = MarkItDown()
+
+    # Feeds are recognized from their root element
+    atom = (
+        b'<?xml version="1.0" encoding="utf-8"?>\n'
+        b'<feed xmlns="http://www.w3.org/2005/Atom"><title>Atom Title</title>'
+        b"<entry><title>First Entry</title></entry></feed>"
+    )
+    result = markitdown.convert_stream(io.BytesIO(atom), file_extension=".xml")
+    assert "# Atom Title" in result.markdown
+    assert "## First Entry" in result.markdown
+
+    # Other XML documents fall through to the text converters
+    result = markitdown.convert_stream(
+        io.BytesIO(b"<catalog><item>Widget</item></catalog>"), file_extension=".xml"
+    )
+    assert "Widget" in result.markdown
+
+    # JSON that is not a notebook is not converted as one
+    result = markitdown.convert_stream(
+        io.BytesIO(b'{"cells": "not a notebook"}'), mimetype="application/json"
+    )
+    assert "not a notebook" in result.markdown
+
+
+def test_pdf_text_matches_pdfminer() -> None:
+    import pdfminer.high_level
+    from markitdown.converters import PdfConverter
+
+    # convert() returns the text of pdfminer.high_level.extract_text(), form feeds and all
+    pdf_path = os.path.join(TEST_FILES_DIR, "test.pdf")
+    with open(pdf_path, "rb") as fh:
+        result = PdfConverter().convert(fh, StreamInfo(extension=".pdf"))
+    assert result.markdown == pdfminer.high_level.extract_text(pdf_path)
+    assert result.markdown.endswith("\x0c")
+
+    # MarkItDown.convert_iter() normalizes the form feed away
+    units = list(MarkItDown().convert_iter(pdf_path))
+    assert units == [result.markdown.rstrip().rstrip("\x0c").rstrip()]
+
+
+def test_convert_iter() -> None:
+    markitdown = MarkItDown()
+    text_info = StreamInfo(extension=".txt")
+
+    # Presentations are converted slide by slide, and the units join up to convert()
+    pptx_path = os.path.join(TEST_FILES_DIR, "test.pptx")
+    units = markitdown.convert_iter(pptx_path)
+    assert next(units).startswith("<!-- Slide number: 1 -->")
+    assert next(units).startswith("<!-- Slide number: 2 -->")
+    units.close()
+
+    slides = list(markitdown.convert_iter(pptx_path))
+    assert "\n\n".join(slides) == markitdown.convert(pptx_path).markdown
+
+    # ZIP members are streamed, each under its heading
+    zip_path = os.path.join(TEST_FILES_DIR, "test_files.zip")
+    units = list(markitdown.convert_iter(zip_path))
+    assert units[0].startswith("Content from the zip file")
+    heading = units.index("## File: test.pptx")
+    assert units[heading + 1].startswith("<!-- Slide number: 1 -->")
+    assert units[heading + 2].startswith("<!-- Slide number: 2 -->")
+
+    # Other converters yield the whole document
+    units = list(markitdown.convert_iter(io.BytesIO(b"Hello"), stream_info=text_info))
+    assert units == ["Hello"]
+
+    class PartialConverter(DocumentConverter):
+        def __init__(self, units_before_failure):
+            self.units_before_failure = units_before_failure
+
+        def accepts(self, file_stream, stream_info, **kwargs):
+            return True
+
+        def convert_iter(self, file_stream, stream_info, **kwargs):
+            for i in range(self.units_before_failure):
+                yield f"Unit {i}"
+            raise ValueError("corrupt")
+
+    # A converter that fails before its first unit falls back to the next converter
+    markitdown.register_converter(PartialConverter(0))
+    units = list(markitdown.convert_iter(io.BytesIO(b"Hello"), stream_info=text_info))
+    assert units == ["Hello"]
+
+    # After that, the failure is raised
+    markitdown.register_converter(PartialConverter(1))
+    units = markitdown.convert_iter(io.BytesIO(b"Hello"), stream_info=text_info)
+    assert next(units) == "Unit 0"
+    with pytest.raises(FileConversionException):
+        next(units)
+
+
+def test_zip_members() -> None:
+    from markitdown.converters import ZipConverter
+
+    def zip_stream(members):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            for name, data in members.items():
+                archive.writestr(name, data)
+        buffer.seek(0)
+        return buffer
+
+    markitdown = MarkItDown()
+    zip_info = StreamInfo(extension=".zip", filename="archive.zip")
+
+    # Nothing is yielded before the archive is opened, so other converters can be tried
+    units = ZipConverter(markitdown=markitdown).convert_iter(
+        io.BytesIO(b"Hello"), zip_info
+    )
+    with pytest.raises(zipfile.BadZipFile):
+        next(units)
+
+    # convert() converts each file whole, so nested documents keep their own separators
+    with open(os.path.join(TEST_FILES_DIR, "test.pdf"), "rb") as fh:
+        pdf = fh.read()
+    result = markitdown.convert_stream(
+        zip_stream({"doc.pdf": pdf}), stream_info=zip_info
+    )
+    nested = markitdown.convert_stream(io.BytesIO(pdf), file_extension=".pdf")
+    assert result.markdown == (
+        "Content from the zip file `archive.zip`:\n\n## File: doc.pdf\n\n"
+        + nested.markdown
+    )
+
+    class PartialConverter(DocumentConverter):
+        def accepts(self, file_stream, stream_info, **kwargs):
+            return stream_info.extension == ".part"
+
+        def convert(self, file_stream, stream_info, **kwargs):
+            return join_units(self.convert_iter(file_stream, stream_info, **kwargs))
+
+        def convert_iter(self, file_stream, stream_info, **kwargs):
+            yield "Unit 0"
+            raise ValueError("corrupt")
+
+    # A file that fails partway through is not silently cut short
+    markitdown.register_converter(PartialConverter())
+    units = markitdown.convert_iter(
+        zip_stream({"a.txt": b"Hello", "b.part": b"", "c.txt": b"World"}),
+        stream_info=zip_info,
+    )
+    assert next(units).startswith("Content from the zip file")
+    assert next(units) == "## File: a.txt"
+    assert next(units) == "Hello"
+    assert next(units) == "## File: b.part"
+    assert next(units) == "Unit 0"
+    with pytest.raises(FileConversionException):
+        next(units)
+
+    # Files that cannot be converted at all are still skipped
+    result = markitdown.convert_stream(
+        zip_stream({"a.txt": b"Hello", "b.part": b"", "c.txt": b"World"}),
+        stream_info=zip_info,
+    )
+    assert "## File: b.part" not in result.markdown
+    assert result.markdown.endswith("## File: c.txt\n\nWorld")
+
+
+def test_spooled_streams() -> None:
+    class UnseekableStream(io.RawIOBase):
+        def __init__(self, data):
+            self._data = io.BytesIO(data)
+
+        def readable(self):
+            return True
+
+        def readinto(self, b):
+            return self._data.readinto(b)
+
+    data = b"Hello, spooled world!\n" * 1000
+
+    # Non-seekable streams that outgrow the memory limit are moved to a temporary file
+    spool = StreamSpool(memory_limit=1024)
+    spool.write(data[:1000])
+    assert isinstance(spool.getfile(), io.BytesIO)
+    spool.write(data[1000:])
+    with spool.getfile() as buffer:
+        assert not isinstance(buffer, io.BytesIO)
+        assert buffer.read() == data
+
+    markitdown = MarkItDown(spool_memory_limit=1024)
+    result = markitdown.convert_stream(
+        UnseekableStream(data), stream_info=StreamInfo(extension=".txt")
+    )
+    assert result.markdown.startswith("Hello, spooled world!")
+
+    # Larger streams than max_buffered_size are rejected
+    markitdown = MarkItDown(max_buffered_size=1024)
+    with pytest.raises(InputTooLargeException):
+        markitdown.convert_stream(
+            UnseekableStream(data), stream_info=StreamInfo(extension=".txt")
+        )
+    with pytest.raises(InputTooLargeException):
+        StreamSpool(max_size=1024).check_size(len(data))
+
+    # Seekable streams are converted in place, whatever their size
+    result = markitdown.convert_stream(
+        io.BytesIO(data), stream_info=StreamInfo(extension=".txt")
+    )
+    assert result.markdown.startswith("Hello, spooled world!")
+
+
+def test_normalize_markdown() -> None:
+    text = "\n\n\n# Title  \r\n\r\n\r\n\t\nSome text\t\n  indented\n\n\n\n"
+    expected = "\n\n# Title\n\nSome text\n  indented\n\n"
+
+    # Normalizing in chunks (even splitting \r\n) gives the same result as all at once
+    for chunk_size in [1, 2, 3, 5, len(text)]:
+        normalizer = MarkdownNormalizer()
+        normalized = "".join(
+            normalizer.feed(text[i : i + chunk_size])
+            for i in range(0, len(text), chunk_size)
+        )
+        assert normalized + normalizer.finish() == expected
+
+    # Normalization can be skipped
+    markitdown = MarkItDown()
+    data = b"Some text  \n\n\n\nMore text"
+    result = markitdown.convert_stream(
+        io.BytesIO(data), stream_info=StreamInfo(extension=".txt")
+    )
+    assert result.markdown == "Some text\n\nMore text"
+    result = markitdown.convert_stream(
+        io.BytesIO(data), stream_info=StreamInfo(extension=".txt"), normalize=False
+    )
+    assert result.markdown == data.decode()
+
+
+def test_result_cache() -> None:
+    class CountingConverter(DocumentConverter):
+        accepted_extensions = [".foo"]
+
+        def __init__(self):
+            self.calls = 0
+
+        def accepts(self, file_stream, stream_info, **kwargs):
+            return True
+
+        def convert(self, file_stream, stream_info, **kwargs):
+            self.calls += 1
+            return DocumentConverterResult(
+                markdown=file_stream.read().decode("utf-8"), title="Foo"
+            )
+
+    foo_info = StreamInfo(extension=".foo")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for cache in [
+            MemoryCache(),
+            DiskCache(os.path.join(cache_dir, "disk")),
+            SQLiteCache(os.path.join(cache_dir, "cache.sqlite3")),
+        ]:
+            markitdown = MarkItDown(enable_builtins=False, cache=cache)
+            counting_converter = CountingConverter()
+            markitdown.register_converter(counting_converter)
+
+            # The same content and options are only converted once
+            for _ in range(2):
+                result = markitdown.convert_stream(
+                    io.BytesIO(b"Hello"), stream_info=foo_info
+                )
+                assert result.markdown == "Hello"
+                assert result.title == "Foo"
+            assert counting_converter.calls == 1
+
+            # Different content or options are converted again
+            markitdown.convert_stream(io.BytesIO(b"World"), stream_info=foo_info)
+            markitdown.convert_stream(
+                io.BytesIO(b"Hello"), stream_info=foo_info, keep_data_uris=True
+            )
+            assert counting_converter.calls == 3
+
+            stats = cache.stats
+            assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 3, 3)
+
+            cache.clear()
+            assert cache.stats["entries"] == 0
+
+    # The least recently used entries are evicted once the cache is full
+    cache = MemoryCache(max_size=15)
+    markitdown = MarkItDown(enable_builtins=False, cache=cache)
+    markitdown.register_converter(CountingConverter())
+    for data in [b"aaaa", b"bbbb", b"aaaa", b"cccc"]:
+        markitdown.convert_stream(io.BytesIO(data), stream_info=foo_info)
+    stats = cache.stats
+    assert (stats["hits"], stats["evictions"], stats["size"]) == (1, 1, 14)
+    markitdown.convert_stream(io.BytesIO(b"aaaa"), stream_info=foo_info)
+    assert cache.stats["hits"] == 2
+
+    # Copies of a file at different paths share a result
+    cache = MemoryCache()
+    markitdown = MarkItDown(enable_builtins=False, cache=cache)
+    counting_converter = CountingConverter()
+    markitdown.register_converter(counting_converter)
+    with tempfile.TemporaryDirectory() as copies_dir:
+        for name in ["first.foo", "second.foo"]:
+            path = os.path.join(copies_dir, name)
+            with open(path, "wb") as fh:
+                fh.write(b"Hello")
+            assert markitdown.convert_local(path).markdown == "Hello"
+    assert counting_converter.calls == 1
+    assert cache.stats["hits"] == 1
+
+    # ...except ZIP archives, whose content names the archive's path
+    markitdown = MarkItDown(cache=MemoryCache())
+    with open(os.path.join(TEST_FILES_DIR, "test_files.zip"), "rb") as fh:
+        data = fh.read()
+    for name in ["first.zip", "second.zip"]:
+        result = markitdown.convert_stream(
+            io.BytesIO(data), stream_info=StreamInfo(extension=".zip", filename=name)
+        )
+        assert result.markdown.startswith(f"Content from the zip file `{name}`:")
+
+
+def test_conversion_trace() -> None:
+    markitdown = MarkItDown()
+
+    # Without trace=True, no trace is attached (nor passed to the converters)
+    result = markitdown.convert(os.path.join(TEST_FILES_DIR, "test.docx"))
+    assert result.trace is None
+
+    result = markitdown.convert(os.path.join(TEST_FILES_DIR, "test.docx"), trace=True)
+    trace = result.trace
+    assert isinstance(trace, ConversionTrace)
+    assert trace.bytes_in == os.path.getsize(os.path.join(TEST_FILES_DIR, "test.docx"))
+    assert trace.bytes_out == len(result.markdown.encode("utf-8"))
+    assert trace.converter.endswith("DocxConverter")
+    assert trace.stream_info.extension == ".docx"
+    assert not trace.cached
+
+    stages = trace.stage_seconds()
+    for stage in ["accepts", "convert", "normalize"]:
+        assert stage in stages
+    assert "buffer" not in stages
+    assert trace.seconds == pytest.approx(sum(stages.values()))
+    assert any(span.stage == "convert" and span.outcome == "ok" for span in trace.spans)
+    assert trace.to_dict()["converter"] == trace.converter
+
+    # Buffering a non-seekable stream, and detecting the charset of text, are traced
+    class NonSeekable(io.BytesIO):
+        def seekable(self):
+            return False
+
+    result = markitdown.convert_stream(
+        NonSeekable("Grüße\n".encode("utf-8")),
+        stream_info=StreamInfo(extension=".txt"),
+        trace=True,
+    )
+    assert {"buffer", "charset"} <= set(result.trace.stage_seconds())
+
+    # Cache hits are traced too
+    markitdown = MarkItDown(cache=MemoryCache())
+    for cached in [False, True]:
+        result = markitdown.convert(
+            os.path.join(TEST_FILES_DIR, "test.docx"), trace=True
+        )
+        assert result.trace.cached == cached
+        assert ("convert" in result.trace.stage_seconds()) != cached
+
+
+def test_conversion_deadline() -> None:
+    class UnitsConverter(DocumentConverter):
+        """Converts a document in five units, cancelling the deadline after the third."""
+
+        accepted_extensions = [".units"]
+
+        def accepts(self, file_stream, stream_info, **kwargs):
+            return True
+
+        def convert(self, file_stream, stream_info, **kwargs):
+            return join_units(
+                self.convert_iter(file_stream, stream_info, **kwargs), **kwargs
+            )
+
+        def convert_iter(self, file_stream, stream_info, **kwargs):
+            for i in range(5):
+                check_deadline(**kwargs)
+                if i == 2:
+                    kwargs["deadline"].cancel()
+                yield f"Unit {i}"
+
+    units_info = StreamInfo(extension=".units")
+    markitdown = MarkItDown(cache=MemoryCache())
+    markitdown.register_converter(UnitsConverter())
+
+    with pytest.raises(ConversionTimeoutException):
+        markitdown.convert_stream(
+            io.BytesIO(b"data"), stream_info=units_info, deadline=Deadline()
+        )
+
+    # Truncated results are flagged, and not cached
+    result = markitdown.convert_stream(
+        io.BytesIO(b"data"),
+        stream_info=units_info,
+        deadline=Deadline(),
+        on_deadline="truncate",
+    )
+    assert result.truncated
+    assert result.markdown == "Unit 0\n\nUnit 1\n\nUnit 2"
+    assert markitdown._cache.stats["entries"] == 0
+
+    units = markitdown.convert_iter(
+        io.BytesIO(b"data"),
+        stream_info=units_info,
+        deadline=Deadline(),
+        on_deadline="truncate",
+    )
+    assert list(units) == ["Unit 0", "Unit 1", "Unit 2"]
+
+    with pytest.raises(ValueError):
+        markitdown.convert_stream(
+            io.BytesIO(b"data"), stream_info=units_info, on_deadline="ignore"
+        )
+
+    # An expired deadline stops the built-in converters too, including within ZIP members
+    class CountdownDeadline(Deadline):
+        def __init__(self, checks):
+            super().__init__()
+            self.checks = checks
+
+        def check(self):
+            self.checks -= 1
+            if self.checks < 0:
+                self.cancel()
+            super().check()
+
+    markitdown = MarkItDown()
+    with pytest.raises(ConversionTimeoutException):
+        markitdown.convert(os.path.join(TEST_FILES_DIR, "test.pptx"), deadline=0)
+
+    zip_path = os.path.join(TEST_FILES_DIR, "test_files.zip")
+    result = markitdown.convert(
+        zip_path, deadline=CountdownDeadline(5), on_deadline="truncate"
+    )
+    assert result.truncated
+    assert result.markdown.startswith("Content from the zip file")
+    assert len(result.markdown) < len(markitdown.convert(zip_path).markdown)
+
+    # A deadline in seconds starts with the conversion, and does not change its result
+    result = markitdown.convert(os.path.join(TEST_FILES_DIR, "test.pptx"), deadline=60)
+    assert not result.truncated
+    assert (
+        result.markdown
+        == markitdown.convert(os.path.join(TEST_FILES_DIR, "test.pptx")).markdown
+    )
+
+
+def test_unit_selection() -> None:
+    markitdown = MarkItDown(cache=MemoryCache())
+
+    # Slides keep their numbers, whichever are selected
+    pptx_path = os.path.join(TEST_FILES_DIR, "test.pptx")
+    result = markitdown.convert(pptx_path, pages=[3, 1])
+    assert "<!-- Slide number: 1 -->" in result.markdown
+    assert "<!-- Slide number: 2 -->" not in result.markdown
+    assert "<!-- Slide number: 3 -->" in result.markdown
+
+    result = markitdown.convert(pptx_path, max_units=1)
+    assert "<!-- Slide number: 1 -->" in result.markdown
+    assert "<!-- Slide number: 2 -->" not in result.markdown
+
+    # Sheets, EPUB chapters and ZIP members are selected the same way
+    result = markitdown.convert(os.path.join(TEST_FILES_DIR, "test.xlsx"), pages=[2])
+    assert "## Sheet1" not in result.markdown
+    assert result.markdown.startswith("## 09060124-b5e7-4717-9d07-3c046eb")
+
+    epub_path = os.path.join(TEST_FILES_DIR, "test.epub")
+    units = list(markitdown.convert_iter(epub_path, max_units=1))
+    assert len(units) == 2  # The metadata, and the first chapter
+    assert units[0].startswith("**Title:** Test EPUB Document")
+
+    zip_path = os.path.join(TEST_FILES_DIR, "test_files.zip")
+    result = markitdown.convert(zip_path, max_units=1)
+    assert "## File: test.docx" in result.markdown
+    assert result.markdown.count("## File:") == 1
+
+    # The PDF's first page, as selected by pdfminer
+    pdf_path = os.path.join(TEST_FILES_DIR, "test.pdf")
+    assert markitdown.convert(pdf_path, pages=range(1, 3)).markdown.startswith(
+        "1\n\nIntroduction"
+    )
+
+    # Different selections are cached separately
+    assert markitdown.convert(pptx_path, pages=[1, 3]).markdown == (
+        markitdown.convert(pptx_path, pages=(3, 1)).markdown
+    )
+    assert markitdown._cache.stats["hits"] == 2
+
+    for options in [{"pages": []}, {"pages": [0]}, {"max_units": 0}]:
+        with pytest.raises(ValueError):
+            markitdown.convert(pptx_path, **options)
+
+
 @pytest.mark.skipif(
     skip_exiftool,
     reason="do not run if exiftool is not installed",
@@ -452,6 +1269,25 @@ if __name__ == "__main__":
         test_markitdown_remote,
         test_speech_transcription,
         test_exceptions,
+        test_builtin_converters_subset,
+        test_lazy_builtin_converters,
+        test_converter_dispatch_index,
+        test_shared_magika,
+        test_detection_policy,
+        test_detect_charset,
+        test_convert_many,
+        test_async_conversion,
+        test_failed_converter_not_retried,
+        test_accepts_sniffs_stream_header,
+        test_pdf_text_matches_pdfminer,
+        test_convert_iter,
+        test_zip_members,
+        test_spooled_streams,
+        test_normalize_markdown,
+        test_result_cache,
+        test_conversion_trace,
+        test_conversion_deadline,
+        test_unit_selection,
         test_markitdown_exiftool,
         test_markitdown_llm_parameters,
         test_markitdown_llm,
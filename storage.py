@@ -0,0 +1,249 @@
+"""
+转换结果（Markdown 文件）的存储后端
+支持本地文件系统和 S3 兼容的对象存储（AWS S3、MinIO 等），
+使用对象存储时多个无状态节点可以共享转换结果，无需共享 POSIX 卷
+"""
+
+import io
+import os
+import sys
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import quote, unquote
+
+# 可选依赖：仅在使用 S3 后端时需要
+_boto3_exc_info = None
+try:
+    import boto3
+    import botocore.exceptions
+    from boto3.s3.transfer import TransferConfig
+except ImportError:
+    _boto3_exc_info = sys.exc_info()
+
+
+def markdown_filename(original_filename, file_id):
+    """根据原始文件名和文件ID生成 Markdown 文件名"""
+    return f"{Path(original_filename).stem}_{file_id}.md"
+
+
+class ArtifactStorage:
+    """存储后端的抽象基类
+
+    每条记录是一个字典，至少包含 file_id、filename（Markdown 文件名）、
+    original_filename 和 created_at（本地时间，不带时区）。
+    """
+
+    def save(self, file_id, md_filename, content, original_filename):
+        """保存 Markdown 内容，返回记录"""
+        raise NotImplementedError()
+
+    def get(self, file_id):
+        """返回文件记录，不存在时返回 None"""
+        raise NotImplementedError()
+
+    def open(self, record):
+        """返回可传给 send_file 的路径或二进制文件对象，文件已不存在时返回 None"""
+        raise NotImplementedError()
+
+    def delete(self, file_id):
+        """删除文件及其记录"""
+        raise NotImplementedError()
+
+    def list(self):
+        """返回所有文件记录"""
+        raise NotImplementedError()
+
+    def cleanup_expired(self, cutoff):
+        """删除创建时间早于 cutoff 的文件，返回被删除的记录"""
+        expired = [record for record in self.list() if record['created_at'] < cutoff]
+        for record in expired:
+            self.delete(record['file_id'])
+        return expired
+
+
+class LocalStorage(ArtifactStorage):
+    """本地文件系统存储，文件记录保存在进程内存中"""
+
+    def __init__(self, folder):
+        self.folder = folder
+        self._records = {}
+        self._lock = threading.Lock()
+        os.makedirs(folder, exist_ok=True)
+
+    def save(self, file_id, md_filename, content, original_filename):
+        md_filepath = os.path.join(self.folder, md_filename)
+        with open(md_filepath, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+        record = {
+            'file_id': file_id,
+            'filename': md_filename,
+            'filepath': md_filepath,
+            'created_at': datetime.now(),
+            'original_filename': original_filename
+        }
+        with self._lock:
+            self._records[file_id] = record
+        return record
+
+    def get(self, file_id):
+        with self._lock:
+            return self._records.get(file_id)
+
+    def open(self, record):
+        if not os.path.exists(record['filepath']):
+            with self._lock:
+                self._records.pop(record['file_id'], None)
+            return None
+        return record['filepath']
+
+    def delete(self, file_id):
+        with self._lock:
+            record = self._records.pop(file_id, None)
+        if record is not None and os.path.exists(record['filepath']):
+            os.remove(record['filepath'])
+
+    def list(self):
+        with self._lock:
+            return list(self._records.values())
+
+
+class S3Storage(ArtifactStorage):
+    """S3 兼容对象存储（AWS S3、MinIO 等）
+
+    每个文件对应两个对象，不依赖任何节点本地状态：
+    - 内容对象 `<prefix>files/<file_id>`：键由文件ID确定，查询、下载和删除时直接访问（HEAD/GET/DELETE），
+      无需列举；原始文件名和创建时间保存在对象元数据中。
+    - 索引对象 `<prefix>index/<创建时间（UTC）>/<file_id>/<URL 编码的原始文件名>`：空对象，
+      按键的字典序列举即为按创建时间排序，列举索引即可还原完整记录；
+      清理过期文件时只需列举到第一个未过期的索引对象为止。
+    超过分片阈值的内容使用分片上传（multipart upload）。
+    """
+
+    TIMESTAMP_FORMAT = '%Y%m%dT%H%M%S%fZ'
+    DELETE_BATCH_SIZE = 1000  # DeleteObjects 单次请求最多删除的对象数
+
+    def __init__(self, bucket, prefix='', endpoint_url=None, region_name=None,
+                 multipart_threshold=8 * 1024 * 1024, multipart_chunksize=8 * 1024 * 1024):
+        if _boto3_exc_info is not None:
+            raise RuntimeError(
+                "S3 存储后端需要 boto3，请先安装：pip install boto3"
+            ) from _boto3_exc_info[1]
+
+        self.bucket = bucket
+        self.prefix = prefix
+        self._client = boto3.client('s3', endpoint_url=endpoint_url, region_name=region_name)
+        self._transfer_config = TransferConfig(
+            multipart_threshold=multipart_threshold,
+            multipart_chunksize=multipart_chunksize,
+        )
+
+    def _content_key(self, file_id):
+        return f"{self.prefix}files/{file_id}"
+
+    def _index_key(self, file_id, quoted_name, timestamp):
+        return f"{self.prefix}index/{timestamp}/{file_id}/{quoted_name}"
+
+    def _record(self, file_id, quoted_name, timestamp):
+        original_filename = unquote(quoted_name)
+        created_at = datetime.strptime(timestamp, self.TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+        return {
+            'file_id': file_id,
+            'key': self._content_key(file_id),
+            'index_key': self._index_key(file_id, quoted_name, timestamp),
+            'filename': markdown_filename(original_filename, file_id),
+            'original_filename': original_filename,
+            # 转换为不带时区的本地时间，以便与 datetime.now() 比较
+            'created_at': created_at.astimezone().replace(tzinfo=None),
+        }
+
+    def _iter_index(self):
+        """按创建时间顺序产出索引中的记录"""
+        index_prefix = f"{self.prefix}index/"
+        paginator = self._client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=index_prefix):
+            for obj in page.get('Contents', []):
+                timestamp, _, rest = obj['Key'][len(index_prefix):].partition('/')
+                file_id, _, quoted_name = rest.partition('/')
+                yield self._record(file_id, quoted_name, timestamp)
+
+    def _delete_keys(self, keys):
+        for start in range(0, len(keys), self.DELETE_BATCH_SIZE):
+            batch = keys[start:start + self.DELETE_BATCH_SIZE]
+            self._client.delete_objects(
+                Bucket=self.bucket,
+                Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True},
+            )
+
+    def save(self, file_id, md_filename, content, original_filename):
+        quoted_name = quote(original_filename, safe='')
+        timestamp = datetime.now(timezone.utc).strftime(self.TIMESTAMP_FORMAT)
+        self._client.upload_fileobj(
+            io.BytesIO(content.encode('utf-8')),
+            self.bucket,
+            self._content_key(file_id),
+            ExtraArgs={
+                'ContentType': 'text/markdown; charset=utf-8',
+                'Metadata': {'original-filename': quoted_name, 'created': timestamp},
+            },
+            Config=self._transfer_config,
+        )
+        # 内容上传完成后再写入索引，列举到的文件总是可以下载
+        self._client.put_object(Bucket=self.bucket, Key=self._index_key(file_id, quoted_name, timestamp), Body=b'')
+        return self._record(file_id, quoted_name, timestamp)
+
+    def get(self, file_id):
+        try:
+            response = self._client.head_object(Bucket=self.bucket, Key=self._content_key(file_id))
+        except botocore.exceptions.ClientError as e:
+            if e.response['Error']['Code'] in ('404', 'NoSuchKey', 'NotFound'):
+                return None
+            raise
+        metadata = response['Metadata']
+        return self._record(file_id, metadata['original-filename'], metadata['created'])
+
+    def open(self, record):
+        try:
+            response = self._client.get_object(Bucket=self.bucket, Key=record['key'])
+        except self._client.exceptions.NoSuchKey:
+            return None
+        return response['Body']
+
+    def delete(self, file_id):
+        record = self.get(file_id)
+        if record is not None:
+            self._delete_keys([record['key'], record['index_key']])
+
+    def list(self):
+        return list(self._iter_index())
+
+    def cleanup_expired(self, cutoff):
+        # 索引按创建时间排序，遇到第一个未过期的记录即可停止列举
+        expired = []
+        for record in self._iter_index():
+            if record['created_at'] >= cutoff:
+                break
+            expired.append(record)
+        self._delete_keys([key for record in expired for key in (record['key'], record['index_key'])])
+        return expired
+
+
+def create_storage(local_folder):
+    """根据环境变量 STORAGE_BACKEND（local 或 s3）创建存储后端"""
+    backend = os.environ.get('STORAGE_BACKEND', 'local').strip().lower()
+    if backend == 'local':
+        return LocalStorage(local_folder)
+    if backend == 's3':
+        bucket = os.environ.get('S3_BUCKET')
+        if not bucket:
+            raise ValueError("使用 S3 存储后端时必须设置 S3_BUCKET")
+        return S3Storage(
+            bucket,
+            prefix=os.environ.get('S3_PREFIX', 'markitdown/'),
+            endpoint_url=os.environ.get('S3_ENDPOINT_URL') or None,
+            region_name=os.environ.get('S3_REGION') or None,
+            multipart_threshold=int(os.environ.get('S3_MULTIPART_THRESHOLD_MB', '8')) * 1024 * 1024,
+            multipart_chunksize=int(os.environ.get('S3_MULTIPART_CHUNKSIZE_MB', '8')) * 1024 * 1024,
+        )
+    raise ValueError(f"不支持的存储后端: {backend}")
@@ -0,0 +1,233 @@
+"""
+多租户公平调度与限流
+按 API Key（或客户端地址）跟踪用量，转换任务按加权公平份额（start-time fair queuing）分配有限的并发槽位，
+并使用令牌桶限制每个租户每分钟转换的字节数
+"""
+
+import hashlib
+import threading
+import time
+from collections import deque
+
+
+def tenant_id_for_api_key(api_key):
+    """API Key 对应的租户ID（只保留摘要，避免在统计信息中暴露原始密钥）"""
+    return 'key:' + hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]
+
+
+class TokenBucket:
+    """令牌桶：每分钟补充 rate_per_minute 个令牌，最多积累一分钟的量"""
+
+    def __init__(self, rate_per_minute):
+        self.capacity = float(rate_per_minute)
+        self.tokens = self.capacity
+        self._rate = self.capacity / 60.0
+        self._updated_at = time.monotonic()
+
+    def consume(self, amount):
+        """尝试消耗 amount 个令牌，成功返回 0，否则返回需要等待的秒数
+
+        超过桶容量的请求在桶满时允许通过（令牌数变为负数），之后的请求需要等待更久。
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+
+        required = min(amount, self.capacity)
+        if self.tokens >= required:
+            self.tokens -= amount
+            return 0.0
+        return (required - self.tokens) / self._rate
+
+    def is_full(self):
+        """桶是否已补满；补满的桶与新建的桶等价，可以丢弃"""
+        return self.tokens + (time.monotonic() - self._updated_at) * self._rate >= self.capacity
+
+
+class FairShareScheduler:
+    """加权公平份额调度器
+
+    最多 slots 个转换同时执行。槽位空出时，优先分配给虚拟时间最小的租户；
+    每次分配后该租户的虚拟时间增加 cost / weight，因此大量提交任务的租户不会挤占其他租户。
+    同一租户内部按到达顺序执行。
+    """
+
+    def __init__(self, slots):
+        self.slots = slots
+        self._active = 0
+        self._cond = threading.Condition()
+        self._queues = {}  # 租户ID -> 等待中的票据队列
+        self._vtime = {}  # 租户ID -> 虚拟时间
+        self._global_vtime = 0.0
+
+    def _next_ticket(self):
+        tenant_id = min(self._queues, key=lambda t: self._vtime[t])
+        return self._queues[tenant_id][0]
+
+    def acquire(self, tenant_id, weight, cost):
+        """等待并获取一个转换槽位，返回等待的秒数"""
+        started_at = time.perf_counter()
+        ticket = object()
+        with self._cond:
+            queue = self._queues.get(tenant_id)
+            if queue is None:
+                queue = self._queues[tenant_id] = deque()
+                # 重新变为活跃的租户从当前全局虚拟时间开始，空闲期间不积累额度
+                self._vtime[tenant_id] = max(self._vtime.get(tenant_id, 0.0), self._global_vtime)
+            queue.append(ticket)
+
+            while self._active >= self.slots or self._next_ticket() is not ticket:
+                self._cond.wait()
+
+            queue.popleft()
+            if not queue:
+                del self._queues[tenant_id]
+            self._active += 1
+            self._global_vtime = self._vtime[tenant_id]
+            self._vtime[tenant_id] += cost / weight
+
+            # 可能还有空闲槽位，唤醒下一个等待者
+            self._cond.notify_all()
+        return time.perf_counter() - started_at
+
+    def release(self):
+        """释放一个转换槽位"""
+        with self._cond:
+            self._active -= 1
+            # 清理已落后于全局虚拟时间的空闲租户
+            for tenant_id in [t for t, v in self._vtime.items() if t not in self._queues and v <= self._global_vtime]:
+                del self._vtime[tenant_id]
+            self._cond.notify_all()
+
+    def snapshot(self):
+        """返回每个租户当前排队的任务数，以及正在执行的任务总数"""
+        with self._cond:
+            return {tenant_id: len(queue) for tenant_id, queue in self._queues.items()}, self._active
+
+
+class FairTaskQueue:
+    """按租户轮转出队的后台任务队列
+
+    ThreadPoolExecutor 按提交顺序执行任务，一个租户提交的大量任务会排在其他租户之前；
+    这里每个租户一个队列，工作线程依次从各租户队列中取任务。
+    """
+
+    def __init__(self, workers, thread_name_prefix='task'):
+        self._cond = threading.Condition()
+        self._queues = {}  # 租户ID -> 待执行的 (func, args) 队列
+        self._order = deque()  # 有待执行任务的租户，按轮转顺序排列
+        for i in range(workers):
+            threading.Thread(target=self._worker, name=f'{thread_name_prefix}_{i}', daemon=True).start()
+
+    def submit(self, tenant_id, func, *args):
+        with self._cond:
+            queue = self._queues.get(tenant_id)
+            if queue is None:
+                queue = self._queues[tenant_id] = deque()
+                self._order.append(tenant_id)
+            queue.append((func, args))
+            self._cond.notify()
+
+    def pending(self):
+        """返回每个租户待执行的任务数"""
+        with self._cond:
+            return {tenant_id: len(queue) for tenant_id, queue in self._queues.items()}
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._order:
+                    self._cond.wait()
+                tenant_id = self._order.popleft()
+                queue = self._queues[tenant_id]
+                func, args = queue.popleft()
+                if queue:
+                    self._order.append(tenant_id)
+                else:
+                    del self._queues[tenant_id]
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"后台任务执行失败: {e}")
+
+
+class TenantRegistry:
+    """租户的权重、字节限流和用量统计
+
+    租户（包括按客户端地址区分的租户）空闲超过 idle_seconds 且令牌桶已补满后，
+    其令牌桶和用量统计被清除，因此内存占用只与近期活跃的租户数有关。
+    """
+
+    def __init__(self, weights=None, bytes_per_minute=None, idle_seconds=3600):
+        self._weights = weights or {}
+        self._bytes_per_minute = bytes_per_minute
+        self._idle_seconds = idle_seconds
+        self._buckets = {}
+        self._usage = {}
+        self._last_seen = {}  # 租户ID -> 最近一次请求的时间（time.monotonic）
+        self._next_prune = time.monotonic() + min(idle_seconds, 60)
+        self._lock = threading.Lock()
+
+    def weight(self, tenant_id):
+        return self._weights.get(tenant_id, 1.0)
+
+    def _prune(self, now):
+        """清除空闲的租户，最多每分钟（或每 idle_seconds）执行一次"""
+        if now < self._next_prune:
+            return
+        self._next_prune = now + min(self._idle_seconds, 60)
+        cutoff = now - self._idle_seconds
+        for tenant_id in [t for t, seen in self._last_seen.items() if seen < cutoff]:
+            bucket = self._buckets.get(tenant_id)
+            if bucket is not None and not bucket.is_full():
+                # 令牌桶尚未补满，清除后租户可以立即获得一个满桶，因此暂时保留
+                continue
+            del self._last_seen[tenant_id]
+            self._buckets.pop(tenant_id, None)
+            self._usage.pop(tenant_id, None)
+
+    def _usage_for(self, tenant_id):
+        now = time.monotonic()
+        self._prune(now)
+        self._last_seen[tenant_id] = now
+        usage = self._usage.get(tenant_id)
+        if usage is None:
+            usage = self._usage[tenant_id] = {
+                'requests': 0,
+                'bytes': 0,
+                'rate_limited': 0,
+                'conversion_seconds': 0.0,
+                'queue_wait_seconds': 0.0,
+            }
+        return usage
+
+    def consume(self, tenant_id, size):
+        """按字节数扣减租户的令牌桶，成功返回 0，被限流时返回建议的重试等待秒数"""
+        with self._lock:
+            usage = self._usage_for(tenant_id)
+            if self._bytes_per_minute:
+                bucket = self._buckets.get(tenant_id)
+                if bucket is None:
+                    bucket = self._buckets[tenant_id] = TokenBucket(self._bytes_per_minute)
+                retry_after = bucket.consume(size)
+                if retry_after > 0:
+                    usage['rate_limited'] += 1
+                    return retry_after
+            usage['requests'] += 1
+            usage['bytes'] += size
+            return 0.0
+
+    def record(self, tenant_id, conversion_seconds, queue_wait_seconds):
+        """记录一次转换的耗时"""
+        with self._lock:
+            usage = self._usage_for(tenant_id)
+            usage['conversion_seconds'] += conversion_seconds
+            usage['queue_wait_seconds'] += queue_wait_seconds
+
+    def usage(self):
+        """返回近期活跃租户的用量统计"""
+        with self._lock:
+            return {
+                tenant_id: dict(usage, weight=self.weight(tenant_id))
+                for tenant_id, usage in self._usage.items()
+            }
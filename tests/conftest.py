@@ -0,0 +1,32 @@
+"""服务端测试的公共设置：在导入 app 之前配置环境变量，并把转换结果写入临时目录"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'packages', 'markitdown', 'src'))
+sys.path.insert(0, os.path.join(ROOT, 'packages', 'markitdown-mcp', 'src'))
+
+os.environ['ADMIN_TOKEN'] = 'test-admin-token'
+os.environ.pop('WORKER_POOLS', None)
+os.environ.pop('RESULT_CACHE', None)
+os.environ.pop('STORAGE_BACKEND', None)
+
+import app as app_module  # noqa: E402
+from storage import LocalStorage  # noqa: E402
+
+ADMIN_TOKEN = os.environ['ADMIN_TOKEN']
+
+def pytest_sessionfinish(session, exitstatus):
+    """停止 app 导入时启动的后台清理任务"""
+    if app_module.scheduler.running:
+        app_module.scheduler.shutdown(wait=False)
+
+@pytest.fixture
+def artifact_dir(tmp_path, monkeypatch):
+    """转换结果保存到临时目录，不写入 public 目录"""
+    monkeypatch.setattr(app_module, 'artifact_storage', LocalStorage(str(tmp_path)))
+    return tmp_path
@@ -0,0 +1,90 @@
+"""ASGI 版本（asgi.py）的冒烟测试"""
+
+import asyncio
+
+import pytest
+from starlette.testclient import TestClient
+
+import asgi
+from markitdown_mcp import __main__ as mcp_module
+
+from conftest import ADMIN_TOKEN
+
+CSV_CONTENT = b'name,count\nalpha,1\nbeta,2\n'
+
+@pytest.fixture
+def client(artifact_dir):
+    with TestClient(asgi.create_app(enable_mcp=False)) as client:
+        yield client
+
+@pytest.fixture
+def mcp_client(artifact_dir):
+    with TestClient(asgi.create_app(enable_mcp=True)) as client:
+        yield client
+    mcp_module.set_allow_file_uris(True)
+
+def test_health(client):
+    response = client.get('/api/health')
+    assert response.status_code == 200
+    assert response.json()['status'] == 'healthy'
+
+def test_convert_file_download_and_list(client):
+    response = client.post('/api/convert/file', files={'file': ('data.csv', CSV_CONTENT, 'text/csv')})
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert result['original_filename'] == 'data.csv'
+
+    download = client.get(f"/api/download/{result['file_id']}")
+    assert download.status_code == 200
+    assert '| alpha | 1 |' in download.text
+
+    files = client.get('/api/files').json()['files']
+    assert [f['file_id'] for f in files] == [result['file_id']]
+
+def test_convert_file_rejects_unsupported_type(client):
+    response = client.post('/api/convert/file', files={'file': ('run.exe', b'MZ', 'application/octet-stream')})
+    assert response.status_code == 400
+
+def test_convert_url_requires_url(client):
+    response = client.post('/api/convert/url', json={})
+    assert response.status_code == 400
+    assert response.json()['error'] == '需要提供URL'
+
+def test_conversion_timeout_returns_504(client, monkeypatch):
+    def timeout(*args, **kwargs):
+        raise asgi.ConversionTimeoutException('timed out')
+    monkeypatch.setattr(asgi, 'convert_for_tenant', timeout)
+    monkeypatch.setattr(asgi, 'download_for_tenant', lambda tenant_id, url: (None, 'data.csv', 0, None))
+
+    response = client.post('/api/convert/file', files={'file': ('data.csv', CSV_CONTENT, 'text/csv')})
+    assert response.status_code == 504
+    assert response.json()['error'].startswith('转换超时')
+
+    response = client.post('/api/convert/url', json={'url': 'https://example.com/data.csv'})
+    assert response.status_code == 504
+    assert response.json()['error'].startswith('转换超时')
+
+def test_download_unknown_file(client):
+    assert client.get('/api/download/does-not-exist').status_code == 404
+
+def test_mcp_disabled_by_default(client):
+    assert client.post('/mcp/', json={}).status_code == 404
+
+def test_mcp_requires_admin_token(mcp_client):
+    assert mcp_client.post('/mcp/', json={}).status_code == 403
+    assert mcp_client.post('/mcp/', json={}, headers={'X-Admin-Token': 'wrong'}).status_code == 403
+    assert mcp_client.get('/sse').status_code == 403
+
+    # 令牌正确时请求交给 MCP 服务处理（这里的请求体不是有效的 JSON-RPC 消息）
+    response = mcp_client.post('/mcp/', json={}, headers={
+        'X-Admin-Token': ADMIN_TOKEN,
+        'Accept': 'application/json, text/event-stream',
+    })
+    assert response.status_code not in (403, 404)
+
+    # REST 接口不需要令牌
+    assert mcp_client.get('/api/health').status_code == 200
+
+def test_mcp_rejects_file_uris(mcp_client):
+    with pytest.raises(ValueError):
+        asyncio.run(mcp_module.convert_to_markdown(f'file://{asgi.__file__}'))
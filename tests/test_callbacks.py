@@ -0,0 +1,120 @@
+"""回调通知（app.py）的测试：回调地址检查、重试退避和 HMAC 签名"""
+
+import hashlib
+import hmac
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import app as app_module
+
+class StubReceiver:
+    """本地回调接收端，按顺序返回 statuses 中的状态码，并记录收到的请求"""
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.requests = []
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers['Content-Length']))
+                receiver.requests.append((dict(self.headers), body))
+                self.send_response(receiver.statuses.pop(0) if receiver.statuses else 200)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_port}/hook'
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+@pytest.fixture
+def receiver_factory(monkeypatch):
+    # 本机接收端需要加入允许列表；记录退避时长而不实际等待
+    monkeypatch.setattr(app_module, 'CALLBACK_ALLOWED_HOSTS', ['127.0.0.1'])
+    monkeypatch.setattr(app_module, 'CALLBACK_MAX_ATTEMPTS', 4)
+    monkeypatch.setattr(app_module, 'CALLBACK_BACKOFF_SECONDS', 1.0)
+    monkeypatch.setattr(app_module, 'CALLBACK_BACKOFF_MAX_SECONDS', 3.0)
+    monkeypatch.setattr(app_module.random, 'uniform', lambda low, high: low)
+    delays = []
+    monkeypatch.setattr(time, 'sleep', delays.append)
+
+    receivers = []
+    def create(statuses):
+        receiver = StubReceiver(statuses)
+        receiver.delays = delays
+        receivers.append(receiver)
+        return receiver
+    yield create
+    for receiver in receivers:
+        receiver.close()
+
+def test_retries_with_exponential_backoff_and_signs(receiver_factory, monkeypatch):
+    monkeypatch.setattr(app_module, 'CALLBACK_SECRET', 'secret')
+    receiver = receiver_factory([503, 429, 500])
+    payload = {'event': 'conversion.completed', 'task_id': 't1', 'markdown': '# 标题'}
+
+    assert app_module.deliver_callback(receiver.url, payload)
+
+    assert len(receiver.requests) == 4
+    assert receiver.delays == [1.0, 2.0, 3.0]  # 每次翻倍，不超过上限
+    headers, body = receiver.requests[-1]
+    assert json.loads(body) == payload
+    assert headers['X-MarkItDown-Event'] == 'conversion.completed'
+    expected = hmac.new(b'secret', body, hashlib.sha256).hexdigest()
+    assert headers['X-MarkItDown-Signature'] == f'sha256={expected}'
+
+def test_gives_up_after_max_attempts(receiver_factory):
+    receiver = receiver_factory([502] * 10)
+    assert not app_module.deliver_callback(receiver.url, {'event': 'conversion.failed'})
+    assert len(receiver.requests) == 4
+    assert 'X-MarkItDown-Signature' not in receiver.requests[0][0]
+
+def test_client_errors_are_not_retried(receiver_factory):
+    receiver = receiver_factory([404])
+    assert not app_module.deliver_callback(receiver.url, {'event': 'conversion.completed'})
+    assert len(receiver.requests) == 1
+    assert receiver.delays == []
+
+@pytest.mark.parametrize('url', [
+    'http://127.0.0.1:8080/hook',
+    'http://localhost/hook',
+    'http://10.1.2.3/hook',
+    'http://192.168.0.10/hook',
+    'http://169.254.169.254/latest/meta-data/',
+    'http://[::1]/hook',
+    'ftp://example.com/hook',
+])
+def test_private_and_invalid_callback_urls_are_rejected(url):
+    with pytest.raises(ValueError):
+        app_module.parse_callback_options({'callback_url': url})
+
+def test_public_callback_url_is_accepted():
+    options = app_module.parse_callback_options({'callback_url': 'https://93.184.216.34/hook',
+                                                 'callback_include_markdown': 'true'})
+    assert options == {'url': 'https://93.184.216.34/hook', 'include_markdown': True}
+    assert app_module.parse_callback_options({}) is None
+
+def test_allowed_hosts(monkeypatch):
+    monkeypatch.setattr(app_module, 'CALLBACK_ALLOWED_HOSTS', ['hooks.example.com', '.internal.example'])
+    app_module.check_callback_url('https://hooks.example.com/a')
+    app_module.check_callback_url('https://svc.internal.example/a')
+    with pytest.raises(ValueError):
+        app_module.check_callback_url('https://evil.example.com/a')
+    with pytest.raises(ValueError):
+        app_module.check_callback_url('https://internal.example.evil.com/a')
+
+def test_delivery_rechecks_the_host(monkeypatch):
+    monkeypatch.setattr(app_module, 'CALLBACK_ALLOWED_HOSTS', [])
+    assert not app_module.deliver_callback('http://127.0.0.1:9/hook', {'event': 'conversion.completed'})
@@ -0,0 +1,66 @@
+"""Markdown 切分（chunking.py）的测试"""
+
+import pytest
+
+from chunking import chunk_markdown
+
+def count_words(text):
+    return len(text.split())
+
+MARKDOWN = '''# Guide
+
+Intro paragraph here.
+
+## Install
+
+Run the installer now.
+
+Then restart.
+
+```
+# not a heading
+
+still code
+```
+
+## Usage
+
+Call it.
+'''
+
+def test_heading_paths_and_offsets():
+    chunks = chunk_markdown(MARKDOWN, 100, count_tokens=count_words)
+
+    assert [c['heading_path'] for c in chunks] == [['Guide'], ['Guide', 'Install'], ['Guide', 'Usage']]
+    assert [c['index'] for c in chunks] == [0, 1, 2]
+    for chunk in chunks:
+        assert MARKDOWN[chunk['start']:chunk['end']] == chunk['text']
+        assert chunk['token_count'] == count_words(chunk['text'])
+
+    # 代码块内的 # 行和空行不会开始新的章节或块
+    assert chunks[1]['text'].startswith('## Install')
+    assert chunks[1]['text'].endswith('still code\n```')
+    assert chunks[2]['text'] == '## Usage\n\nCall it.'
+
+def test_paragraphs_are_packed_up_to_the_limit():
+    markdown = 'one two\n\nthree four\n\nfive six'
+    chunks = chunk_markdown(markdown, 4, count_tokens=count_words)
+    assert [c['text'] for c in chunks] == ['one two\n\nthree four', 'five six']
+    assert all(c['heading_path'] == [] for c in chunks)
+
+def test_oversized_blocks_are_split_by_line_then_by_character():
+    markdown = '# Title\n\na b c\nd e f\ng h'
+    chunks = chunk_markdown(markdown, 4, count_tokens=count_words)
+    assert [c['text'] for c in chunks] == ['# Title', 'a b c', 'd e f', 'g h']
+    assert all(c['token_count'] <= 4 for c in chunks)
+    assert chunks[1]['heading_path'] == ['Title']
+
+    # 单行超出上限时按字符切分，切分后的块首尾相接
+    line = 'x' * 25
+    chunks = chunk_markdown(line, 10, count_tokens=len)
+    assert [c['text'] for c in chunks] == ['x' * 10, 'x' * 10, 'x' * 5]
+    assert [(c['start'], c['end']) for c in chunks] == [(0, 10), (10, 20), (20, 25)]
+
+def test_invalid_max_tokens():
+    with pytest.raises(ValueError):
+        chunk_markdown('text', 0)
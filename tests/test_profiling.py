@@ -0,0 +1,74 @@
+"""转换请求性能分析（?profile=1）和分析文件下载的测试"""
+
+import io
+import pstats
+
+import pytest
+
+import app as app_module
+from conftest import ADMIN_TOKEN
+
+CSV_CONTENT = b'name,count\nalpha,1\nbeta,2\n'
+ADMIN_HEADERS = {'X-Admin-Token': ADMIN_TOKEN}
+
+@pytest.fixture
+def client(artifact_dir, tmp_path, monkeypatch):
+    profile_folder = tmp_path / 'profiles'
+    profile_folder.mkdir()
+    monkeypatch.setattr(app_module, 'PROFILE_FOLDER', str(profile_folder))
+    return app_module.app.test_client()
+
+def upload(client, headers=None):
+    return client.post('/api/convert/file?profile=1', headers=headers or {},
+                       data={'file': (io.BytesIO(CSV_CONTENT), 'data.csv')}, content_type='multipart/form-data')
+
+def test_profile_requires_admin_token(client):
+    assert upload(client).status_code == 403
+    assert upload(client, {'X-Admin-Token': 'wrong'}).status_code == 403
+
+def test_profile_report_and_download(client, tmp_path):
+    response = upload(client, ADMIN_HEADERS)
+    assert response.status_code == 200, response.get_json()
+    profile = response.get_json()['profile']
+
+    assert {'upload_parsing', 'queue_wait', 'conversion', 'disk_write', 'type_detection', 'total'} <= set(profile['stages'])
+    assert profile['worker_pool'] is None
+    assert 'CsvConverter' in [entry['converter'] for entry in profile['converters']]
+    assert profile['download_url'] == f"/api/debug/profiles/{profile['profile_id']}"
+
+    assert client.get(profile['download_url']).status_code == 403
+    download = client.get(profile['download_url'], headers=ADMIN_HEADERS)
+    assert download.status_code == 200
+    stats_path = tmp_path / 'downloaded.pstats'
+    stats_path.write_bytes(download.data)
+    assert pstats.Stats(str(stats_path)).total_calls > 0
+
+    assert client.get('/api/debug/profiles/does-not-exist', headers=ADMIN_HEADERS).status_code == 404
+
+def test_profile_returns_409_when_busy(client):
+    assert app_module.profile_lock.acquire(blocking=False)
+    try:
+        response = upload(client, ADMIN_HEADERS)
+    finally:
+        app_module.profile_lock.release()
+    assert response.status_code == 409
+
+    # 分析结束后可以再次分析
+    assert upload(client, ADMIN_HEADERS).status_code == 200
+
+def test_profile_records_worker_pool(client, monkeypatch):
+    class StubPools:
+        """在名为 text 的工作进程池中"转换"，不启动进程"""
+
+        def family_for(self, filename, detected_extension):
+            return 'text'
+
+        def convert(self, family, content, extension, deadline=None):
+            return '| name | count |'
+
+    monkeypatch.setattr(app_module, 'worker_pools', StubPools())
+    response = upload(client, ADMIN_HEADERS)
+    assert response.status_code == 200, response.get_json()
+    profile = response.get_json()['profile']
+    assert profile['worker_pool'] == 'text'
+    assert 'note' in profile
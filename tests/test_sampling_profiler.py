@@ -0,0 +1,93 @@
+"""后台采样分析器（SamplingProfiler）和采样数据下载端点（/api/debug/profile）的测试"""
+
+import time
+
+import pytest
+
+import app as app_module
+from app import SamplingProfiler
+from conftest import ADMIN_TOKEN
+
+ADMIN_HEADERS = {'X-Admin-Token': ADMIN_TOKEN}
+
+class FakeTime:
+    """代替 app 模块中的 time：time() 可手动推进，其余函数使用真实的 time 模块"""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeTime()
+    monkeypatch.setattr(app_module, 'time', clock)
+    return clock
+
+@pytest.fixture
+def client():
+    return app_module.app.test_client()
+
+@pytest.fixture
+def running_profiler(monkeypatch):
+    profiler = SamplingProfiler(interval=0.01, retention_minutes=1)
+    monkeypatch.setattr(app_module, 'sampling_profiler', profiler)
+    profiler.start()
+    yield profiler
+    profiler.stop()
+
+def test_collapsed_merges_stacks_within_bucket(clock):
+    profiler = SamplingProfiler(retention_minutes=10)
+    profiler._record(['MainThread;main;convert', 'MainThread;main;convert'])
+    clock.advance(10)
+    profiler._record(['MainThread;main;convert', 'MainThread;main;parse'])
+    assert len(profiler._buckets) == 1
+    assert profiler.collapsed() == 'MainThread;main;convert 3\nMainThread;main;parse 1\n'
+
+def test_collapsed_window_selects_buckets(clock):
+    profiler = SamplingProfiler(retention_minutes=10)
+    profiler._record(['old'])
+    clock.advance(SamplingProfiler.BUCKET_SECONDS * 3)
+    profiler._record(['recent'])
+    assert len(profiler._buckets) == 2
+
+    # 时间窗口只要与分桶有重叠，整个分桶都计入
+    assert profiler.collapsed(1) == 'recent 1\n'
+    assert profiler.collapsed(SamplingProfiler.BUCKET_SECONDS * 2) == 'recent 1\n'
+    assert profiler.collapsed(SamplingProfiler.BUCKET_SECONDS * 4) == 'old 1\nrecent 1\n'
+    assert profiler.collapsed() == 'old 1\nrecent 1\n'
+
+def test_buckets_beyond_retention_are_dropped(clock):
+    profiler = SamplingProfiler(retention_minutes=2)
+    for stack in ('first', 'second', 'third'):
+        profiler._record([stack])
+        clock.advance(SamplingProfiler.BUCKET_SECONDS)
+    assert profiler.collapsed() == 'second 1\nthird 1\n'
+
+def test_profile_requires_admin_token(client, running_profiler):
+    assert client.get('/api/debug/profile').status_code == 403
+    assert client.get('/api/debug/profile', headers={'X-Admin-Token': 'wrong'}).status_code == 403
+
+def test_profile_returns_503_when_disabled(client, monkeypatch):
+    monkeypatch.setattr(app_module, 'sampling_profiler', SamplingProfiler())
+    assert client.get('/api/debug/profile', headers=ADMIN_HEADERS).status_code == 503
+
+@pytest.mark.parametrize('seconds', ['0', '-5', 'abc', '1.5'])
+def test_profile_rejects_invalid_seconds(client, running_profiler, seconds):
+    response = client.get(f'/api/debug/profile?seconds={seconds}', headers=ADMIN_HEADERS)
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'seconds 必须为正整数'
+
+def test_profile_download(client, running_profiler):
+    running_profiler._record(['MainThread;main;convert'])
+    response = client.get('/api/debug/profile?seconds=60', headers=ADMIN_HEADERS)
+    assert response.status_code == 200
+    assert response.headers['Content-Disposition'].startswith('attachment; filename="profile_')
+    assert 'MainThread;main;convert 1\n' in response.get_data(as_text=True)
@@ -0,0 +1,75 @@
+"""存储后端（storage.py）的测试，S3 后端使用 moto 模拟"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from storage import LocalStorage, S3Storage
+
+BUCKET = 'markitdown-test'
+
+@pytest.fixture
+def s3_storage(monkeypatch):
+    moto = pytest.importorskip('moto')
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'testing')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'testing')
+    with moto.mock_aws():
+        storage = S3Storage(BUCKET, prefix='markitdown/', region_name='us-east-1')
+        storage._client.create_bucket(Bucket=BUCKET)
+        yield storage
+
+@pytest.fixture(params=['local', 's3'])
+def storage(request, tmp_path):
+    if request.param == 'local':
+        return LocalStorage(str(tmp_path))
+    return request.getfixturevalue('s3_storage')
+
+def read_content(content):
+    """读取 open() 的返回值：本地存储为路径，对象存储为响应体"""
+    if isinstance(content, str):
+        with open(content, encoding='utf-8') as f:
+            return f.read()
+    return content.read().decode('utf-8')
+
+def test_save_get_open_delete(storage):
+    record = storage.save('id-1', '报告 1_id-1.md', '# 标题', '报告 1.pdf')
+    assert record['filename'] == '报告 1_id-1.md'
+
+    found = storage.get('id-1')
+    assert found['file_id'] == 'id-1'
+    assert found['filename'] == '报告 1_id-1.md'
+    assert found['original_filename'] == '报告 1.pdf'
+    assert abs(found['created_at'] - datetime.now()) < timedelta(minutes=1)
+    assert read_content(storage.open(found)) == '# 标题'
+
+    assert storage.get('missing') is None
+    storage.delete('id-1')
+    storage.delete('id-1')
+    assert storage.get('id-1') is None
+    assert storage.list() == []
+
+def test_list_and_cleanup_expired(storage):
+    storage.save('old', 'a_old.md', 'old', 'a.txt')
+    newer = storage.save('new', 'b_new.md', 'new', 'b.txt')
+
+    assert sorted(r['file_id'] for r in storage.list()) == ['new', 'old']
+
+    expired = storage.cleanup_expired(newer['created_at'])
+    assert [r['file_id'] for r in expired] == ['old']
+    assert [r['file_id'] for r in storage.list()] == ['new']
+    assert storage.get('old') is None
+
+    assert storage.cleanup_expired(datetime.now() + timedelta(minutes=1))[0]['file_id'] == 'new'
+    assert storage.list() == []
+
+def test_s3_lookups_do_not_list(s3_storage, monkeypatch):
+    s3_storage.save('id-1', 'a_id-1.md', 'content', 'a.txt')
+
+    def fail(*args, **kwargs):
+        raise AssertionError('get/open/delete 不应列举对象')
+    monkeypatch.setattr(s3_storage, '_iter_index', fail)
+
+    record = s3_storage.get('id-1')
+    assert read_content(s3_storage.open(record)) == 'content'
+    s3_storage.delete('id-1')
+    assert s3_storage.get('id-1') is None
@@ -0,0 +1,152 @@
+"""多租户调度与限流（tenancy.py）的测试"""
+
+import threading
+import time
+
+import pytest
+
+import tenancy
+from tenancy import FairShareScheduler, FairTaskQueue, TenantRegistry, TokenBucket
+
+class FakeClock:
+    """代替 tenancy 模块中的 time：monotonic 可手动推进"""
+
+    perf_counter = staticmethod(time.perf_counter)
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(tenancy, 'time', clock)
+    return clock
+
+def wait_until(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, '等待超时'
+        time.sleep(0.005)
+
+def test_token_bucket_retry_after(clock):
+    bucket = TokenBucket(60)  # 每秒补充一个令牌
+    assert bucket.consume(60) == 0
+    assert bucket.consume(30) == pytest.approx(30.0)
+
+    clock.advance(30)
+    assert bucket.consume(30) == 0
+    assert not bucket.is_full()
+
+    # 超过容量的请求在桶满时通过，令牌数变为负数，之后的请求等待更久
+    clock.advance(60)
+    assert bucket.is_full()
+    assert bucket.consume(120) == 0
+    assert bucket.consume(1) == pytest.approx(61.0)
+    assert bucket.consume(600) == pytest.approx(120.0)
+
+def test_registry_rate_limit_and_idle_eviction(clock):
+    registry = TenantRegistry(weights={'key:a': 2.0}, bytes_per_minute=60, idle_seconds=10)
+    assert registry.weight('key:a') == 2.0
+    assert registry.weight('key:b') == 1.0
+
+    assert registry.consume('key:a', 60) == 0
+    assert registry.consume('key:a', 6) == pytest.approx(6.0)
+    registry.record('key:a', 0.5, 0.25)
+    assert registry.usage()['key:a'] == {
+        'requests': 1, 'bytes': 60, 'rate_limited': 1,
+        'conversion_seconds': 0.5, 'queue_wait_seconds': 0.25, 'weight': 2.0,
+    }
+
+    # 空闲超过 idle_seconds，但令牌桶尚未补满时保留，避免租户借此绕过限流
+    clock.advance(11)
+    registry.consume('ip:1.2.3.4', 1)
+    assert 'key:a' in registry.usage()
+    assert registry.consume('key:a', 60) == pytest.approx(49.0)
+
+    # 令牌桶补满后清除
+    clock.advance(120)
+    registry.consume('ip:1.2.3.4', 1)
+    assert list(registry.usage()) == ['ip:1.2.3.4']
+    assert set(registry._buckets) == set(registry._last_seen) == {'ip:1.2.3.4'}
+
+def test_registry_without_rate_limit_evicts_idle_tenants(clock):
+    registry = TenantRegistry(idle_seconds=60)
+    for i in range(100):
+        registry.consume(f'ip:10.0.0.{i}', 1)
+    clock.advance(61)
+    registry.consume('ip:10.0.1.1', 1)
+    assert list(registry.usage()) == ['ip:10.0.1.1']
+    assert registry._buckets == {}
+
+def test_scheduler_limits_slots():
+    scheduler = FairShareScheduler(2)
+    scheduler.acquire('a', 1.0, 1)
+    scheduler.acquire('b', 1.0, 1)
+
+    acquired = threading.Event()
+    def third():
+        scheduler.acquire('c', 1.0, 1)
+        acquired.set()
+    threading.Thread(target=third, daemon=True).start()
+
+    wait_until(lambda: scheduler.snapshot() == ({'c': 1}, 2))
+    assert not acquired.wait(0.05)
+    scheduler.release()
+    assert acquired.wait(5)
+    assert scheduler.snapshot() == ({}, 2)
+
+def test_scheduler_weighted_order():
+    scheduler = FairShareScheduler(1)
+    scheduler.acquire('hold', 1.0, 1)
+
+    order = []
+    def task(tenant_id, weight, name):
+        scheduler.acquire(tenant_id, weight, 1)
+        order.append(name)
+        scheduler.release()
+
+    # 按确定的顺序排队：A 的权重为 1，B 的权重为 2
+    threads = []
+    for tenant_id, weight, names in [('A', 1.0, ['A1', 'A2', 'A3']), ('B', 2.0, ['B1', 'B2', 'B3'])]:
+        for count, name in enumerate(names, 1):
+            thread = threading.Thread(target=task, args=(tenant_id, weight, name), daemon=True)
+            thread.start()
+            threads.append(thread)
+            wait_until(lambda: scheduler.snapshot()[0].get(tenant_id) == count)
+
+    scheduler.release()
+    for thread in threads:
+        thread.join(5)
+
+    # B 的份额是 A 的两倍；同一租户内部按到达顺序执行
+    assert order == ['A1', 'B1', 'B2', 'A2', 'B3', 'A3']
+    assert scheduler.snapshot() == ({}, 0)
+
+def test_task_queue_round_robin():
+    queue = FairTaskQueue(1, thread_name_prefix='test')
+    started = threading.Event()
+    unblock = threading.Event()
+    order = []
+
+    def blocker():
+        started.set()
+        unblock.wait(5)
+
+    queue.submit('hold', blocker)
+    assert started.wait(5)
+    for name in ['A1', 'A2', 'A3']:
+        queue.submit('A', order.append, name)
+    for name in ['B1', 'B2']:
+        queue.submit('B', order.append, name)
+    assert queue.pending() == {'A': 3, 'B': 2}
+
+    unblock.set()
+    wait_until(lambda: len(order) == 5)
+    assert order == ['A1', 'B1', 'A2', 'B2', 'A3']
+    assert queue.pending() == {}
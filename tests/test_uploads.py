@@ -0,0 +1,52 @@
+"""Flask 服务（app.py）上传文件类型检测的测试"""
+
+import io
+import os
+
+import pytest
+
+import app as app_module
+from conftest import ROOT
+from markitdown import LazyConverter, MarkItDown
+
+TEST_FILES = os.path.join(ROOT, 'packages', 'markitdown', 'tests', 'test_files')
+ELF_HEADER = b'\x7fELF\x02\x01\x01\x00' + b'\x00' * 8 + b'\x02\x00\x3e\x00\x01\x00\x00\x00' + b'\x00' * 4000
+
+@pytest.fixture
+def client(artifact_dir):
+    return app_module.app.test_client()
+
+def upload(client, filename, content):
+    return client.post('/api/convert/file', data={'file': (io.BytesIO(content), filename)},
+                       content_type='multipart/form-data')
+
+def test_mislabeled_unsupported_upload_is_rejected(client):
+    response = upload(client, 'report.pdf', ELF_HEADER)
+    assert response.status_code == 400
+    assert '文件内容与扩展名不符' in response.get_json()['error']
+
+def test_mislabeled_supported_upload_is_converted(client):
+    # 扩展名错误但内容本身可以转换的文件（扩展名为 .docx 的 PDF）仍然放行
+    with open(os.path.join(TEST_FILES, 'test.pdf'), 'rb') as f:
+        response = upload(client, 'paper.docx', f.read())
+    assert response.status_code == 200, response.get_json()
+
+def test_sniffing_only_loads_candidate_converters(monkeypatch):
+    converter = MarkItDown()
+    monkeypatch.setattr(app_module, 'md_converter', converter)
+
+    app_module.sniff_content(b'name,count\nalpha,1\n', 'data.csv')
+
+    loaded = [
+        registration.converter.target
+        for registration in converter._converters
+        if isinstance(registration.converter, LazyConverter) and registration.converter.loaded_converter is not None
+    ]
+    assert loaded
+    assert not any('Pdf' in str(target) or 'Docx' in str(target) for target in loaded)
+
+def test_upload_detection_is_counted_once(client):
+    # 上传时的文件类型检查不计入，只统计转换时的检测
+    before = sum(app_module.md_converter.detection_counts.values())
+    assert upload(client, 'data.csv', b'name,count\nalpha,1\n').status_code == 200
+    assert sum(app_module.md_converter.detection_counts.values()) == before + 1
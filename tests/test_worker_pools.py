@@ -0,0 +1,78 @@
+"""工作进程池（worker_pools.py）的测试"""
+
+import io
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+import app as app_module
+from conftest import ROOT
+from worker_pools import FormatWorkerPools, parse_pool_sizes
+
+TEST_FILES = os.path.join(ROOT, 'packages', 'markitdown', 'tests', 'test_files')
+
+@pytest.fixture
+def office_pool(monkeypatch):
+    pools = FormatWorkerPools({'office': 1})
+    monkeypatch.setattr(app_module, 'worker_pools', pools)
+    yield pools
+    pools.shutdown()
+
+def upload(test_file, filename):
+    with open(os.path.join(TEST_FILES, test_file), 'rb') as f:
+        content = f.read()
+    return app_module.app.test_client().post('/api/convert/file', data={'file': (io.BytesIO(content), filename)},
+                                             content_type='multipart/form-data')
+
+def test_parse_pool_sizes():
+    assert parse_pool_sizes('text:4, pdf:2,office') == {'text': 4, 'pdf': 2, 'office': 1}
+    with pytest.raises(ValueError):
+        parse_pool_sizes('video:1')
+    with pytest.raises(ValueError):
+        parse_pool_sizes('text:0')
+
+def test_text_worker_never_imports_magika():
+    # 在新进程中按工作进程的方式初始化并转换，检查是否导入了 magika 和 onnxruntime
+    script = textwrap.dedent('''
+        import sys
+        import worker_pools
+        worker_pools._init_worker('text', None)
+        markdown = worker_pools._convert_in_worker(b'name,count\\nalpha,1\\n', '.csv')
+        assert '| alpha | 1 |' in markdown, markdown
+        print(sorted(m for m in sys.modules if m.split('.')[0] in ('magika', 'onnxruntime')))
+    ''')
+    result = subprocess.run([sys.executable, '-c', script], cwd=ROOT, env={**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)},
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '[]'
+
+def test_family_for_uses_detected_type():
+    pools = FormatWorkerPools({})
+    pools._families = {'docx': 'office', 'xlsx': 'office', 'pdf': 'pdf'}
+    assert pools.family_for('report.docx', '.docx') == 'office'
+    assert pools.family_for('report.docx', '.xlsx') == 'office'
+    # 内容与扩展名不属于同一格式族，或没有检测到类型时在本进程内转换
+    assert pools.family_for('report.docx', '.pdf') is None
+    assert pools.family_for('report.docx', None) is None
+    assert pools.family_for('report', '.docx') is None
+
+def test_upload_is_converted_in_pool(artifact_dir, office_pool, monkeypatch):
+    families = []
+    convert = office_pool.convert
+    def record(family, *args, **kwargs):
+        families.append(family)
+        return convert(family, *args, **kwargs)
+    monkeypatch.setattr(office_pool, 'convert', record)
+    response = upload('test.docx', 'report.docx')
+    assert response.status_code == 200, response.get_json()
+    assert families == ['office']
+
+def test_mislabeled_upload_is_converted_in_process(artifact_dir, office_pool, monkeypatch):
+    # 扩展名为 .docx 的 PDF 不能交给只注册了 office 转换器的工作进程
+    def fail(*args, **kwargs):
+        raise AssertionError('mislabeled upload was sent to a worker pool')
+    monkeypatch.setattr(office_pool, 'convert', fail)
+    response = upload('test.pdf', 'paper.docx')
+    assert response.status_code == 200, response.get_json()
@@ -0,0 +1,135 @@
+"""
+按格式族划分的转换工作进程池
+每个进程池只注册（因而只导入）该格式族所需的转换器，例如文本类工作进程不会加载 pandas、pdfminer、
+python-pptx、mammoth、语音识别和 Magika 等依赖，可以按实际负载分别设置各格式族的进程数。
+
+工作进程使用 spawn 方式启动，不继承主进程已导入的模块，因此本模块不能导入 app.py。
+"""
+
+import io
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# 格式族 -> 文件扩展名和所需的转换器（markitdown 内置转换器类名）
+FORMAT_FAMILIES = {
+    'office': {
+        'extensions': {'docx', 'doc', 'pptx', 'ppt', 'xlsx', 'xls', 'msg', 'epub'},
+        'converters': ['DocxConverter', 'PptxConverter', 'XlsxConverter', 'XlsConverter',
+                       'OutlookMsgConverter', 'EpubConverter'],
+    },
+    'pdf': {
+        'extensions': {'pdf'},
+        'converters': ['PdfConverter'],
+    },
+    'media': {
+        'extensions': {'jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'mp3', 'wav', 'm4a'},
+        'converters': ['ImageConverter', 'AudioConverter'],
+    },
+    'text': {
+        'extensions': {'html', 'htm', 'csv', 'json', 'xml', 'txt', 'md', 'rtf'},
+        'converters': ['PlainTextConverter', 'HtmlConverter', 'CsvConverter', 'RssConverter'],
+    },
+}
+
+# 工作进程内的 MarkItDown 实例，由 _init_worker 创建
+_worker_converter = None
+
+
+def _init_worker(family, cache):
+    """工作进程初始化：只注册该格式族的转换器
+
+    主进程只把检测到的内容类型（见 app.sniff_content）与扩展名属于同一格式族的文件分派到工作进程，
+    内容与扩展名不符的文件（例如扩展名为 .docx 的 PDF）在主进程内转换，
+    因此工作进程不运行 Magika（detection_policy="never"），不导入 magika、onnxruntime，也不加载模型。
+    """
+    global _worker_converter
+    from markitdown import MarkItDown
+    _worker_converter = MarkItDown(builtin_converters=FORMAT_FAMILIES[family]['converters'],
+                                   detection_policy='never', cache=cache)
+
+
+def _convert_in_worker(content, extension, deadline=None):
+    result = _worker_converter.convert_stream(io.BytesIO(content), file_extension=extension, deadline=deadline)
+    return result.text_content
+
+
+def parse_pool_sizes(spec):
+    """解析进程池配置，例如 "text:4,pdf:2,office:2,media:1"，返回 {格式族: 进程数}"""
+    sizes = {}
+    for item in spec.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        family, _, count = item.partition(':')
+        family = family.strip().lower()
+        if family not in FORMAT_FAMILIES:
+            raise ValueError(f"未知的格式族: {family}（可选: {', '.join(FORMAT_FAMILIES)}）")
+        try:
+            sizes[family] = int(count) if count.strip() else 1
+        except ValueError:
+            raise ValueError(f"格式族 {family} 的进程数必须为整数")
+        if sizes[family] <= 0:
+            raise ValueError(f"格式族 {family} 的进程数必须为正整数")
+    return sizes
+
+
+class FormatWorkerPools:
+    """各格式族的工作进程池
+
+    未配置进程池的格式族（以及 ZIP 等不属于任何格式族的文件）由调用方在本进程内转换。
+    """
+
+    def __init__(self, sizes, cache=None):
+        self.sizes = dict(sizes)
+        # 转换结果缓存：disk、sqlite 缓存由各工作进程共享，memory 缓存在每个工作进程内各自独立
+        self.cache = cache
+        self._context = multiprocessing.get_context('spawn')
+        self._lock = threading.Lock()
+        self._pools = {family: self._create_pool(family) for family in self.sizes}
+        self._families = {
+            extension: family
+            for family in self.sizes
+            for extension in FORMAT_FAMILIES[family]['extensions']
+        }
+
+    def _create_pool(self, family):
+        return ProcessPoolExecutor(
+            max_workers=self.sizes[family],
+            mp_context=self._context,
+            initializer=_init_worker,
+            initargs=(family, self.cache),
+        )
+
+    def family_for(self, filename, detected_extension):
+        """返回处理该文件的格式族，没有对应的进程池时返回 None
+
+        detected_extension 为检测到的内容类型的扩展名（例如 ".pdf"）。
+        只有检测到的类型与文件扩展名属于同一格式族时才返回该格式族，否则返回 None（由调用方在本进程内转换）。
+        """
+        if '.' not in filename or not detected_extension:
+            return None
+        family = self._families.get(filename.rsplit('.', 1)[1].lower())
+        if family != self._families.get(detected_extension.lstrip('.').lower()):
+            return None
+        return family
+
+    def convert(self, family, content, extension, deadline=None):
+        """在格式族的进程池中转换文件内容，返回 Markdown 文本；deadline 为转换时限（秒），从工作进程开始转换时计时"""
+        with self._lock:
+            pool = self._pools[family]
+        try:
+            return pool.submit(_convert_in_worker, content, extension, deadline).result()
+        except BrokenProcessPool:
+            # 工作进程异常退出（例如内存不足被终止），重建进程池以便后续请求可以继续
+            with self._lock:
+                if self._pools[family] is pool:
+                    self._pools[family] = self._create_pool(family)
+            pool.shutdown(wait=False)
+            raise
+
+    def shutdown(self):
+        with self._lock:
+            for pool in self._pools.values():
+                pool.shutdown(wait=False, cancel_futures=True)